@@ -0,0 +1,261 @@
+import argparse  # 명령줄 인자 처리용
+import json  # 기록 파일 읽기용
+from pathlib import Path  # 파일 경로 처리용
+from typing import Dict, Iterator, List  # 타입 힌트용
+
+import numpy as np  # 분위수 계산용
+
+from session_log import (  # 세션 기록 종류
+    RECORD_DISAPPEAR, RECORD_ERROR, RECORD_SCAN, RECORD_START, RECORD_STOP, RECORD_THRESHOLD, RECORD_TICK,
+    RECORD_TRIGGER,
+)
+
+
+def parse_args():
+    """명령줄 인자 읽기"""
+    parser = argparse.ArgumentParser(description="세션 기록(session_log_dir)으로 발동 지연 / 아깝게 놓친 매칭 / 틱당 CPU 분석")
+    parser.add_argument("paths", nargs="+", help="세션 기록 파일(.jsonl) 또는 폴더")
+    parser.add_argument("--near-margin", type=float, default=0.05,
+                        help="기준값보다 이만큼 이내로 낮으면 아깝게 놓친 매칭으로 셈")
+    parser.add_argument("--miss-window", type=float, default=2.0,
+                        help="아깝게 놓친 매칭 뒤 이 시간(초) 안에 발동이 없으면 놓쳤을 수 있는 발동으로 셈")
+    parser.add_argument("--per-session", action="store_true", help="세션마다 한 줄 요약 출력")
+    return parser.parse_args()
+
+
+def find_logs(paths: List[str]) -> List[Path]:
+    """파일 / 폴더 목록에서 세션 기록 파일 찾기 (폴더는 session_*.jsonl)"""
+    files = []
+    for item in paths:
+        path = Path(item)
+        if path.is_dir():
+            files.extend(sorted(path.glob("session_*.jsonl")))
+        elif path.exists():
+            files.append(path)
+        else:
+            print(f"⚠️ {path} 파일이 없습니다")
+    return files
+
+
+def read_sessions(path: Path) -> Iterator[List[dict]]:
+    """
+    기록 파일 하나를 세션 단위로 읽기 (시작 기록마다 새 세션)
+    
+    갑자기 꺼져서 잘린 마지막 줄 같은 깨진 줄은 건너뛴다.
+    """
+    session: List[dict] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("k") == RECORD_START and session:
+                yield session
+                session = []
+            session.append(record)
+    if session:
+        yield session
+
+
+class SessionStats:
+    """여러 세션의 분석 결과를 모으는 곳"""
+    
+    def __init__(self, near_margin: float, miss_window: float):
+        """
+        Args:
+            near_margin: 기준값 아래 이 범위 안의 매칭 값은 아깝게 놓친 것으로 셈
+            miss_window: 아깝게 놓친 구간 뒤 발동을 기다리는 시간 (초)
+        """
+        self.near_margin = near_margin
+        self.miss_window = miss_window
+        self.sessions = 0
+        self.duration = 0.0
+        self.ticks = 0
+        self.errors = 0
+        self.dropped_ticks = 0     # 스케줄러가 건너뛴 틱
+        self.queue_dropped = 0     # 기록 스레드가 밀려서 큐에 못 넣고 버린 기록
+        self.write_failed = 0      # 파일에 쓰지 못한 기록
+        self.tick_ms: List[float] = []
+        self.cpu_ms: List[float] = []
+        self.capture_ms: List[float] = []
+        
+        # 발동: 나타남 -> 처음 보임(detect) -> 확정(confirm) -> 처리(pipeline)
+        self.triggers = 0
+        self.triggers_at_start = 0  # 감지 시작 때 이미 떠 있던 것 (나타난 시각 모름)
+        self.trigger_ms: Dict[str, List[float]] = {"total": [], "detect": [], "confirm": [], "pipeline": []}
+        
+        # 아깝게 놓친 매칭
+        self.near_ticks = 0
+        self.near_episodes = 0
+        self.near_then_trigger = 0  # 뒤이어 발동함 (늦게 발동)
+        self.near_possible_miss = 0  # 뒤이어 발동 없음 (놓쳤을 수 있음)
+        
+        # 적응형 스캔 주기: 모드별 유지 시간 (초), 모드 전환 / 주기 변경 횟수
+        self.scan_held: Dict[str, float] = {}
+        self.scan_switches = 0
+        self.scan_changes = 0
+    
+    def add(self, records: List[dict]) -> dict:
+        """
+        세션 하나 분석해서 합치기
+        
+        Returns:
+            이 세션의 한 줄 요약용 값
+        """
+        self.sessions += 1
+        thresholds: Dict[str, float] = {}
+        visible: Dict[str, bool] = {}
+        near_last: Dict[str, float] = {}  # 스킬 -> 진행 중인 아깝게 놓친 구간의 마지막 틱 시각
+        triggers = ticks = near = switches = 0
+        first_ts = last_ts = None
+        scan_mode, scan_since = None, None  # 지금 스캔 모드와 그 모드로 바뀐 시각
+        
+        def hold_scan_mode(until: float):
+            """지금 스캔 모드를 until까지 유지한 시간 더하기"""
+            if scan_mode is not None:
+                self.scan_held[scan_mode] = self.scan_held.get(scan_mode, 0.0) + max(0.0, until - scan_since)
+        
+        def close_episode(name: str, trigger_ts=None):
+            """진행 중인 아깝게 놓친 구간 마무리"""
+            last = near_last.pop(name, None)
+            if last is None:
+                return
+            self.near_episodes += 1
+            if trigger_ts is not None and trigger_ts - last <= self.miss_window:
+                self.near_then_trigger += 1
+            else:
+                self.near_possible_miss += 1
+        
+        for record in records:
+            kind = record.get("k")
+            ts = record.get("ts", 0.0)
+            if first_ts is None:
+                first_ts = ts
+            last_ts = max(last_ts or ts, ts)
+            
+            if kind in (RECORD_START, RECORD_THRESHOLD):
+                thresholds.update({name: pair[0] for name, pair in record.get("thresholds", {}).items()})
+                if kind == RECORD_START:
+                    scan_mode, scan_since = record.get("scan_mode", "active"), ts
+            elif kind == RECORD_SCAN:
+                self.scan_changes += 1
+                mode = record.get("mode")
+                if mode != scan_mode:
+                    hold_scan_mode(ts)
+                    if scan_mode is not None:
+                        switches += 1
+                    scan_mode, scan_since = mode, ts
+            elif kind == RECORD_TICK:
+                ticks += 1
+                timings = record.get("ms", {})
+                if "tick" in timings:
+                    self.tick_ms.append(timings["tick"])
+                if "capture" in timings:
+                    self.capture_ms.append(timings["capture"])
+                self.cpu_ms.append(record.get("cpu", 0.0))
+                if record.get("reused"):
+                    # 직전 결과를 재사용한 틱은 매칭 값을 다시 세지 않음
+                    continue
+                
+                for name, (value, _scale, _location) in record.get("icons", {}).items():
+                    # 떠 있는 구간이 지나도록 발동이 없었으면 구간 마무리
+                    if name in near_last and ts - near_last[name] > self.miss_window:
+                        close_episode(name)
+                    enter = thresholds.get(name)
+                    if enter is None or visible.get(name):
+                        continue
+                    if enter - self.near_margin <= value < enter:
+                        near += 1
+                        near_last[name] = ts
+            elif kind == RECORD_TRIGGER:
+                triggers += 1
+                name = record["skill"]
+                visible[name] = True
+                close_episode(name, ts)
+                if record.get("error") is None:
+                    self.triggers_at_start += 1
+                    continue
+                self.trigger_ms["total"].append((ts - record["appeared"]) * 1000)
+                self.trigger_ms["detect"].append((record["first_hit"] - record["appeared"]) * 1000)
+                self.trigger_ms["confirm"].append((record["confirmed"] - record["first_hit"]) * 1000)
+                self.trigger_ms["pipeline"].append((ts - record["confirmed"]) * 1000)
+            elif kind == RECORD_DISAPPEAR:
+                visible[record["skill"]] = False
+            elif kind == RECORD_ERROR:
+                self.errors += 1
+            elif kind == RECORD_STOP:
+                self.dropped_ticks += record.get("scheduler", {}).get("dropped", 0)
+                self.queue_dropped += record.get("queue_dropped", 0)
+                self.write_failed += record.get("write_failed", 0)
+        
+        for name in list(near_last):
+            close_episode(name)
+        if last_ts is not None:
+            hold_scan_mode(last_ts)
+        
+        duration = (last_ts - first_ts) if first_ts is not None else 0.0
+        self.duration += duration
+        self.ticks += ticks
+        self.triggers += triggers
+        self.near_ticks += near
+        self.scan_switches += switches
+        return {"duration": duration, "ticks": ticks, "triggers": triggers, "near": near, "switches": switches}
+
+
+def _percentiles(values: List[float]) -> str:
+    """p50 / p90 / p99 / 최대 문자열"""
+    if not values:
+        return "기록 없음"
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return f"p50 {p50:.1f}ms / p90 {p90:.1f}ms / p99 {p99:.1f}ms / 최대 {max(values):.1f}ms"
+
+
+def main():
+    """세션 기록 분석 후 요약 출력"""
+    args = parse_args()
+    files = find_logs(args.paths)
+    if not files:
+        print("세션 기록 파일이 없습니다")
+        return
+    
+    stats = SessionStats(args.near_margin, args.miss_window)
+    for path in files:
+        for records in read_sessions(path):
+            session = stats.add(records)
+            if args.per_session:
+                print(f"{path.name} | {session['duration']:7.0f}초 | {session['ticks']:>7}틱"
+                      f" | 발동 {session['triggers']:>3}회 | 아까운 매칭 {session['near']:>5}틱"
+                      f" | 스캔 모드 전환 {session['switches']:>4}회")
+    
+    # ========== 요약 ==========
+    print("=" * 50)
+    print(f"세션: {stats.sessions}개 / {stats.duration / 60:.1f}분 / {stats.ticks}틱"
+          f" / 감지 오류 {stats.errors}회")
+    print(f"발동: {stats.triggers}회 (시작 때 이미 떠 있음 {stats.triggers_at_start}회)")
+    print(f"  나타남 -> 처리: {_percentiles(stats.trigger_ms['total'])}")
+    print(f"  나타남 -> 처음 보임: {_percentiles(stats.trigger_ms['detect'])}")
+    print(f"  처음 보임 -> 확정: {_percentiles(stats.trigger_ms['confirm'])}")
+    print(f"  확정 캡처 -> 처리: {_percentiles(stats.trigger_ms['pipeline'])}")
+    print(f"아깝게 놓친 매칭 (기준값 -{args.near_margin:.2f} 이내): {stats.near_ticks}틱 / {stats.near_episodes}구간"
+          f" (뒤이어 발동 {stats.near_then_trigger} / 놓쳤을 수 있음 {stats.near_possible_miss})")
+    print(f"틱당 CPU: {_percentiles(stats.cpu_ms)}")
+    print(f"틱당 처리: {_percentiles(stats.tick_ms)}")
+    print(f"캡처: {_percentiles(stats.capture_ms)}")
+    if stats.duration > 0:
+        print(f"평균 감지 속도: {stats.ticks / stats.duration:.1f}틱/초"
+              f" / CPU 사용률 약 {sum(stats.cpu_ms) / 1000 / stats.duration * 100:.1f}% (감지 스레드)")
+    held = sum(stats.scan_held.values())
+    if held > 0:
+        print("스캔 주기 모드: " + " / ".join(
+            f"{mode} {seconds / 60:.1f}분 ({seconds / held * 100:.0f}%)"
+            for mode, seconds in sorted(stats.scan_held.items(), key=lambda item: -item[1])
+        ))
+        print(f"  모드 전환 {stats.scan_switches}회 (분당 {stats.scan_switches / held * 60:.1f}회)"
+              f" / 주기 변경 {stats.scan_changes}회")
+    print(f"건너뛴 틱: {stats.dropped_ticks} / 버린 기록: 큐 가득 참 {stats.queue_dropped}"
+          f" / 쓰기 실패 {stats.write_failed}")
+
+
+if __name__ == "__main__":
+    main()
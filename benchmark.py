@@ -0,0 +1,480 @@
+import argparse  # 명령줄 인자 처리용
+import json  # 기준 결과 저장용
+import os  # 페이지 크기 (RSS 계산용)
+import platform  # 실행 환경 기록용
+import sys  # 종료 코드
+import time  # 시간 측정용
+import tracemalloc  # 틱당 메모리 할당 측정용
+from pathlib import Path  # 파일 경로 처리용
+from typing import Optional  # 타입 힌트용
+
+import cv2          # 이미지 처리 라이브러리
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+from detector import OneShotDetector, SEARCH_FULL, SEARCH_MODES  # 아이콘 감지기
+from config import load_config  # 설정 관리
+from multi_detector import configure_detector  # 앱과 같은 감지 설정 적용
+from synthetic import BuffBarScene, ICON_PATHS, load_icons, make_buff_bar, make_synthetic_frame  # 합성 화면
+
+ICON_PATH = ICON_PATHS[0]
+
+# 벤치마크 장면 목록 (이름, 설정)
+SCENARIOS = (
+    ("small", BuffBarScene(width=300, height=60)),
+    ("scale_0.8", BuffBarScene(width=300, height=60, icon_size=35)),
+    ("scale_1.3", BuffBarScene(width=400, height=70, icon_size=57)),
+    ("noisy", BuffBarScene(width=300, height=60, noise=12.0)),
+    ("dark", BuffBarScene(width=300, height=60, brightness=0.6)),
+    ("bright", BuffBarScene(width=300, height=60, brightness=1.3)),
+    ("distractors", BuffBarScene(width=400, height=60, distractors=6)),
+    ("icon2", BuffBarScene(width=500, height=130, icon_size=110, icon_index=1)),  # 두 번째 아이콘 (원래 크기)
+    ("large", BuffBarScene(width=1280, height=200, distractors=10)),
+)
+
+# 기준 결과와 비교할 때 허용 범위
+DEFAULT_TIME_TOLERANCE = 0.5       # 틱당 시간 50% 증가까지 허용 (측정 잡음 감안)
+DEFAULT_ACCURACY_TOLERANCE = 0.02  # 정확도 2%p 감소까지 허용
+DEFAULT_TIME_FLOOR_MS = 0.2        # 이보다 작은 틱당 시간 증가는 잡음으로 봄 (아주 빠른 장면)
+DEFAULT_REPEATS = 5                # 장면마다 몇 번 돌려서 가장 빠른 결과를 쓸지
+
+
+def match_with_resize(detector: OneShotDetector, frame: np.ndarray) -> float:
+    """예전 방식: 매 틱마다 모든 스케일 템플릿을 다시 크기 조절"""
+    best_val = 0.0
+    for scale in detector.scales:
+        width = int(detector.template_original.shape[1] * scale)
+        height = int(detector.template_original.shape[0] * scale)
+        if width < 10 or height < 10:
+            continue
+        if width > frame.shape[1] or height > frame.shape[0]:
+            continue
+        template = cv2.resize(detector.template_original, (width, height))
+        result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, _ = cv2.minMaxLoc(result)
+        best_val = max(best_val, max_val)
+    return best_val
+
+
+def time_per_tick(func, frame: np.ndarray, ticks: int) -> float:
+    """틱당 평균 소요 시간 (ms)"""
+    func(frame)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func(frame)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def new_detector(threshold: float = 0.8, icon_path: str = ICON_PATH) -> OneShotDetector:
+    """벤치마크용 감지기 (디버그 출력 끔)"""
+    detector = OneShotDetector(icon_path, threshold=threshold)
+    detector.debug = False
+    return detector
+
+
+# ========== bank: 템플릿 뱅크 / 검색 모드 비교 ==========
+
+def run_bank(args):
+    """템플릿 뱅크, 스케일 검색 모드, 위치 추적 비교표 출력"""
+    detector = new_detector()
+    
+    print(f"{'영역':>10} | {'resize (ms)':>12} | {'bank (ms)':>10} | {'절약 (ms)':>10}")
+    print("-" * 52)
+    for width, height in [(200, 60), (400, 120), (800, 200)]:
+        frame = make_synthetic_frame(detector.template_original, width, height)
+        
+        legacy_ms = time_per_tick(lambda f: match_with_resize(detector, f), frame, args.ticks)
+        bank_ms = time_per_tick(detector.match_frame, frame, args.ticks)
+        
+        print(f"{width:>4}x{height:<5} | {legacy_ms:>12.3f} | {bank_ms:>10.3f} | {legacy_ms - bank_ms:>10.3f}")
+    
+    # ========== 스케일 검색 모드 비교 ==========
+    print()
+    print(f"{'모드':>16} | {'틱당 (ms)':>10} | {'매칭 호출/틱':>12}")
+    print("-" * 46)
+    frame = make_synthetic_frame(detector.template_original, 800, 200, scale=1.2)
+    for mode in SEARCH_MODES:
+        detector.set_search_mode(mode)
+        calls = []
+        
+        def tick(f):
+            detector.match_frame(f)
+            calls.append(detector.last_match_calls)
+        
+        tick_ms = time_per_tick(tick, frame, args.ticks)
+        print(f"{mode:>16} | {tick_ms:>10.3f} | {sum(calls) / len(calls):>12.2f}")
+    
+    # ========== 위치 추적 비교 ==========
+    print()
+    print(f"{'위치 추적':>10} | {'틱당 (ms)':>10} | {'추적 성공/실패':>14}")
+    print("-" * 42)
+    detector.set_search_mode(SEARCH_FULL)
+    for enabled in (False, True):
+        detector.set_roi_tracking(enabled)
+        tick_ms = time_per_tick(detector.match_frame, frame, args.ticks)
+        stats = detector.get_roi_stats()
+        print(f"{str(enabled):>10} | {tick_ms:>10.3f} | {stats['hits']:>6} / {stats['misses']:<6}")
+
+
+# ========== prefilter: 2단계 매칭 (전체 화면) ==========
+
+def run_prefilter(args):
+    """전체 화면 크기에서 1단계 전체 매칭과 축소 사전 검색 비교 (틱당 시간 / 정확도 / 후보 수)"""
+    icons = load_icons()
+    scenes = [
+        ("1080p", BuffBarScene(width=1920, height=1080, distractors=10)),
+        ("1080p_0.8", BuffBarScene(width=1920, height=1080, distractors=10, icon_size=35, noise=8.0)),
+        ("1080p_1.3", BuffBarScene(width=1920, height=1080, distractors=10, icon_size=57)),
+    ]
+    
+    print(f"{'장면':>10} | {'사전 검색':>9} | {'틱당 (ms)':>10} | {'정확도':>6} | {'후보':>5}"
+          f" | {'1단계 (ms)':>10} | {'2단계 (ms)':>10}")
+    print("-" * 82)
+    for name, scene in scenes:
+        samples = make_samples(scene, icons, args.frames)
+        for enabled in (False, True):
+            detector = new_detector()
+            detector.set_search_mode(SEARCH_FULL)
+            detector.set_prefilter(enabled, args.factor, args.candidates)
+            
+            ticks = []
+            correct = 0
+            for frame, has_icon in samples:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+                t = time.perf_counter()
+                correct += detector.match_frame(gray) == has_icon
+                ticks.append((time.perf_counter() - t) * 1000)
+            
+            stats = detector.get_prefilter_stats()
+            print(f"{name:>10} | {str(enabled):>9} | {np.median(ticks):>10.2f} | {correct / len(samples):>6.2f}"
+                  f" | {stats['candidates_mean']:>5.1f} | {stats['prefilter']['p50_ms']:>10.2f}"
+                  f" | {stats['confirm']['p50_ms']:>10.2f}")
+    
+    # ========== 재현율: 전체 매칭이 찾은 아이콘을 사전 검색이 놓치는지 ==========
+    # 사전 검색을 쓰는 가장 작은 영역(640x360)에서 아이콘 크기 / 잡음을 바꿔 가며 비교
+    print()
+    print(f"재현율 (640x360, 방해 아이콘 10개, 장면당 {args.seeds}개, factor {args.factor} / 후보 {args.candidates})")
+    print(f"{'아이콘':>6} | {'잡음':>4} | {'전체 찾음':>9} | {'사전 검색 놓침':>14} | {'오탐':>4}")
+    print("-" * 52)
+    full = new_detector()
+    full.set_search_mode(SEARCH_FULL)
+    prefiltered = new_detector()
+    prefiltered.set_search_mode(SEARCH_FULL)
+    prefiltered.set_prefilter(True, args.factor, args.candidates)
+    
+    total_missed = 0
+    for icon_size in (30, 35, 44, 57):
+        for noise in (0.0, 4.0, 8.0, 12.0):
+            scene = BuffBarScene(width=640, height=360, distractors=10, icon_size=icon_size, noise=noise)
+            found = missed = false_positives = 0
+            for frame, has_icon in make_samples(scene, icons, args.seeds * 2):
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+                full_hit = full.match_frame(gray)
+                prefilter_hit = prefiltered.match_frame(gray)
+                found += full_hit and has_icon
+                missed += full_hit and has_icon and not prefilter_hit
+                false_positives += prefilter_hit and not has_icon
+            total_missed += missed
+            print(f"{icon_size:>6} | {noise:>4.0f} | {found:>9} | {missed:>14} | {false_positives:>4}")
+    print(f"사전 검색 놓침 합계: {total_missed}")
+
+
+# ========== memory: 틱당 할당 / 장시간 RSS ==========
+
+def rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS (MB), 알 수 없으면 None (psutil이 있으면 사용, 없으면 /proc)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        return int(statm.read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    return None
+
+
+def allocation_per_tick(detector: OneShotDetector, frames: list, ticks: int) -> float:
+    """process_frame 한 틱 동안 잠깐 할당되는 메모리 최대치의 중앙값 (KB)"""
+    for frame in frames:
+        detector.process_frame(frame)  # 워밍업 (버퍼 생성)
+    
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(ticks):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            detector.process_frame(frames[i % len(frames)])
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return float(np.median(peaks))
+
+
+def run_memory(args):
+    """버퍼 재사용 여부별 틱당 할당량 + 오래 돌렸을 때 RSS 변화"""
+    icons = load_icons()
+    scene = BuffBarScene(width=args.width, height=args.height, distractors=6)
+    frames = [frame for frame, _ in make_samples(scene, icons, 8)]
+    
+    # ========== 틱당 할당량 ==========
+    print(f"{'버퍼 재사용':>10} | {'틱당 할당 (KB)':>14}")
+    print("-" * 30)
+    for reuse in (False, True):
+        detector = new_detector()
+        detector.set_search_mode(SEARCH_FULL)
+        detector.reuse_buffers = reuse
+        print(f"{str(reuse):>10} | {allocation_per_tick(detector, frames, args.ticks):>14.1f}")
+    
+    # ========== 장시간 RSS ==========
+    detector = new_detector()
+    detector.set_search_mode(SEARCH_FULL)
+    print()
+    print(f"{'경과 (s)':>8} | {'틱':>8} | {'RSS (MB)':>9} | {'버퍼 할당':>8}")
+    print("-" * 44)
+    
+    start = time.perf_counter()
+    next_report = 0.0
+    samples = []
+    ticks = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= next_report:
+            rss = rss_mb()
+            samples.append((elapsed, rss))
+            rss_text = f"{rss:>9.1f}" if rss is not None else f"{'-':>9}"
+            print(f"{elapsed:>8.0f} | {ticks:>8} | {rss_text} | {detector.buffers.allocations:>8}")
+            next_report += args.report_every
+            if elapsed >= args.seconds:
+                break
+        detector.process_frame(frames[ticks % len(frames)])
+        ticks += 1
+    
+    # 워밍업이 끝난 두 번째 측정부터 기울기 계산
+    measured = [(t, rss) for t, rss in samples[1:] if rss is not None]
+    if len(measured) >= 2:
+        (t0, r0), (t1, r1) = measured[0], measured[-1]
+        print(f"RSS 변화: {r1 - r0:+.2f}MB ({(r1 - r0) / (t1 - t0) * 3600:+.2f}MB/시간)")
+
+
+# ========== suite: 합성 버프창 장면별 단계 시간 + 정확도 ==========
+
+def time_stages(detector: OneShotDetector, frame: np.ndarray) -> dict:
+    """
+    detect() 한 틱을 단계별로 나눠서 시간 측정 (전체 스케일 기준)
+    
+    Args:
+        detector: 감지기
+        frame: 캡처된 것으로 가정한 BGRA 프레임
+    
+    Returns:
+        단계 이름 -> 소요 시간 (ms)
+    """
+    stages = dict.fromkeys(("grab", "cvtColor", "resize", "matchTemplate", "minMaxLoc"), 0.0)
+    
+    t = time.perf_counter()
+    captured = np.array(frame)  # mss 화면 -> numpy 복사와 같은 비용
+    stages["grab"] = time.perf_counter() - t
+    
+    t = time.perf_counter()
+    gray = cv2.cvtColor(captured, cv2.COLOR_BGRA2GRAY)
+    stages["cvtColor"] = time.perf_counter() - t
+    
+    for entry in detector.template_bank:
+        if entry.width > gray.shape[1] or entry.height > gray.shape[0]:
+            continue
+        
+        # 템플릿 뱅크 이전에 매 틱 들던 크기 조절 비용
+        t = time.perf_counter()
+        cv2.resize(detector.template_original, (entry.width, entry.height))
+        stages["resize"] += time.perf_counter() - t
+        
+        t = time.perf_counter()
+        result = cv2.matchTemplate(gray, entry.template, cv2.TM_CCOEFF_NORMED)
+        stages["matchTemplate"] += time.perf_counter() - t
+        
+        t = time.perf_counter()
+        cv2.minMaxLoc(result)
+        stages["minMaxLoc"] += time.perf_counter() - t
+    
+    return {name: seconds * 1000 for name, seconds in stages.items()}
+
+
+def make_samples(scene: BuffBarScene, icons: list, frames: int) -> list:
+    """아이콘 있는 프레임 / 없는 프레임을 번갈아 만든 (BGRA 프레임, 정답) 목록"""
+    samples = []
+    for i in range(frames):
+        has_icon = i % 2 == 0
+        frame, _ = make_buff_bar(BuffBarScene(**{**scene.__dict__, "has_icon": has_icon}), icons, seed=i)
+        samples.append((frame, has_icon))
+    return samples
+
+
+def run_scenario(scene: BuffBarScene, icons: list, frames: int, config: dict,
+                 repeats: int = DEFAULT_REPEATS) -> dict:
+    """
+    장면 하나 벤치마크
+    
+    틱당 시간은 같은 프레임을 repeats번 돌린 것 중 가장 빠른 회차의 중앙값이다
+    (다른 프로세스 때문에 느려진 회차는 버림).
+    
+    Returns:
+        단계별 시간, 끝에서 끝까지 틱당 시간, 정확도
+    """
+    samples = make_samples(scene, icons, frames)
+    threshold = config["detection_threshold"]
+    icon_path = ICON_PATHS[scene.icon_index]  # 장면에 나오는 아이콘으로 감지
+    result = {"stages_ms": {}, "tick_ms": {}, "accuracy": {}}
+    
+    # 단계별 시간 (중앙값)
+    detector = new_detector(threshold, icon_path)
+    per_stage = [time_stages(detector, frame) for frame, _ in samples]
+    for name in per_stage[0]:
+        result["stages_ms"][name] = float(np.median([s[name] for s in per_stage]))
+    
+    # 끝에서 끝까지: 예전 방식(전체 스케일)과 현재 설정
+    for label in ("full", "configured"):
+        medians = []
+        for _ in range(max(1, repeats)):
+            detector = new_detector(threshold, icon_path)
+            if label == "configured":
+                configure_detector(detector, config)
+            
+            correct = 0
+            ticks = []
+            for frame, has_icon in samples:
+                t = time.perf_counter()
+                detected = detector.process_frame(frame)
+                ticks.append((time.perf_counter() - t) * 1000)
+                correct += detected == has_icon
+            medians.append(float(np.median(ticks)))
+        
+        result["tick_ms"][label] = min(medians)
+        result["accuracy"][label] = correct / len(samples)
+    
+    return result
+
+
+def compare(current: dict, baseline: dict, time_tolerance: float, accuracy_tolerance: float,
+            time_floor_ms: float = DEFAULT_TIME_FLOOR_MS) -> list:
+    """
+    기준 결과와 비교해서 나빠진 항목 목록 반환
+    
+    틱당 시간은 비율(time_tolerance)과 절대값(time_floor_ms)을 둘 다 넘어야 나빠진 것으로 본다.
+    
+    Returns:
+        문제 설명 문자열 목록 (비어 있으면 통과)
+    """
+    failures = []
+    for name, base in baseline["scenarios"].items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            failures.append(f"{name}: 현재 결과에 없음")
+            continue
+        for label, base_ms in base["tick_ms"].items():
+            now_ms = now["tick_ms"].get(label)
+            if (now_ms is not None and now_ms > base_ms * (1 + time_tolerance)
+                    and now_ms - base_ms > time_floor_ms):
+                failures.append(f"{name}/{label}: 틱당 {base_ms:.3f}ms -> {now_ms:.3f}ms")
+        for label, base_acc in base["accuracy"].items():
+            now_acc = now["accuracy"].get(label)
+            if now_acc is not None and now_acc < base_acc - accuracy_tolerance:
+                failures.append(f"{name}/{label}: 정확도 {base_acc:.2f} -> {now_acc:.2f}")
+    return failures
+
+
+def run_suite(args):
+    """합성 장면 전체 벤치마크 + 기준 결과 저장/비교"""
+    config = load_config()
+    icons = load_icons()
+    
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "frames": args.frames,
+            "repeats": args.repeats,
+        },
+        "scenarios": {},
+    }
+    
+    print(f"{'장면':>12} | {'grab':>6} | {'cvt':>6} | {'resize':>6} | {'match':>7} | {'minmax':>6}"
+          f" | {'full ms':>8} | {'설정 ms':>8} | {'정확도':>9}")
+    print("-" * 96)
+    for name, scene in SCENARIOS:
+        result = run_scenario(scene, icons, args.frames, config, args.repeats)
+        report["scenarios"][name] = result
+        
+        s = result["stages_ms"]
+        print(f"{name:>12} | {s['grab']:>6.3f} | {s['cvtColor']:>6.3f} | {s['resize']:>6.3f}"
+              f" | {s['matchTemplate']:>7.3f} | {s['minMaxLoc']:>6.3f}"
+              f" | {result['tick_ms']['full']:>8.3f} | {result['tick_ms']['configured']:>8.3f}"
+              f" | {result['accuracy']['full']:.2f}/{result['accuracy']['configured']:.2f}")
+    
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"기준 결과 저장: {args.save}")
+    
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(report, baseline, args.time_tolerance, args.accuracy_tolerance, args.time_floor)
+        if failures:
+            print("=" * 50)
+            print("성능/정확도 저하:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("기준 결과 대비 이상 없음")
+
+
+def main():
+    """벤치마크 실행"""
+    config = load_config()
+    parser = argparse.ArgumentParser(description="감지기 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    bank = sub.add_parser("bank", help="템플릿 뱅크 / 스케일 검색 / 위치 추적 비교")
+    bank.add_argument("--ticks", type=int, default=200, help="크기별 반복 횟수")
+    bank.set_defaults(func=run_bank)
+    
+    prefilter = sub.add_parser("prefilter", help="전체 화면 크기에서 축소 사전 검색 비교 + 재현율")
+    prefilter.add_argument("--frames", type=int, default=10, help="장면별 프레임 수")
+    prefilter.add_argument("--seeds", type=int, default=10, help="재현율 비교의 장면별 아이콘 있는 프레임 수")
+    prefilter.add_argument("--factor", type=float, default=config["prefilter_factor"], help="사전 검색 축소 비율")
+    prefilter.add_argument("--candidates", type=int, default=config["prefilter_candidates"],
+                           help="원본 해상도로 확인할 후보 수")
+    prefilter.set_defaults(func=run_prefilter)
+    
+    memory = sub.add_parser("memory", help="틱당 메모리 할당 + 장시간 RSS 변화")
+    memory.add_argument("--ticks", type=int, default=200, help="할당량 측정 틱 수")
+    memory.add_argument("--seconds", type=float, default=60, help="RSS 관찰 시간 (초)")
+    memory.add_argument("--report-every", type=float, default=10, help="RSS 출력 간격 (초)")
+    memory.add_argument("--width", type=int, default=800, help="합성 영역 너비")
+    memory.add_argument("--height", type=int, default=200, help="합성 영역 높이")
+    memory.set_defaults(func=run_memory)
+    
+    suite = sub.add_parser("suite", help="합성 버프창 장면별 단계 시간 + 정확도")
+    suite.add_argument("--frames", type=int, default=40, help="장면별 프레임 수")
+    suite.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                       help="장면마다 반복 횟수 (가장 빠른 회차의 틱당 시간을 씀)")
+    suite.add_argument("--save", help="결과를 기준 JSON으로 저장할 경로")
+    suite.add_argument("--compare", help="비교할 기준 JSON 경로 (나빠지면 종료 코드 1)")
+    suite.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                       help="허용하는 틱당 시간 증가 비율")
+    suite.add_argument("--time-floor", type=float, default=DEFAULT_TIME_FLOOR_MS,
+                       help="이보다 작은 틱당 시간 증가(ms)는 비율을 넘어도 허용")
+    suite.add_argument("--accuracy-tolerance", type=float, default=DEFAULT_ACCURACY_TOLERANCE,
+                       help="허용하는 정확도 감소")
+    suite.set_defaults(func=run_suite)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
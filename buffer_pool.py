@@ -0,0 +1,56 @@
+from collections import OrderedDict  # 오래된 버퍼부터 버리기용
+from typing import Hashable, Tuple  # 타입 힌트용
+
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+# 보관할 버퍼 최대 개수 (영역 가장자리의 위치 추적 창처럼 크기가 자주 바뀌는 경우 대비)
+DEFAULT_MAX_BUFFERS = 32
+
+
+class BufferPool:
+    """
+    크기별로 미리 만들어 둔 numpy 버퍼 모음
+    
+    매 틱 같은 크기의 결과를 만드는 OpenCV 호출(cvtColor, matchTemplate, resize)에
+    dst= 로 넘겨서, 정상 상태에서는 틱마다 새 배열을 할당하지 않게 한다.
+    """
+    
+    def __init__(self, max_buffers: int = DEFAULT_MAX_BUFFERS):
+        """
+        Args:
+            max_buffers: 보관할 버퍼 최대 개수 (넘으면 가장 오래 안 쓴 것부터 버림)
+        """
+        self.max_buffers = max_buffers
+        self._buffers: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self.allocations = 0  # 새로 만든 버퍼 수 (정상 상태면 더 늘지 않아야 함)
+    
+    def get(self, key: Hashable, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        용도(key)와 크기에 맞는 버퍼 반환 (없거나 크기가 다르면 새로 만듦)
+        
+        Args:
+            key: 버퍼 용도 (예: "gray", ("match", 1.0))
+            shape: 버퍼 크기
+            dtype: 자료형
+        
+        Returns:
+            내용이 정해지지 않은 버퍼 (호출한 쪽이 덮어씀)
+        """
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+            self._buffers[key] = buffer
+            if len(self._buffers) > self.max_buffers:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer
+    
+    def clear(self):
+        """버퍼 전부 버리기"""
+        self._buffers.clear()
+    
+    def nbytes(self) -> int:
+        """보관 중인 버퍼 전체 크기 (바이트)"""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
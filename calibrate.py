@@ -0,0 +1,306 @@
+import argparse  # 명령줄 인자 처리용
+import time  # 시간 측정용
+from collections import Counter  # 가장 많이 나온 스케일 찾기용
+from typing import Dict, List, Optional, Sequence  # 타입 힌트용
+
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+from config import load_config, save_config  # 설정 관리
+from detector import MatchResult, OneShotDetector, SEARCH_FULL  # 아이콘 감지기
+from frame_source import open_recording  # 녹화 프레임 소스
+from multi_detector import MultiIconDetector, icons_from_config  # 여러 아이콘 감지기
+from preprocess import PREPROCESS_MODES  # 매칭 전 전처리
+from synthetic import BuffBarScene, load_icons, make_buff_bar  # 합성 화면
+from threshold_tuner import ScoreHistogram, find_score_gap  # 아이콘 / 배경 점수 가르기
+
+# 분리도가 최고값에서 이만큼 안쪽이면 같은 수준으로 보고 더 빠른 모드를 고름
+MARGIN_TOLERANCE = 0.02
+
+# 보정 위치 주변 여유 픽셀 (버프가 늘고 줄면서 아이콘이 조금 움직이는 것 대비)
+CALIBRATION_PADDING = 4
+
+
+def load_frames(path: str, limit: int = 0) -> List[np.ndarray]:
+    """녹화 파일/폴더의 프레임을 메모리로 읽기 (limit > 0이면 그 개수까지)"""
+    source = open_recording(path)
+    frames = []
+    try:
+        for frame in source:
+            frames.append(np.array(frame))
+            if limit and len(frames) >= limit:
+                break
+    finally:
+        source.close()
+    return frames
+
+
+def synthetic_frames(count: int) -> tuple:
+    """아이콘 있는 / 없는 합성 버프창 (밝기와 노이즈를 섞어서)"""
+    icons = load_icons()
+    hits, misses = [], []
+    for i in range(count):
+        scene = BuffBarScene(width=400, height=60, distractors=6,
+                             noise=4.0 * (i % 3), brightness=(0.7, 1.0, 1.2)[i % 3])
+        hits.append(make_buff_bar(scene, icons, seed=i)[0])
+        misses.append(make_buff_bar(BuffBarScene(**{**scene.__dict__, "has_icon": False}), icons, seed=i)[0])
+    return hits, misses
+
+
+def score_frames(detector: OneShotDetector, frames: Sequence[np.ndarray]) -> tuple:
+    """프레임마다 (최고 매칭 값 목록, 틱당 시간 ms 목록)"""
+    scores, ticks = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        detector.process_frame(frame)
+        ticks.append((time.perf_counter() - start) * 1000)
+        scores.append(detector.get_last_match_value())
+    return scores, ticks
+
+
+def compare_preprocess_modes(icon_path: str, hits: Sequence[np.ndarray],
+                             misses: Sequence[np.ndarray]) -> List[dict]:
+    """
+    전처리 모드별로 아이콘 있는/없는 프레임의 점수 분리도와 틱당 시간 측정
+    
+    Args:
+        icon_path: 아이콘 이미지 경로
+        hits: 아이콘이 보이는 프레임들
+        misses: 아이콘이 없는 프레임들
+    
+    Returns:
+        모드별 결과 (hit_min, hit_mean, miss_max, miss_mean, margin, tick_ms)
+    """
+    results = []
+    for mode in PREPROCESS_MODES:
+        detector = OneShotDetector(icon_path)
+        detector.debug = False
+        detector.set_search_mode(SEARCH_FULL)  # 모드끼리 같은 조건으로 비교
+        detector.set_preprocess(mode)
+        
+        hit_scores, hit_ticks = score_frames(detector, hits)
+        miss_scores, miss_ticks = score_frames(detector, misses)
+        results.append({
+            "mode": mode,
+            "hit_min": min(hit_scores),
+            "hit_mean": float(np.mean(hit_scores)),
+            "miss_max": max(miss_scores),
+            "miss_mean": float(np.mean(miss_scores)),
+            "margin": min(hit_scores) - max(miss_scores),
+            "tick_ms": float(np.median(hit_ticks + miss_ticks)),
+        })
+    return results
+
+
+def recommend(results: Sequence[dict], tolerance: float = MARGIN_TOLERANCE) -> dict:
+    """분리도가 가장 좋은 모드 (비슷하면 더 빠른 쪽)"""
+    best_margin = max(result["margin"] for result in results)
+    close = [result for result in results if result["margin"] >= best_margin - tolerance]
+    return min(close, key=lambda result: result["tick_ms"])
+
+
+# ========== preprocess: 전처리 모드 비교 ==========
+
+def run_preprocess(args):
+    """전처리 모드별 점수 분리도 / 틱당 시간 출력 + 추천"""
+    if args.synthetic:
+        hits, misses = synthetic_frames(args.limit or 20)
+    else:
+        if not args.hits or not args.misses:
+            raise SystemExit("--hits와 --misses 녹화를 지정하거나 --synthetic을 사용하세요")
+        hits = load_frames(args.hits, args.limit)
+        misses = load_frames(args.misses, args.limit)
+    if not hits or not misses:
+        raise SystemExit("프레임이 없습니다")
+    
+    results = compare_preprocess_modes(args.icon, hits, misses)
+    
+    print(f"프레임: 아이콘 있음 {len(hits)} / 없음 {len(misses)}")
+    print(f"{'모드':>6} | {'있음 최소':>9} | {'있음 평균':>9} | {'없음 최대':>9} | {'없음 평균':>9}"
+          f" | {'분리도':>7} | {'틱당 (ms)':>9}")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['mode']:>6} | {r['hit_min']:>9.3f} | {r['hit_mean']:>9.3f} | {r['miss_max']:>9.3f}"
+              f" | {r['miss_mean']:>9.3f} | {r['margin']:>7.3f} | {r['tick_ms']:>9.3f}")
+    
+    best = recommend(results)
+    print("=" * 50)
+    if best["margin"] <= 0:
+        print("어떤 모드도 아이콘 있는/없는 프레임을 완전히 나누지 못했습니다")
+    print(f"추천: \"preprocess\": \"{best['mode']}\" (분리도 {best['margin']:.3f}, 틱당 {best['tick_ms']:.2f}ms)")
+    # 두 분포 사이 가운데를 기준값으로 제안
+    print(f"이때 기준값 예시: \"detection_threshold\": {(best['hit_min'] + best['miss_max']) / 2:.2f}")
+
+
+# ========== session: 스케일 / 위치 / 기준값 보정 ==========
+
+def summarize_scores(scores: Sequence[float]) -> dict:
+    """매칭 값 분포 요약 (개수 / 최소 / p5 / p50 / p95 / p99 / 최대)"""
+    if not scores:
+        return {"count": 0}
+    p5, p50, p95, p99 = np.percentile(scores, [5, 50, 95, 99])
+    return {
+        "count": len(scores),
+        "min": float(min(scores)),
+        "p5": float(p5),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(max(scores)),
+    }
+
+
+def calibrate_icon(samples: Sequence[MatchResult], min_hits: int = 3,
+                   min_background: int = 10) -> Optional[dict]:
+    """
+    틱마다 모은 매칭 결과로 아이콘 하나 보정
+    
+    지금 기준값과 상관없이 매칭 값 분포에서 배경과 아이콘 사이의 빈 구간(find_score_gap)을
+    찾아, 그 위를 아이콘이 보인 틱, 아래를 배경으로 본다. 기준값이 너무 높아서
+    아이콘이 기준에 못 미치던 경우에도 제안값이 아래로 내려올 수 있다.
+    
+    Args:
+        samples: 틱별 가장 높은 매칭 결과
+        min_hits: 빈 구간 위에 있어야 할 틱 수
+        min_background: 빈 구간 아래에 있어야 할 틱 수
+    
+    Returns:
+        {"scale", "location", "threshold", "hit_scores", "background_scores"}
+        (아이콘과 배경이 갈리지 않았으면 None)
+    """
+    histogram = ScoreHistogram()
+    for sample in samples:
+        histogram.add(sample.value)
+    gap = find_score_gap(histogram, min_hits, min_background)
+    if gap is None:
+        return None
+    hits = [sample for sample in samples if sample.value >= gap.high]
+    background = [sample.value for sample in samples if sample.value < gap.low]
+    
+    # 가장 많이 나온 스케일, 그 스케일로 찾은 위치들을 모두 덮는 상자
+    scale = Counter(hit.scale for hit in hits).most_common(1)[0][0]
+    at_scale = [hit for hit in hits if hit.scale == scale]
+    x0 = max(0, min(hit.x for hit in at_scale) - CALIBRATION_PADDING)
+    y0 = max(0, min(hit.y for hit in at_scale) - CALIBRATION_PADDING)
+    x1 = max(hit.x + hit.width for hit in at_scale) + CALIBRATION_PADDING
+    y1 = max(hit.y + hit.height for hit in at_scale) + CALIBRATION_PADDING
+    
+    # 기준값 제안: 아이콘 점수 하위 5%와 배경 점수 상위 1% 사이 가운데
+    hit_scores = summarize_scores([hit.value for hit in hits])
+    background_scores = summarize_scores(background)
+    suggested = round((hit_scores["p5"] + background_scores["p99"]) / 2, 2)
+    
+    return {
+        "scale": scale,
+        "location": [x0, y0, x1 - x0, y1 - y0],
+        "threshold": suggested,
+        "hit_scores": hit_scores,
+        "background_scores": background_scores,
+    }
+
+
+def collect_session(detector: MultiIconDetector, seconds: float, interval_ms: int) -> Dict[str, List[MatchResult]]:
+    """
+    감지기를 돌리면서 아이콘별 틱 결과 모으기
+    
+    Args:
+        detector: 감지기 (소스가 녹화면 끝까지, 화면이면 seconds 동안)
+        seconds: 화면 캡처 시간 (녹화 소스면 무시)
+        interval_ms: 틱 간격 (녹화 소스면 0)
+    """
+    samples: Dict[str, List[MatchResult]] = {name: [] for name in detector.names()}
+    deadline = time.monotonic() + seconds
+    while seconds <= 0 or time.monotonic() < deadline:
+        try:
+            detector.detect()
+        except EOFError:
+            break
+        for name, icon_detector in detector.detectors.items():
+            result = icon_detector.last_result
+            samples[name].append(MatchResult(result.value, result.scale, result.x, result.y,
+                                             result.width, result.height))
+        if interval_ms:
+            time.sleep(interval_ms / 1000)
+    return samples
+
+
+def run_session(args):
+    """짧게 감지를 돌려서 스케일 / 위치 / 기준값을 찾고 config.json에 저장"""
+    config = load_config()
+    
+    # 보정 중에는 모든 스케일, 전체 영역을 매 틱 매칭
+    detector = MultiIconDetector(icons_from_config(config))
+    detector.set_preprocess(config["preprocess"])
+    detector.set_search_mode(SEARCH_FULL)
+    detector.set_roi_tracking(False)
+    detector.set_frame_gate(False)
+    detector.set_prefilter(config["prefilter"], config["prefilter_factor"], config["prefilter_candidates"])
+    
+    if args.recording:
+        # 녹화에는 화면 위치가 없어서 저장해도 어느 감지 영역의 보정인지 알 수 없음
+        if not args.dry_run:
+            raise SystemExit("--recording으로 보정한 결과는 저장할 수 없습니다 (--dry-run과 함께 사용하세요)")
+        detector.set_source(open_recording(args.recording))
+        seconds, interval_ms = 0, 0
+    else:
+        region = config["detection_region"]
+        if not region:
+            raise SystemExit("먼저 타이머에서 감지 영역을 설정하세요")
+        detector.set_region(region["x"], region["y"], region["width"], region["height"])
+        seconds, interval_ms = args.seconds, config["scan_interval_ms"]
+        print(f"{seconds:.0f}초 동안 화면을 봅니다. 그동안 스킬을 한두 번 사용해 주세요.")
+    
+    try:
+        samples = collect_session(detector, seconds, interval_ms)
+    finally:
+        detector.close()
+    
+    results = {}
+    for name, icon_samples in samples.items():
+        threshold = detector.detectors[name].threshold
+        result = calibrate_icon(icon_samples)
+        if result is None:
+            print(f"{name}: {len(icon_samples)}틱 동안 아이콘과 배경 점수가 갈리지 않아 보정하지 못했습니다"
+                  f" (스킬을 한두 번 사용했는지 확인하세요)")
+            continue
+        results[name] = result
+        hit, background = result["hit_scores"], result["background_scores"]
+        print(f"{name}: 스케일 {result['scale']:.1f} / 위치 {tuple(result['location'])}"
+              f" / 기준값 {threshold:.2f} -> {result['threshold']:.2f}")
+        print(f"    아이콘 {hit['count']}틱 (최소 {hit['min']:.3f}, p5 {hit['p5']:.3f})"
+              f" / 배경 {background['count']}틱 (p99 {background['p99']:.3f}, 최대 {background['max']:.3f})")
+    
+    if not results:
+        raise SystemExit("저장할 보정 결과가 없습니다")
+    if args.dry_run:
+        return
+    
+    config["calibration"] = {"region": config["detection_region"], "icons": results}
+    save_config(config)
+    print("config.json에 저장했습니다 (같은 감지 영역에서 다음 실행부터 적용)")
+
+
+def main():
+    """보정 도구 실행"""
+    parser = argparse.ArgumentParser(description="감지기 보정 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    preprocess = sub.add_parser("preprocess", help="전처리 모드별 점수 분리도 / 틱당 시간 비교")
+    preprocess.add_argument("--hits", help="아이콘이 보이는 녹화 (이미지 폴더 / .npy / 동영상)")
+    preprocess.add_argument("--misses", help="아이콘이 없는 녹화")
+    preprocess.add_argument("--synthetic", action="store_true", help="녹화 대신 합성 버프창 사용")
+    preprocess.add_argument("--icon", default="assets/oneshot_icon.png", help="아이콘 이미지 경로")
+    preprocess.add_argument("--limit", type=int, default=0, help="녹화별 최대 프레임 수 (0이면 전부)")
+    preprocess.set_defaults(func=run_preprocess)
+    
+    session = sub.add_parser("session", help="스케일 / 위치 / 기준값을 찾아 config.json에 저장")
+    session.add_argument("--seconds", type=float, default=20, help="화면을 볼 시간 (초)")
+    session.add_argument("--recording", help="화면 대신 이 녹화로 보정 (이미지 폴더 / .npy / 동영상, --dry-run 필요)")
+    session.add_argument("--dry-run", action="store_true", help="결과만 출력하고 저장하지 않음")
+    session.set_defaults(func=run_session)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import copy  # 저장할 설정 복사용
 import json  # JSON 파일 처리용
+import os  # 원자적 파일 교체용
+import tempfile  # 임시 파일 생성용
+import threading  # 백그라운드 저장용
+import time  # 저장 지연 / 파일 확인 주기용
 from pathlib import Path  # 파일 경로 처리용
+from typing import Any, Dict, Optional, Tuple  # 타입 힌트용
 
 # 설정 파일 경로
 CONFIG_FILE = Path("config.json")
@@ -10,18 +16,282 @@ DEFAULT_CONFIG = {
     "detection_region": None,  # 감지할 화면 영역
     "overlay_position": {"x": 100, "y": 100},  # 타이머 창 위치
     "detection_threshold": 0.8,  # 이미지 매칭 정확도 (80%)
+    "adaptive_threshold": False,  # 감지 중 모은 매칭 값 분포로 기준값 자동 조정 (detection_threshold에서 시작)
     "scan_interval_ms": 100,  # 화면 스캔 주기 (0.1초)
+    "timer_scan_interval_ms": 500,  # 쿨타임 중 스캔 주기 (아이콘이 다시 뜰 수 없음)
+    "idle_scan_interval_ms": 300,  # 오랫동안 아이콘이 안 보일 때 스캔 주기 (저전력)
+    "scan_ramp_seconds": 3.0,  # 쿨타임 종료 이 시간 전부터 스캔 주기를 점점 빠르게
+    "idle_after_seconds": 60.0,  # 이 시간 동안 아이콘이 없으면 저전력 스캔
+    "repaint_interval_ms": 33,  # 타이머 화면 갱신 주기 (약 30fps)
+    "animation_interval_ms": 16,  # 카운트다운 애니메이션 주기 (약 60fps, 감지 주기와 별개)
+    "scale_search": "coarse_to_fine",  # 스케일 검색 모드 (full / coarse_to_fine)
+    "preprocess": "gray",  # 매칭 전 전처리 (gray / blue / green / red / edge)
+    "prefilter": True,  # 큰 영역은 축소 화면에서 후보를 먼저 찾고 후보만 원본으로 확인
+    "prefilter_factor": 0.5,  # 사전 검색 축소 비율 (0.33이면 작은 아이콘을 놓침)
+    "prefilter_candidates": 6,  # 원본 해상도로 확인할 후보 수
+    "presence_confirm_frames": 2,  # 아이콘이 나타남 / 사라짐을 확정하는 데 필요한 프레임 수 (N)
+    "presence_window_frames": 3,  # 확인할 최근 프레임 수 (M)
+    "presence_exit_margin": 0.1,  # 보이던 아이콘은 기준값에서 이만큼 더 내려가야 사라진 것으로 봄
+    "roi_tracking": True,  # 마지막으로 찾은 위치 주변부터 검색
+    "roi_padding": 8,  # 위치 추적 여유 픽셀
+    "frame_gate": True,  # 화면 변화가 없으면 매칭 생략
+    "frame_gate_threshold": 8.0,  # 변화로 볼 블록(16픽셀)별 평균 밝기 차이 (0~255, 가장 크게 바뀐 블록 기준)
+    "show_latency": False,  # 상태줄에 감지 지연 시간(p50/p99) 표시
+    "latency_dump_path": "",  # 종료 시 지연 시간 기록을 저장할 파일 (비우면 저장 안 함)
+    "session_log_dir": "",  # 감지 세션 기록(JSON Lines)을 남길 폴더 (비우면 기록 안 함)
+    "icons": [],  # 추적할 스킬 아이콘 목록 (비우면 일격필살 하나)
+    "regions": [],  # 여러 감지 영역 (영역마다 프로세스 하나, 비우면 감지 영역 하나)
+    "calibration": None,  # calibrate.py session 결과 (스케일 / 위치 / 기준값, 같은 영역일 때만 사용)
 }
 
-def load_config():
-    """설정 파일 불러오기"""
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+# 숫자 설정의 허용 범위 (최소, 최대) - 벗어나면 기본값 사용
+VALUE_RANGES = {
+    "cooldown": (0.0, None),
+    "detection_threshold": (0.0, 1.0),
+    "scan_interval_ms": (1, None),
+    "timer_scan_interval_ms": (1, None),
+    "idle_scan_interval_ms": (1, None),
+    "scan_ramp_seconds": (0.1, None),
+    "idle_after_seconds": (0.0, None),
+    "repaint_interval_ms": (1, None),
+    "animation_interval_ms": (1, None),
+    "prefilter_factor": (0.05, 1.0),
+    "prefilter_candidates": (1, None),
+    "presence_confirm_frames": (1, None),
+    "presence_window_frames": (1, None),
+    "presence_exit_margin": (0.0, 1.0),
+    "roi_padding": (0, None),
+    "frame_gate_threshold": (0.0, 255.0),
+}
+
+# 앱을 다시 시작하지 않고 파일 수정만으로 바로 적용되는 설정
+HOT_RELOAD_KEYS = ("detection_threshold", "scan_interval_ms")
+
+# 저장 요청을 모아서 쓰기까지 기다리는 시간 (초)
+DEFAULT_SAVE_DELAY = 0.5
+
+# 설정 파일 변경 확인 주기 (초)
+DEFAULT_WATCH_INTERVAL = 1.0
+
+
+def _check_value(key: str, value: Any) -> bool:
+    """기본값과 같은 종류이고 허용 범위 안인지"""
+    default = DEFAULT_CONFIG[key]
+    if default is None:
+        return True
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            return False
+    elif isinstance(default, (int, float)):
+        # bool은 int의 하위 타입이라 따로 막음, 실수 설정에는 정수도 허용
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if isinstance(default, int) and not float(value).is_integer():
+            return False
+    elif not isinstance(value, type(default)):
+        return False
+    
+    low, high = VALUE_RANGES.get(key, (None, None))
+    if low is not None and value < low:
+        return False
+    if high is not None and value > high:
+        return False
+    return True
+
+
+def validate_config(config: dict) -> dict:
+    """
+    설정 검사 (잘못된 값은 경고 후 기본값으로)
+    
+    기본값이 있는 항목은 종류와 범위를 확인하고, 정수 설정은 int로 맞춘다.
+    모르는 항목은 그대로 둔다.
+    """
+    result = {**DEFAULT_CONFIG, **config}
+    for key, default in DEFAULT_CONFIG.items():
+        value = result[key]
+        if not _check_value(key, value):
+            print(f"⚠️ 설정 {key}={value!r} 값이 잘못되어 기본값 {default!r}을 사용합니다")
+            result[key] = copy.deepcopy(default)
+        elif isinstance(default, int) and not isinstance(default, bool):
+            result[key] = int(value)
+    
+    if result["presence_confirm_frames"] > result["presence_window_frames"]:
+        print("⚠️ presence_confirm_frames가 presence_window_frames보다 커서 같게 맞춥니다")
+        result["presence_confirm_frames"] = result["presence_window_frames"]
+    return result
+
+
+def load_config(path: Path = CONFIG_FILE):
+    """설정 파일 불러오기 (검사 후 기본값과 합침)"""
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
             saved = json.load(f)
-            return {**DEFAULT_CONFIG, **saved}
-    return DEFAULT_CONFIG.copy()
+            return validate_config(saved)
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+def save_config(config, path: Path = CONFIG_FILE):
+    """설정 파일 저장하기 (임시 파일에 다 쓴 뒤 교체해서 중간에 꺼져도 깨지지 않음)"""
+    fd, temp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
 
-def save_config(config):
-    """설정 파일 저장하기"""
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+class ConfigStore:
+    """
+    메모리에 둔 설정 + 백그라운드 저장 + 파일 변경 감지
+    
+    설정은 시작할 때 한 번 읽고 검사한 스냅샷(config)을 계속 쓴다.
+    save()는 바로 쓰지 않고 저장 스레드에 맡기며, 짧은 시간 안의 여러 요청은
+    마지막 것 하나로 합쳐서 쓴다 (Tk 이벤트 처리 중에 디스크를 기다리지 않음).
+    
+    reload_if_changed()를 주기적으로 부르면 파일이 밖에서 바뀌었을 때
+    HOT_RELOAD_KEYS 중 검사를 통과한 값만 다시 읽어 돌려준다.
+    """
+    
+    def __init__(self, path: Path = CONFIG_FILE, save_delay: float = DEFAULT_SAVE_DELAY,
+                 watch_interval: float = DEFAULT_WATCH_INTERVAL):
+        """
+        Args:
+            path: 설정 파일 경로
+            save_delay: 저장 요청을 모으는 시간 (초)
+            watch_interval: 파일 변경 확인 주기 (초)
+        """
+        self.path = Path(path)
+        self.save_delay = save_delay
+        self.watch_interval = watch_interval
+        self.config = load_config(self.path)
+        
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[dict] = None  # 아직 안 쓴 설정
+        self._requested_at = 0.0
+        
+        # 마지막으로 본 파일 상태 (우리가 쓴 것은 다시 읽지 않음)
+        self._file_state = self._stat()
+        self._checked_at = 0.0
+        
+        self.save_requests = 0  # save() 호출 수
+        self.writes = 0         # 실제로 파일을 쓴 수
+    
+    # ========== 저장 ==========
+    
+    def save(self):
+        """현재 설정 저장 예약 (save_delay 동안 요청이 더 없으면 저장 스레드가 씀)"""
+        with self._lock:
+            self._pending = copy.deepcopy(self.config)
+            self._requested_at = time.monotonic()
+            self.save_requests += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._closing.clear()
+                self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+                self._thread.start()
+        self._wake.set()
+    
+    def flush(self, timeout: float = 2.0):
+        """예약된 저장을 바로 쓰고 저장 스레드 정지 (종료할 때)"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._closing.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+    
+    def _run(self):
+        """저장 스레드 본체"""
+        while True:
+            self._wake.wait()
+            
+            # 마지막 요청 후 save_delay가 지날 때까지 기다림 (종료 중이면 바로)
+            while not self._closing.is_set():
+                with self._lock:
+                    remaining = self._requested_at + self.save_delay - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._closing.wait(remaining)
+            
+            with self._lock:
+                data = self._pending
+                self._pending = None
+                self._wake.clear()
+            if data is not None:
+                try:
+                    save_config(data, self.path)
+                    self.writes += 1
+                except OSError as e:
+                    print(f"설정 저장 실패: {e}")
+                with self._lock:
+                    self._file_state = self._stat()
+            
+            if self._closing.is_set():
+                return
+    
+    # ========== 변경 감지 ==========
+    
+    def reload_if_changed(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        설정 파일이 밖에서 바뀌었으면 바로 적용할 항목만 다시 읽기 (watch_interval마다 한 번)
+        
+        Returns:
+            바뀐 HOT_RELOAD_KEYS 항목 -> 새 값 (없으면 빈 dict)
+        """
+        now = time.monotonic() if now is None else now
+        if now - self._checked_at < self.watch_interval:
+            return {}
+        self._checked_at = now
+        
+        state = self._stat()
+        with self._lock:
+            if state == self._file_state or self._pending is not None:
+                return {}
+            self._file_state = state
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            # 편집 중 잠깐 깨진 파일은 다음 확인 때 다시 읽음
+            print(f"설정 다시 읽기 실패: {e}")
+            self._file_state = None
+            return {}
+        if not isinstance(saved, dict):
+            print("설정 다시 읽기 실패: 최상위가 객체가 아닙니다")
+            return {}
+        
+        # 검사를 통과한 값만 적용 (빠졌거나 잘못된 항목은 기본값이 아니라 지금 값을 유지)
+        changes = {}
+        for key in HOT_RELOAD_KEYS:
+            if key not in saved:
+                continue
+            value = saved[key]
+            if not _check_value(key, value):
+                print(f"⚠️ 설정 {key}={value!r} 값이 잘못되어 지금 값 {self.config[key]!r}을 유지합니다")
+                continue
+            if isinstance(DEFAULT_CONFIG[key], int) and not isinstance(DEFAULT_CONFIG[key], bool):
+                value = int(value)
+            if value != self.config[key]:
+                changes[key] = value
+        self.config.update(changes)
+        if changes:
+            print("설정 다시 읽음: " + ", ".join(f"{key}={value}" for key, value in changes.items()))
+        return changes
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """파일 상태 (수정 시각 ns, 크기), 없으면 None"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,183 @@
+import queue  # 스레드 간 결과 전달용
+import threading  # 백그라운드 스레드
+import time  # 틱당 CPU 시간 측정용
+from dataclasses import dataclass, field  # 결과 정의용
+from typing import Dict, List, Optional  # 타입 힌트용
+
+from multi_detector import IconResult, MultiIconDetector  # 여러 아이콘 감지기
+from scheduler import TickScheduler, capture_clock  # 마감 시각 기반 스케줄러
+
+
+@dataclass
+class DetectionResult:
+    """백그라운드 감지 한 번의 결과"""
+    timestamp: float                 # 캡처 시각 (capture_clock)
+    icons: Dict[str, IconResult]     # 아이콘 이름 -> 결과
+    error: Optional[str] = None      # 감지 중 오류 메시지
+    region: str = ""                 # 감지 영역 이름 (여러 영역을 프로세스로 나눠 감지할 때)
+    timings: Dict[str, float] = field(default_factory=dict)  # 단계별 소요 시간 (초, capture / convert / tick)
+    cpu: float = 0.0                 # 이 틱에 쓴 CPU 시간 (초, 감지 스레드 기준)
+
+
+class DetectionWorker:
+    """
+    화면 캡처 + 매칭을 Tk 메인 스레드 밖에서 돌리는 작업자
+    
+    결과는 크기가 제한된 큐에 쌓이고, Tk 쪽은 drain()으로 꺼내서 화면만 갱신한다.
+    큐가 가득 차면 가장 오래된 결과를 버린다.
+    """
+    
+    def __init__(self, detector: MultiIconDetector, interval_ms: int, max_results: int = 8):
+        """
+        작업자 초기화
+        
+        Args:
+            detector: 사용할 감지기 (캡처 도구는 작업 스레드에서 새로 만듦)
+            interval_ms: 감지 주기 (ms)
+            max_results: 큐에 쌓아둘 최대 결과 수
+        """
+        self.detector = detector
+        self.scheduler = TickScheduler(interval_ms, clock=capture_clock)
+        self.results: "queue.Queue[DetectionResult]" = queue.Queue(maxsize=max_results)
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        # 이 시각(capture_clock)까지는 감지하지 않음
+        self._paused_until = 0.0
+    
+    def start(self, timeout: float = 1.0):
+        """
+        작업 스레드 시작
+        
+        정지 요청을 받은 이전 스레드가 아직 감지 중이면 timeout초까지 끝나길 기다리고,
+        그래도 안 끝나면 두 스레드가 같은 감지기를 쓰지 않도록 RuntimeError를 낸다.
+        """
+        if self._thread is not None:
+            if self._thread.is_alive() and not self._stop_event.is_set():
+                return  # 이미 돌고 있음
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                raise RuntimeError("이전 감지 스레드가 아직 끝나지 않았습니다")
+            self._thread = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="DetectionWorker", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 1.0):
+        """작업 스레드 정지 (현재 감지가 끝날 때까지 최대 timeout초 기다림, 안 끝나면 start()에서 다시 기다림)"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is None:
+            return
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        if not thread.is_alive():
+            self._thread = None
+    
+    def is_alive(self) -> bool:
+        """작업 스레드가 돌고 있는지"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def set_interval(self, interval_ms: int):
+        """감지 주기 변경 (ms)"""
+        self.scheduler.set_interval(interval_ms)
+    
+    def pause_until(self, timestamp: float):
+        """지정한 시각(capture_clock)까지 감지 쉬기"""
+        self._paused_until = timestamp
+    
+    def pause_icon(self, name: str, timestamp: float):
+        """지정한 시각(capture_clock)까지 해당 아이콘만 매칭하지 않음"""
+        self.detector.pause_icon(name, timestamp)
+    
+    def set_threshold(self, threshold: float):
+        """모든 아이콘의 매칭 기준값 변경"""
+        self.detector.set_threshold(threshold)
+    
+    def resume_all(self):
+        """모든 아이콘 일시정지 해제 + 비교용 이전 화면 초기화"""
+        self.detector.resume_all()
+        self.detector.reset_frame_gate()
+    
+    def get_scheduler_stats(self) -> dict:
+        """감지 주기 지연/건너뜀 통계"""
+        return self.scheduler.get_stats()
+    
+    def get_tick_latency(self) -> dict:
+        """감지 한 틱 지연 시간 요약 (p50 / p99 ms)"""
+        return self.detector.stats.get("tick")
+    
+    def get_threshold_stats(self) -> Dict[str, dict]:
+        """아이콘별 기준값 제안 통계"""
+        return self.detector.get_threshold_stats()
+    
+    def get_gate_stats(self) -> dict:
+        """프레임 게이트 통계 (전체 틱 / 건너뛴 틱 / 건너뛴 비율)"""
+        return self.detector.get_gate_stats()
+    
+    def get_roi_stats(self) -> Dict[str, dict]:
+        """아이콘별 위치 추적 통계"""
+        return self.detector.get_roi_stats()
+    
+    def get_prefilter_stats(self) -> Dict[str, dict]:
+        """아이콘별 사전 검색 통계"""
+        return self.detector.get_prefilter_stats()
+    
+    def get_latency_stats(self) -> dict:
+        """감지기 단계별 지연 시간 요약"""
+        return self.detector.get_latency_stats()
+    
+    def drain(self) -> List[DetectionResult]:
+        """쌓인 결과를 오래된 순서로 모두 꺼내기"""
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+    
+    def _post(self, result: DetectionResult):
+        """결과를 큐에 넣기 (가득 차면 가장 오래된 것 버림)"""
+        while True:
+            try:
+                self.results.put_nowait(result)
+                return
+            except queue.Full:
+                try:
+                    self.results.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _run(self):
+        """작업 스레드 본체"""
+        # 캡처 도구는 이 스레드에서 새로 만들어 쓰고, 끝나면 닫기
+        self.detector.close()
+        self.scheduler.reset()
+        try:
+            while True:
+                # 다음 마감 시각까지 대기 (정지 요청이 오면 바로 깨어남)
+                if self._stop_event.wait(self.scheduler.delay()):
+                    break
+                
+                # 쉬는 중이면 끝날 때까지 통째로 대기 후 마감 시각 다시 맞추기
+                paused = self._paused_until - capture_clock()
+                if paused > 0:
+                    if self._stop_event.wait(paused):
+                        break
+                    self.scheduler.resync()
+                    continue
+                
+                self.scheduler.tick()
+                
+                cpu_start = time.thread_time()
+                try:
+                    icons = self.detector.detect()
+                except Exception as e:
+                    self._post(DetectionResult(capture_clock(), {}, error=str(e)))
+                    break
+                self._post(DetectionResult(self.detector.last_capture_time, icons,
+                                           timings=self.detector.last_timings,
+                                           cpu=time.thread_time() - cpu_start))
+        finally:
+            self.detector.close()
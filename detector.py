@@ -1,33 +1,229 @@
+import time  # 단계별 시간 측정용
+from dataclasses import dataclass  # 템플릿 뱅크 항목 정의용
+from typing import List, Optional, Sequence, Tuple  # 타입 힌트용
+
 import cv2          # 이미지 처리 라이브러리
 import numpy as np  # 숫자/배열 처리 라이브러리
-import mss          # 초고속 화면 캡처 라이브러리
+
+from buffer_pool import BufferPool  # 틱마다 재사용하는 버퍼
+from frame_source import FrameSource, MssFrameSource  # 프레임 소스
+from instrumentation import Instrumentation  # 단계별 지연 시간 기록
+from preprocess import PREPROCESS_EDGE, PREPROCESS_GRAY, PREPROCESS_MODES, preprocess_frame  # 매칭 전 전처리
+from threshold_tuner import ThresholdTuner  # 매칭 값 분포로 기준값 제안
+
+# 멀티스케일: 검색할 크기 비율들 (50% ~ 150%)
+DEFAULT_SCALES = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5)
+
+# 이보다 작은 템플릿은 매칭 신뢰도가 낮아서 제외
+MIN_TEMPLATE_SIZE = 10
+
+# 스케일 검색 모드
+SEARCH_FULL = "full"                      # 매 틱 모든 스케일 매칭
+SEARCH_COARSE_TO_FINE = "coarse_to_fine"  # 직전 스케일부터 넓혀가며 매칭, 기준 넘으면 중단
+SEARCH_MODES = (SEARCH_FULL, SEARCH_COARSE_TO_FINE)
+
+# 축소 프레임 사전 검색(prefilter): 이보다 큰 프레임에서만 사용
+PREFILTER_MIN_PIXELS = 320 * 240
+
+# 축소 템플릿이 이보다 작으면 그 스케일은 사전 검색에서 제외
+PREFILTER_MIN_TEMPLATE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class TemplateEntry:
+    """미리 크기 조절해 둔 템플릿 하나 (템플릿 뱅크 항목)"""
+    scale: float
+    template: np.ndarray
+    width: int
+    height: int
+    mean: float  # 템플릿 픽셀 평균
+    std: float   # 템플릿 픽셀 표준편차
+
+
+def build_template_bank(template: np.ndarray, scales: Sequence[float],
+                        preprocess: str = PREPROCESS_GRAY) -> Tuple[TemplateEntry, ...]:
+    """
+    원본 템플릿을 스케일별로 미리 크기 조절해서 뱅크 생성
+    
+    크기를 먼저 줄인 뒤 전처리해서, 화면에 작게 그려진 아이콘을 전처리한 것과 맞춘다.
+    
+    Args:
+        template: 원본 템플릿 (BGR 또는 그레이스케일)
+        scales: 크기 비율 목록
+        preprocess: 전처리 모드 (프레임과 같은 모드)
+    
+    Returns:
+        스케일 순서대로 정렬된 TemplateEntry 튜플 (너무 작은 스케일은 제외)
+    """
+    entries = []
+    for scale in scales:
+        width = int(template.shape[1] * scale)
+        height = int(template.shape[0] * scale)
+        
+        # 너무 작으면 스킵
+        if width < MIN_TEMPLATE_SIZE or height < MIN_TEMPLATE_SIZE:
+            continue
+        
+        resized = preprocess_frame(cv2.resize(template, (width, height)), preprocess)
+        resized.setflags(write=False)  # 뱅크는 읽기 전용
+        mean, std = cv2.meanStdDev(resized)
+        
+        entries.append(TemplateEntry(
+            scale=float(scale),
+            template=resized,
+            width=width,
+            height=height,
+            mean=float(mean[0][0]),
+            std=float(std[0][0]),
+        ))
+    return tuple(entries)
+
+
+def top_peaks(result: np.ndarray, count: int, width: int, height: int) -> List[Tuple[float, Tuple[int, int]]]:
+    """
+    매칭 결과 맵에서 서로 겹치지 않는 상위 봉우리 찾기
+    
+    Args:
+        result: matchTemplate 결과 맵 (수정됨)
+        count: 찾을 봉우리 수
+        width, height: 템플릿 크기 (이 범위 안의 이웃 값은 지움)
+    
+    Returns:
+        (매칭 값, (x, y)) 목록, 높은 순
+    """
+    peaks = []
+    for _ in range(count):
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val <= 0:
+            break
+        peaks.append((max_val, max_loc))
+        x, y = max_loc
+        result[max(0, y - height // 2):y + height // 2 + 1, max(0, x - width // 2):x + width // 2 + 1] = -1.0
+    return peaks
+
+
+@dataclass
+class MatchResult:
+    """한 틱의 매칭 결과"""
+    value: float = 0.0   # 가장 높은 매칭 값
+    scale: float = 1.0   # 그때의 스케일
+    x: int = 0           # 찾은 위치 (프레임 기준 왼쪽 위)
+    y: int = 0
+    width: int = 0       # 그때의 템플릿 크기
+    height: int = 0
+    match_calls: int = 0  # matchTemplate 호출 수
+
+
+class FrameGate:
+    """
+    화면 변화 감지(프레임 게이트)
+    
+    켜져 있으면 축소한 화면을 직전에 매칭한 화면과 비교해서,
+    모든 블록의 평균 밝기 차이가 threshold 미만이면 매칭을 건너뛰고 직전 결과를 쓰게 한다.
+    
+    영역 전체 평균으로 비교하면 넓은 영역에 작은 아이콘이 나타날 때 차이가 묻히므로,
+    작은 블록(화면에서 step * block 픽셀)마다 평균을 내고 가장 크게 바뀐 블록으로 판단한다.
+    """
+    
+    def __init__(self):
+        """게이트 초기화 (기본: 꺼짐)"""
+        self.enabled = False
+        self.threshold = 8.0  # 블록 평균 절대 차이 (0~255)
+        self.step = 4         # 축소 간격 (픽셀)
+        self.block = 4        # 비교 블록 크기 (축소 화면 픽셀, 화면에서는 16픽셀)
+        self.max_skips = 20   # 연속으로 건너뛸 수 있는 최대 틱 수
+        self.reset()
+    
+    def configure(self, enabled: bool, threshold: Optional[float] = None):
+        """사용 여부 / 기준값 변경"""
+        self.enabled = enabled
+        if threshold is not None:
+            self.threshold = threshold
+        self.reset()
+    
+    def reset(self):
+        """비교용 이전 화면과 건너뛰기 통계 초기화"""
+        self._thumb: Optional[np.ndarray] = None  # 직전에 매칭한 화면 (축소)
+        self._spare: Optional[np.ndarray] = None  # 이번 화면을 담을 버퍼 (_thumb와 번갈아 사용)
+        self._diff: Optional[np.ndarray] = None   # 두 화면 차이 버퍼
+        self._streak = 0
+        self.ticks = 0   # 게이트를 거친 틱 수
+        self.skips = 0   # 매칭을 건너뛴 틱 수
+    
+    def get_stats(self) -> dict:
+        """전체 틱 / 건너뛴 틱 / 건너뛴 비율"""
+        ratio = self.skips / self.ticks if self.ticks else 0.0
+        return {"ticks": self.ticks, "skipped": self.skips, "skip_ratio": ratio}
+    
+    def changed(self, frame: np.ndarray) -> bool:
+        """
+        직전에 매칭한 화면과 비교해서 바뀌었는지 확인
+        
+        Args:
+            frame: 캡처한 프레임 (BGRA 또는 그레이스케일)
+        
+        Returns:
+            True: 바뀜 (매칭 필요)
+            False: 거의 같음 (직전 결과 재사용)
+        """
+        self.ticks += 1
+        if not self.enabled:
+            return True
+        
+        # 몇 픽셀 간격으로 뽑은 축소 화면 (BGRA면 초록 채널만)
+        step = self.step
+        view = frame[::step, ::step, 1] if frame.ndim == 3 else frame[::step, ::step]
+        thumb = self._spare
+        if thumb is None or thumb.shape != view.shape:
+            thumb = np.empty(view.shape, dtype=np.uint8)
+        np.copyto(thumb, view)
+        
+        prev = self._thumb
+        if (prev is not None
+                and prev.shape == thumb.shape
+                and self._streak < self.max_skips
+                and self._max_block_diff(thumb, prev) < self.threshold):
+            self._spare = thumb
+            self._streak += 1
+            self.skips += 1
+            return False
+        
+        # 매칭할 화면을 다음 비교 기준으로 저장 (이전 기준 버퍼는 다음 틱에 재사용)
+        self._thumb, self._spare = thumb, prev
+        self._streak = 0
+        return True
+    
+    def _max_block_diff(self, thumb: np.ndarray, prev: np.ndarray) -> float:
+        """블록별 평균 밝기 차이 중 가장 큰 값"""
+        if self._diff is None or self._diff.shape != thumb.shape:
+            self._diff = np.empty(thumb.shape, dtype=np.uint8)
+        cv2.absdiff(thumb, prev, dst=self._diff)
+        height, width = thumb.shape
+        # INTER_AREA 축소 = 블록 평균
+        blocks = cv2.resize(self._diff, (max(1, width // self.block), max(1, height // self.block)),
+                            interpolation=cv2.INTER_AREA)
+        return float(blocks.max())
+
 
 class OneShotDetector:
     """일격필살 버프 아이콘을 화면에서 감지하는 클래스"""
     
-    def __init__(self, icon_path: str, threshold: float = 0.8):
+    def __init__(self, icon_path: str, threshold: float = 0.8, name: str = ""):
         """
         감지기 초기화
         
         Args:
             icon_path: 일격필살 아이콘 이미지 파일 경로
             threshold: 매칭 정확도 기준 (0.0~1.0, 높을수록 엄격)
+            name: 아이콘 이름 (여러 아이콘을 함께 쓸 때 계측 이름 구분용)
         """
-        # 아이콘 이미지 파일 읽기
-        self.template_original = cv2.imread(icon_path, cv2.IMREAD_COLOR)
-        
-        # 파일이 없으면 에러 발생
-        if self.template_original is None:
-            raise FileNotFoundError(f"아이콘 이미지를 찾을 수 없습니다: {icon_path}")
-        
-        # 그레이스케일로 변환
-        self.template_original = cv2.cvtColor(self.template_original, cv2.COLOR_BGR2GRAY)
+        self.name = name
         
         # 매칭 정확도 기준값 저장
         self.threshold = threshold
         
-        # 화면 캡처 도구 초기화
-        self.sct = mss.mss()
+        # 프레임 소스 (기본: mss 화면 캡처)
+        self.source: FrameSource = MssFrameSource()
         
         # 감지할 화면 영역
         self.detection_region = None
@@ -35,9 +231,230 @@ class OneShotDetector:
         # 디버그 모드
         self.debug = True
         self.last_max_val = 0.0
+        self.last_reused = False  # 마지막 틱이 화면 변화가 없어 직전 결과를 재사용했는지
         
         # 멀티스케일: 검색할 크기 비율들 (50% ~ 150%)
-        self.scales = [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5]
+        self.scales = list(DEFAULT_SCALES)
+        
+        # 매칭 전 전처리 (프레임과 템플릿 뱅크에 똑같이 적용)
+        self.preprocess = PREPROCESS_GRAY
+        
+        # 보정 결과 (calibrate.py session): 처음부터 고정할 스케일 / 추적 시작 위치
+        self.calibrated_scale: Optional[float] = None
+        self.calibrated_location: Optional[Tuple[int, int, int, int]] = None
+        
+        # ========== 스케일 검색 ==========
+        self.search_mode = SEARCH_FULL
+        self.best_scale: Optional[float] = None    # 마지막으로 감지된 스케일
+        self.locked_scale: Optional[float] = None  # 고정된(보정된) 스케일
+        self.scale_lock_hits = 3      # 같은 스케일로 연속 감지되면 고정
+        self.locked_sweep_every = 50  # 고정 상태에서 이만큼 못 찾으면 전체 스케일 재검색
+        self._scale_streak = 0        # 같은 스케일 연속 감지 횟수
+        self._locked_misses = 0       # 고정 스케일 연속 실패 횟수
+        self.last_match_calls = 0     # 마지막 틱의 matchTemplate 호출 수
+        self.last_result = MatchResult()
+        
+        # ========== 축소 프레임 사전 검색 (큰 영역용 2단계 매칭) ==========
+        self.prefilter = False
+        self.prefilter_factor = 0.5    # 1단계 축소 비율
+        self.prefilter_candidates = 6  # 2단계에서 원본 해상도로 확인할 후보 수
+        self.prefilter_bank = {}       # 스케일 -> 축소 템플릿
+        self.reset_prefilter_stats()
+        
+        # ========== 위치 추적 (ROI) ==========
+        self.roi_tracking = False
+        self.roi_padding = 8  # 마지막 위치 주변 여유 픽셀
+        self.last_location: Optional[Tuple[int, int, int, int]] = None
+        self.roi_hits = 0     # 추적 창 안에서 찾은 횟수
+        self.roi_misses = 0   # 추적 창에서 못 찾아 전체 영역을 검색한 횟수
+        
+        # ========== 프레임 게이트 (화면 변화 없으면 매칭 생략) ==========
+        self.gate = FrameGate()
+        
+        # ========== 기준값 제안 / 자동 조정 (아이콘 / 배경 매칭 값 분포) ==========
+        self.tuner = ThresholdTuner()
+        self.adaptive_threshold = False  # 켜면 제안값 쪽으로 기준값을 조금씩 옮김
+        
+        # ========== 단계별 지연 시간 기록 ==========
+        self.stats = Instrumentation()
+        
+        # ========== 재사용 버퍼 (그레이스케일 / 매칭 결과) ==========
+        self.buffers = BufferPool()
+        self.reuse_buffers = True  # 끄면 매 틱 새로 할당 (벤치마크 비교용)
+        
+        # 아이콘 로드 + 템플릿 뱅크 생성
+        self.template_bank: Tuple[TemplateEntry, ...] = ()
+        self.set_template(icon_path)
+    
+    def set_template(self, icon_path: str):
+        """아이콘 이미지 변경 (템플릿 뱅크 재생성)"""
+        # 아이콘 이미지 파일 읽기
+        template = cv2.imread(icon_path, cv2.IMREAD_COLOR)
+        
+        # 파일이 없으면 에러 발생
+        if template is None:
+            raise FileNotFoundError(f"아이콘 이미지를 찾을 수 없습니다: {icon_path}")
+        
+        # 컬러 원본은 전처리 모드를 바꿀 때를 위해 보관
+        self.template_color = template
+        self._rebuild_template_bank()
+    
+    def set_scales(self, scales: Sequence[float]):
+        """검색할 크기 비율 변경 (템플릿 뱅크 재생성)"""
+        self.scales = list(scales)
+        self._rebuild_template_bank()
+    
+    def _rebuild_template_bank(self):
+        """현재 아이콘/스케일/전처리로 템플릿 뱅크 다시 만들기"""
+        self.template_original = preprocess_frame(self.template_color, self.preprocess)
+        self.template_bank = build_template_bank(self.template_color, self.scales, self.preprocess)
+        # 스케일별 계측 이름은 미리 만들어 둠 (매 틱 문자열 생성 방지)
+        prefix = f"{self.name}:" if self.name else ""
+        self._match_stages = {entry.scale: f"{prefix}match@{entry.scale:.1f}" for entry in self.template_bank}
+        self._prefilter_stage = f"{prefix}prefilter"
+        self._confirm_stage = f"{prefix}confirm"
+        self._rebuild_prefilter_bank()
+        # 스케일 목록이 바뀌었으니 검색 상태도 초기화 (뱅크에 없는 보정 스케일은 버림)
+        if self.calibrated_scale not in self._match_stages:
+            self.calibrated_scale = None
+        self.reset_scale_search()
+    
+    def set_preprocess(self, mode: str):
+        """
+        매칭 전 전처리 모드 변경 (템플릿 뱅크 재생성)
+        
+        Args:
+            mode: "gray" / "blue" / "green" / "red" / "edge"
+        """
+        if mode not in PREPROCESS_MODES:
+            raise ValueError(f"알 수 없는 전처리 모드: {mode}")
+        self.preprocess = mode
+        self._rebuild_template_bank()
+    
+    def set_search_mode(self, mode: str):
+        """
+        스케일 검색 모드 변경
+        
+        Args:
+            mode: "full" (모든 스케일) 또는 "coarse_to_fine" (직전 스케일부터 점진 확장)
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"알 수 없는 스케일 검색 모드: {mode}")
+        self.search_mode = mode
+        self.reset_scale_search()
+    
+    def set_prefilter(self, enabled: bool, factor: Optional[float] = None, candidates: Optional[int] = None):
+        """
+        축소 프레임 사전 검색 설정
+        
+        켜져 있으면 큰 프레임의 전체 영역 검색을 두 단계로 나눈다.
+        1단계는 축소한 프레임에서 축소 템플릿으로 후보 위치를 찾고,
+        2단계는 그 후보 주변만 원본 해상도로 다시 매칭해서 확인한다.
+        
+        Args:
+            enabled: 사전 검색 사용 여부
+            factor: 1단계 축소 비율 (None이면 유지)
+            candidates: 2단계에서 확인할 후보 수 (None이면 유지)
+        """
+        self.prefilter = enabled
+        if factor is not None:
+            self.prefilter_factor = factor
+        if candidates is not None:
+            self.prefilter_candidates = max(1, candidates)
+        self._rebuild_prefilter_bank()
+        self.reset_prefilter_stats()
+    
+    def reset_prefilter_stats(self):
+        """사전 검색 통계 초기화"""
+        self.prefilter_ticks = 0       # 사전 검색을 거친 틱 수
+        self.prefilter_confirmed = 0   # 후보 중에서 아이콘을 찾은 틱 수
+        self.candidate_total = 0       # 2단계로 넘긴 후보 수 합계
+        self.last_candidates = 0       # 마지막 틱의 후보 수
+    
+    def get_prefilter_stats(self) -> dict:
+        """사전 검색 틱 수 / 평균 후보 수 / 확인 성공 수 / 단계별 시간 요약"""
+        ticks = self.prefilter_ticks
+        return {
+            "ticks": ticks,
+            "confirmed": self.prefilter_confirmed,
+            "candidates_mean": self.candidate_total / ticks if ticks else 0.0,
+            "prefilter": self.stats.get(self._prefilter_stage),
+            "confirm": self.stats.get(self._confirm_stage),
+        }
+    
+    def _rebuild_prefilter_bank(self):
+        """템플릿 뱅크를 사전 검색 비율로 축소 (너무 작아지는 스케일은 제외)"""
+        bank = {}
+        for entry in self.template_bank:
+            width = int(round(entry.width * self.prefilter_factor))
+            height = int(round(entry.height * self.prefilter_factor))
+            if width < PREFILTER_MIN_TEMPLATE_SIZE or height < PREFILTER_MIN_TEMPLATE_SIZE:
+                continue
+            small = cv2.resize(entry.template, (width, height), interpolation=cv2.INTER_AREA)
+            small.setflags(write=False)
+            bank[entry.scale] = small
+        self.prefilter_bank = bank
+    
+    def set_calibration(self, scale: Optional[float], location: Optional[Tuple[int, int, int, int]]):
+        """
+        보정 결과 적용
+        
+        스케일은 처음부터 고정(coarse_to_fine 모드)하고, 위치는 위치 추적의 시작 위치로 쓴다.
+        그래서 첫 틱부터 한 스케일 + 작은 창으로 매칭한다.
+        
+        Args:
+            scale: 고정할 스케일 (뱅크에 없거나 None이면 사용 안 함)
+            location: 감지 영역 기준 (x, y, width, height) (None이면 사용 안 함)
+        """
+        scales = [entry.scale for entry in self.template_bank]
+        self.calibrated_scale = scale if scale in scales else None
+        self.calibrated_location = tuple(location) if location else None
+        self.reset_scale_search()
+        self.reset_roi()
+    
+    def reset_scale_search(self):
+        """기억해 둔 스케일/고정 스케일 초기화 (보정 스케일이 있으면 그것으로)"""
+        self.best_scale = self.calibrated_scale
+        self.locked_scale = self.calibrated_scale
+        self._scale_streak = 0
+        self._locked_misses = 0
+    
+    def _scale_search_order(self) -> List[TemplateEntry]:
+        """이번 틱에 매칭할 템플릿 순서 결정"""
+        bank = self.template_bank
+        if self.search_mode == SEARCH_FULL:
+            return list(bank)
+        
+        # 고정 스케일이면 그것 하나만 (가끔 전체 재검색)
+        if self.locked_scale is not None and self._locked_misses < self.locked_sweep_every:
+            return [entry for entry in bank if entry.scale == self.locked_scale]
+        
+        # 직전 스케일(없으면 가운데 스케일)에서 가까운 순서로 (이웃 -> 바깥쪽)
+        scales = [entry.scale for entry in bank]
+        center = scales.index(self.best_scale) if self.best_scale in scales else len(bank) // 2
+        return sorted(bank, key=lambda entry: abs(scales.index(entry.scale) - center))
+    
+    def _update_scale_search(self, found: bool, scale: float):
+        """매칭 결과로 스케일 고정 상태 갱신"""
+        if not found:
+            if self.locked_scale is not None:
+                self._locked_misses += 1
+                # 전체 재검색까지 했는데 못 찾았으면 카운트 다시 시작
+                if self._locked_misses > self.locked_sweep_every:
+                    self._locked_misses = 0
+            return
+        
+        # 같은 스케일로 연속 감지 횟수 세기
+        if scale == self.best_scale:
+            self._scale_streak += 1
+        else:
+            self._scale_streak = 1
+            self.locked_scale = None
+        self.best_scale = scale
+        self._locked_misses = 0
+        
+        if self._scale_streak >= self.scale_lock_hits:
+            self.locked_scale = scale
     
     def set_region(self, x: int, y: int, width: int, height: int):
         """감지할 화면 영역 설정"""
@@ -47,6 +464,10 @@ class OneShotDetector:
             "width": width,
             "height": height
         }
+        # 영역이 바뀌면 기억해 둔 위치/화면은 의미 없음 (보정 스케일은 그대로)
+        self.calibrated_location = None
+        self.reset_roi()
+        self.reset_frame_gate()
     
     def detect(self) -> bool:
         """
@@ -56,63 +477,329 @@ class OneShotDetector:
             True: 아이콘 발견됨
             False: 아이콘 없음
         """
-        # 감지 영역 결정
-        if self.detection_region is None:
-            monitor = self.sct.monitors[1]
-            region = monitor
-        else:
-            region = self.detection_region
+        # 화면 캡처 (영역이 없으면 주 모니터 전체)
+        start = time.perf_counter()
+        frame = self.source.grab(self.detection_region)
+        self.stats.record("capture", time.perf_counter() - start)
+        if frame is None:
+            raise EOFError("프레임 소스에 더 이상 프레임이 없습니다")
+        
+        return self.process_frame(frame)
+    
+    def process_frame(self, frame: np.ndarray) -> bool:
+        """
+        캡처한 프레임 하나 처리 (변화 확인 -> 전처리 -> 매칭)
+        
+        Args:
+            frame: BGRA / BGR / 그레이스케일 프레임
+        
+        Returns:
+            True: 아이콘 발견됨
+            False: 아이콘 없음
+        """
+        start = time.perf_counter()
+        
+        # 직전에 매칭한 화면과 거의 같으면 결과 재사용
+        self.last_reused = not self.gate.changed(frame)
+        if self.last_reused:
+            self.stats.record("tick", time.perf_counter() - start)
+            return self.last_max_val >= self.threshold
+        
+        # 전처리 (재사용 버퍼에)
+        if frame.ndim == 3 or self.preprocess == PREPROCESS_EDGE:
+            convert_start = time.perf_counter()
+            frame = preprocess_frame(frame, self.preprocess, self.buffers if self.reuse_buffers else None)
+            self.stats.record("convert", time.perf_counter() - convert_start)
+        
+        found = self.match_frame(frame)
+        self.stats.record("tick", time.perf_counter() - start)
+        return found
+    
+    def set_frame_gate(self, enabled: bool, threshold: Optional[float] = None):
+        """
+        화면 변화 감지(프레임 게이트) 설정
         
-        # 화면 캡처
-        screenshot = self.sct.grab(region)
+        Args:
+            enabled: 프레임 게이트 사용 여부
+            threshold: 변화로 볼 평균 절대 차이 (0~255, None이면 유지)
+        """
+        self.gate.configure(enabled, threshold)
+    
+    def reset_frame_gate(self):
+        """비교용 이전 화면과 건너뛰기 통계 초기화"""
+        self.gate.reset()
+    
+    def get_gate_stats(self) -> dict:
+        """프레임 게이트 통계 (전체 틱 / 건너뛴 틱 / 건너뛴 비율)"""
+        return self.gate.get_stats()
+    
+    def set_source(self, source: FrameSource):
+        """프레임 소스 변경 (화면 캡처 대신 녹화 파일 등)"""
+        self.source.close()
+        self.source = source
+        self.reset_frame_gate()
+    
+    def close(self):
+        """프레임 소스 닫기 (화면 캡처 도구는 다음 캡처 때 다시 생성)"""
+        self.source.close()
+    
+    def set_roi_tracking(self, enabled: bool, padding: Optional[int] = None):
+        """
+        위치 추적 모드 설정
         
-        # numpy 배열로 변환
-        frame = np.array(screenshot)
+        켜져 있으면 마지막으로 찾은 위치 주변의 작은 창에서만 먼저 매칭하고,
+        거기서 못 찾았을 때만 전체 영역을 다시 검색한다.
         
-        # 그레이스케일로 변환
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+        Args:
+            enabled: 위치 추적 사용 여부
+            padding: 마지막 위치 주변 여유 픽셀 (None이면 유지)
+        """
+        self.roi_tracking = enabled
+        if padding is not None:
+            self.roi_padding = padding
+        self.reset_roi()
+    
+    def reset_roi(self):
+        """기억해 둔 위치와 추적 카운터 초기화 (보정 위치가 있으면 그것으로)"""
+        self.last_location = self.calibrated_location
+        self.roi_hits = 0
+        self.roi_misses = 0
+    
+    def get_last_location(self) -> Optional[Tuple[int, int, int, int]]:
+        """마지막으로 아이콘을 찾은 위치 (x, y, width, height) 반환 (프레임 기준)"""
+        return self.last_location
+    
+    def get_roi_stats(self) -> dict:
+        """위치 추적 창에서 찾은 횟수 / 전체 영역으로 되돌아간 횟수"""
+        return {"hits": self.roi_hits, "misses": self.roi_misses}
+    
+    def _roi_window(self, frame: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """마지막 위치 주변의 검색 창 (x0, y0, x1, y1) 계산"""
+        if not self.roi_tracking or self.last_location is None:
+            return None
+        
+        x, y, width, height = self.last_location
+        pad = self.roi_padding
+        x0 = max(0, x - pad)
+        y0 = max(0, y - pad)
+        x1 = min(frame.shape[1], x + width + pad)
+        y1 = min(frame.shape[0], y + height + pad)
+        
+        # 창이 프레임 전체와 같으면 의미 없음
+        if (x0, y0, x1, y1) == (0, 0, frame.shape[1], frame.shape[0]):
+            return None
+        return x0, y0, x1, y1
+    
+    def _match_template(self, image: np.ndarray, template: np.ndarray, key: tuple) -> np.ndarray:
+        """matchTemplate (결과 맵은 용도/스케일별 재사용 버퍼에)"""
+        if not self.reuse_buffers:
+            return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+        shape = (image.shape[0] - template.shape[0] + 1, image.shape[1] - template.shape[1] + 1)
+        result = self.buffers.get(key, shape, np.float32)
+        return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=result)
+    
+    def _match_bank(self, frame: np.ndarray, buffer_key: str = "match") -> MatchResult:
+        """
+        프레임 하나에 대해 템플릿 뱅크 매칭
+        
+        Args:
+            frame: 그레이스케일 프레임 (또는 그 일부)
+            buffer_key: 결과 맵 버퍼 용도 (전체 영역 / 위치 추적 창은 크기가 달라서 따로)
         
+        Returns:
+            가장 높은 매칭 결과 (위치는 넘겨받은 frame 기준)
+        """
         # 여러 크기로 매칭 시도
-        best_val = 0.0
-        best_scale = 1.0
+        best = MatchResult()
+        early_exit = self.search_mode == SEARCH_COARSE_TO_FINE
         
-        for scale in self.scales:
-            # 템플릿 크기 조절
-            width = int(self.template_original.shape[1] * scale)
-            height = int(self.template_original.shape[0] * scale)
-            
-            # 너무 작거나 화면보다 크면 스킵
-            if width < 10 or height < 10:
+        for entry in self._scale_search_order():
+            # 화면보다 크면 스킵
+            if entry.width > frame.shape[1] or entry.height > frame.shape[0]:
                 continue
-            if width > frame.shape[1] or height > frame.shape[0]:
-                continue
-            
-            # 크기 조절
-            template = cv2.resize(self.template_original, (width, height))
             
             # 템플릿 매칭 수행
-            result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+            start = time.perf_counter()
+            result = self._match_template(frame, entry.template, (buffer_key, entry.scale))
+            best.match_calls += 1
             
             # 최대값 찾기
-            _, max_val, _, _ = cv2.minMaxLoc(result)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            self.stats.record(self._match_stages[entry.scale], time.perf_counter() - start)
             
             # 가장 높은 값 저장
-            if max_val > best_val:
-                best_val = max_val
-                best_scale = scale
+            if max_val > best.value:
+                best.value = max_val
+                best.scale = entry.scale
+                best.x, best.y = max_loc
+                best.width = entry.width
+                best.height = entry.height
+            
+            # 기준을 넘으면 나머지 스케일은 생략
+            if early_exit and best.value >= self.threshold:
+                break
+        
+        return best
+    
+    def _match_prefiltered(self, frame: np.ndarray) -> MatchResult:
+        """
+        2단계 매칭 (축소 프레임에서 후보 찾기 -> 후보 주변만 원본 해상도로 확인)
+        
+        Args:
+            frame: 그레이스케일 프레임 (전체 영역)
+        
+        Returns:
+            가장 높은 확인 결과 (위치는 frame 기준)
+        """
+        factor = self.prefilter_factor
+        early_exit = self.search_mode == SEARCH_COARSE_TO_FINE
+        best = MatchResult()
+        
+        # ========== 1단계: 축소 프레임에서 후보 찾기 ==========
+        start = time.perf_counter()
+        size = (int(round(frame.shape[1] * factor)), int(round(frame.shape[0] * factor)))
+        if self.reuse_buffers:
+            small = cv2.resize(frame, size, dst=self.buffers.get("prefilter", size[::-1]),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        candidates = []
+        for entry in self._scale_search_order():
+            template = self.prefilter_bank.get(entry.scale)
+            if template is None or entry.width > frame.shape[1] or entry.height > frame.shape[0]:
+                continue
+            if template.shape[1] > small.shape[1] or template.shape[0] > small.shape[0]:
+                continue
+            result = self._match_template(small, template, ("prefilter", entry.scale))
+            best.match_calls += 1
+            for value, location in top_peaks(result, self.prefilter_candidates, template.shape[1], template.shape[0]):
+                candidates.append((value, entry, location))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        candidates = candidates[:self.prefilter_candidates]
+        self.stats.record(self._prefilter_stage, time.perf_counter() - start)
+        
+        # ========== 2단계: 후보 주변만 원본 해상도로 확인 ==========
+        start = time.perf_counter()
+        pad = int(np.ceil(1 / factor)) + 2  # 축소로 잃은 위치 정밀도만큼 여유
+        for _, entry, (sx, sy) in candidates:
+            x = int(sx / factor)
+            y = int(sy / factor)
+            x0 = max(0, x - pad)
+            y0 = max(0, y - pad)
+            x1 = min(frame.shape[1], x + entry.width + pad)
+            y1 = min(frame.shape[0], y + entry.height + pad)
+            if x1 - x0 < entry.width or y1 - y0 < entry.height:
+                continue
+            
+            result = self._match_template(frame[y0:y1, x0:x1], entry.template, ("confirm", entry.scale))
+            best.match_calls += 1
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val > best.value:
+                best.value = max_val
+                best.scale = entry.scale
+                best.x = x0 + max_loc[0]
+                best.y = y0 + max_loc[1]
+                best.width = entry.width
+                best.height = entry.height
+            
+            if early_exit and best.value >= self.threshold:
+                break
+        self.stats.record(self._confirm_stage, time.perf_counter() - start)
+        
+        self.prefilter_ticks += 1
+        self.last_candidates = len(candidates)
+        self.candidate_total += len(candidates)
+        if best.value >= self.threshold:
+            self.prefilter_confirmed += 1
+        return best
+    
+    def _use_prefilter(self, frame: np.ndarray) -> bool:
+        """이번 전체 영역 검색에 사전 검색을 쓸지"""
+        return self.prefilter and frame.shape[0] * frame.shape[1] >= PREFILTER_MIN_PIXELS
+    
+    def match_frame(self, frame: np.ndarray) -> bool:
+        """
+        전처리한(기본: 그레이스케일) 프레임에서 템플릿 뱅크로 매칭
+        
+        위치 추적 창을 먼저 매칭하고, 못 찾으면 전체 영역을
+        (큰 프레임이면 사전 검색으로) 매칭한다.
+        
+        Args:
+            frame: 전처리한 단일 채널 프레임
+        
+        Returns:
+            True: 아이콘 발견됨
+            False: 아이콘 없음
+        """
+        match_calls = 0
+        best = None
+        
+        # 위치 추적: 마지막 위치 주변부터 검색
+        window = self._roi_window(frame)
+        if window is not None:
+            x0, y0, x1, y1 = window
+            best = self._match_bank(frame[y0:y1, x0:x1], buffer_key="roi")
+            best.x += x0
+            best.y += y0
+            match_calls += best.match_calls
+            if best.value >= self.threshold:
+                self.roi_hits += 1
+            else:
+                self.roi_misses += 1
+                best = None
+        
+        # 못 찾았으면 전체 영역 검색
+        if best is None:
+            if self._use_prefilter(frame):
+                best = self._match_prefiltered(frame)
+            else:
+                best = self._match_bank(frame)
+            match_calls += best.match_calls
+        
+        best.match_calls = match_calls
+        self.last_match_calls = match_calls
+        self.last_result = best
+        found = best.value >= self.threshold
+        self._update_scale_search(found, best.scale)
+        if found:
+            self.last_location = (best.x, best.y, best.width, best.height)
         
         # 디버그: 매칭 값 저장 및 출력
-        self.last_max_val = best_val
+        self.last_max_val = best.value
         if self.debug:
-            print(f"매칭 값: {best_val:.3f} / 기준: {self.threshold:.3f} / 스케일: {best_scale:.1f}")
+            print(f"매칭 값: {best.value:.3f} / 기준: {self.threshold:.3f} / 스케일: {best.scale:.1f}")
+        
+        # 점수 분포에 추가 (틱마다 구간 하나, 제안은 가끔 다시 계산)
+        if self.tuner.record(best.value) and self.adaptive_threshold:
+            self.threshold = self.tuner.adjust(self.threshold)
         
         # 정확도가 기준값 이상이면 아이콘 발견
-        return best_val >= self.threshold
+        return found
     
-    def set_threshold(self, threshold: float):
-        """임계값 변경"""
+    def set_threshold(self, threshold: float, adaptive: Optional[bool] = None):
+        """
+        임계값 변경 (모은 점수 분포는 기준값과 상관없으므로 그대로 둠)
+        
+        Args:
+            threshold: 매칭 정확도 기준 (자동 조정이면 시작값)
+            adaptive: True면 감지 중 점수 분포로 기준값 자동 조정, False면 고정 (None이면 유지)
+        """
         self.threshold = threshold
+        if adaptive is not None:
+            self.adaptive_threshold = adaptive
+    
+    def set_adaptive_threshold(self, enabled: bool):
+        """기준값 자동 조정 켜기 / 끄기 (지금 기준값에서 시작)"""
+        self.set_threshold(self.threshold, enabled)
+    
+    def get_threshold_stats(self) -> dict:
+        """기준값 제안 통계 (아이콘 / 배경 틱 수, 그 사이 빈 구간, 제안값, 지금 기준값)"""
+        return {**self.tuner.get_stats(), "threshold": self.threshold, "adaptive": self.adaptive_threshold}
+    
+    def get_latency_stats(self) -> dict:
+        """단계별 지연 시간 요약 (capture, convert, match@스케일, tick)"""
+        return self.stats.summary()
     
     def get_last_match_value(self) -> float:
         """마지막 매칭 값 반환"""
-        return self.last_max_val
\ No newline at end of file
+        return self.last_max_val
@@ -0,0 +1,584 @@
+import asyncio  # 비동기 이벤트 스트림용
+import json  # 지연 시간 요약 저장용
+import time  # 헤드리스 루프 대기용
+from dataclasses import dataclass  # 스킬 상태 / 이벤트 정의용
+from pathlib import Path  # 파일 경로 처리용
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence  # 타입 힌트용
+
+from presence import PresenceTracker, EVENT_APPEARED, EVENT_DISAPPEARED  # 아이콘 표시 상태 기계
+from scheduler import TickScheduler, capture_clock  # 마감 시각 기반 스케줄러
+from instrumentation import Instrumentation  # 단계별 지연 시간 기록
+from session_log import SessionLog, RECORD_DISAPPEAR, RECORD_READY, RECORD_SCAN, RECORD_THRESHOLD, RECORD_TRIGGER  # 세션 기록
+from config import load_config  # 설정 관리
+
+# 엔진이 구독자에게 보내는 이벤트 종류
+EVENT_TRIGGERED = "triggered"  # 스킬 발동 (타이머 시작)
+EVENT_TIMER = "timer"          # 남은 쿨타임 (화면 갱신마다)
+EVENT_READY = "ready"          # 쿨타임 끝
+EVENT_SCORES = "scores"        # 발동 전 매칭 값 (상태 표시용)
+EVENT_ERROR = "error"          # 감지 오류
+
+
+@dataclass
+class SkillTimer:
+    """추적 중인 스킬 하나의 타이머 상태"""
+    name: str
+    cooldown: float                 # 스킬 쿨타임 (초)
+    timer_running: bool = False
+    timer_start_time: float = 0.0   # 아이콘이 나타난 추정 시각 (capture_clock)
+    paused_until: float = 0.0       # 이 시각까지 아이콘을 매칭하지 않음 (다시 뜰 수 없는 쿨타임 구간)
+    
+    def remaining(self, current_time: float) -> float:
+        """남은 쿨타임 (초)"""
+        return self.cooldown - (current_time - self.timer_start_time)
+
+
+@dataclass
+class TimerEvent:
+    """엔진 이벤트 하나"""
+    kind: str                       # EVENT_* 중 하나
+    skill: str = ""                 # 스킬 이름 (오류 / 매칭 값 이벤트는 빈 문자열)
+    timestamp: float = 0.0          # 이벤트 시각 (capture_clock)
+    remaining: float = 0.0          # 남은 쿨타임 (초, timer 이벤트)
+    error: Optional[float] = None   # 발동 시각 추정 오차 (초, triggered 이벤트, 모르면 None)
+    message: str = ""               # 오류 메시지 / 매칭 값 요약
+
+
+class TimerEngine:
+    """
+    화면 없이 돌아가는 감지 + 타이머 엔진
+    
+    감지 작업자(스레드 또는 영역별 프로세스)의 결과를 아이콘 표시 상태 기계로 판단하고,
+    스킬 타이머와 적응형 스캔 주기를 관리한다. 결과는 TimerEvent로 구독자에게 보내고,
+    Tk 오버레이는 그 구독자 중 하나일 뿐이다.
+    
+    이벤트는 poll()을 부를 때 만들어진다. Tk에서는 화면 갱신 주기마다 poll()을 부르고,
+    화면 없이 쓸 때는 run() 또는 async for event in engine.events()를 쓴다.
+    """
+    
+    def __init__(self, config: Optional[dict] = None):
+        """
+        엔진 초기화 (OpenCV 등 감지 모듈은 여기서 불러옴)
+        
+        Args:
+            config: 설정 (None이면 config.json)
+        """
+        from multi_detector import MultiIconDetector, configure_detector, icons_from_config  # 여러 아이콘 감지기
+        from detection_worker import DetectionWorker  # 백그라운드 감지 작업자
+        from process_pool import DetectionPool, regions_from_config  # 영역별 감지 프로세스
+        
+        self.config = config if config is not None else load_config()
+        
+        # 추적할 아이콘 목록 (기본: 일격필살 하나)
+        icons = icons_from_config(self.config)
+        
+        # 여러 영역 모드: 영역마다 프로세스 하나 (비어 있으면 감지 영역 하나를 스레드로)
+        self.regions = regions_from_config(self.config)
+        
+        # 아이콘 파일 존재 확인
+        for icon in icons + [icon for spec in self.regions for icon in spec.icons]:
+            if not Path(icon.path).exists():
+                print("=" * 50)
+                print(f"⚠️ {icon.path} 파일이 필요합니다!")
+                print(f"   {icon.name} 버프 아이콘을 캡처해서 저장해주세요.")
+                print("=" * 50)
+        
+        # 캡처 + 매칭은 백그라운드 스레드에서 (여러 영역이면 감지기를 영역별 프로세스에서 만듦)
+        self.detector: Optional[MultiIconDetector] = None
+        if self.regions:
+            self.worker = DetectionPool(self.regions, self.config, self.config["scan_interval_ms"])
+        else:
+            # 캡처/변환은 한 번, 매칭은 아이콘마다
+            self.detector = MultiIconDetector(icons)
+            configure_detector(self.detector, self.config)
+            self.worker = DetectionWorker(self.detector, self.config["scan_interval_ms"])
+        
+        # 발동 시각 오차 등 엔진 쪽 기록
+        self.stats = Instrumentation()
+        self._subscribers: List[Callable[[TimerEvent], None]] = []
+        self.is_running = False
+        
+        # 감지 중에만 열리는 세션 기록 (session_log_dir가 비어 있으면 None)
+        self.session_log: Optional[SessionLog] = None
+        
+        # ========== 적응형 스캔 주기 (주기 / 전환 시간은 config.json) ==========
+        self.last_icon_time = 0.0          # 마지막으로 아이콘이 보인 시각
+        self.scan_interval_ms = self.config["scan_interval_ms"]
+        self.scan_mode = "active"
+        self.scan_mode_since = 0.0         # 지금 모드로 바뀐 시각 (모드별 유지 시간 기록용)
+        self.scan_rate_changes = 0         # 감지 주기가 바뀐 횟수 (print_stats에 출력)
+        
+        # ========== 감지 영역 설정 (감지 영역 하나 모드) ==========
+        if self.detector is not None and self.config["detection_region"]:
+            r = self.config["detection_region"]
+            self.detector.set_region(r["x"], r["y"], r["width"], r["height"])
+        
+        # ========== 보정 결과 (같은 영역에서 만든 것만) ==========
+        calibration = self.config["calibration"]
+        if (self.detector is not None and calibration
+                and calibration.get("region") == self.config["detection_region"]):
+            self.detector.apply_calibration(calibration["icons"])
+            print("보정 결과 적용: " + ", ".join(
+                f"{name} 스케일 {c['scale']:.1f}" for name, c in calibration["icons"].items()
+            ))
+        
+        self._build_skills()
+    
+    def _build_skills(self):
+        """아이콘 설정으로 스킬 타이머 + 표시 상태 기계 만들기"""
+        if self.regions:
+            icons = [icon for spec in self.regions for icon in spec.icons]
+            thresholds = self.worker.thresholds()
+        else:
+            icons = list(self.detector.icons.values())
+            thresholds = {name: d.threshold for name, d in self.detector.detectors.items()}
+        
+        self.skills: Dict[str, SkillTimer] = {icon.name: SkillTimer(icon.name, icon.cooldown) for icon in icons}
+        
+        # 매칭 기준값으로 들어가고, 그보다 조금 낮은 값 아래로 내려가야 사라진 것으로 봄
+        self.presence: Dict[str, PresenceTracker] = {
+            name: PresenceTracker(
+                threshold,
+                threshold - self.config["presence_exit_margin"],
+                self.config["presence_confirm_frames"],
+                self.config["presence_window_frames"],
+            )
+            for name, threshold in thresholds.items()
+        }
+    
+    # ========== 구독 ==========
+    
+    def subscribe(self, callback: Callable[[TimerEvent], None]) -> Callable[[TimerEvent], None]:
+        """이벤트 받을 함수 등록 (poll()을 부른 스레드에서 호출됨)"""
+        self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback: Callable[[TimerEvent], None]):
+        """이벤트 받을 함수 해제"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    # ========== 설정 ==========
+    
+    def names(self) -> List[str]:
+        """추적 중인 스킬 이름 (표시 순서)"""
+        return list(self.skills)
+    
+    def set_region(self, x: int, y: int, width: int, height: int):
+        """감지할 화면 영역 설정 (감지 영역 하나 모드, 감지 스레드가 끝난 뒤에만)"""
+        self._check_detector_idle("영역을")
+        if self.regions:
+            raise RuntimeError("여러 영역 모드에서는 config.json의 regions로 영역을 정합니다")
+        self.detector.set_region(x, y, width, height)
+    
+    def set_icons(self, icons: Sequence):
+        """
+        추적할 아이콘 교체 (감지 영역 하나 모드, 감지 스레드가 끝난 뒤에만)
+        
+        Args:
+            icons: IconConfig 목록
+        """
+        self._check_detector_idle("아이콘을")
+        if self.regions:
+            raise RuntimeError("여러 영역 모드에서는 config.json의 regions로 아이콘을 정합니다")
+        from multi_detector import configure_detector  # 감지 모드 적용
+        
+        for name in self.detector.names():
+            self.detector.remove_icon(name)
+        for icon in icons:
+            self.detector.add_icon(icon)
+        configure_detector(self.detector, self.config)
+        self._build_skills()
+    
+    def _check_detector_idle(self, what: str):
+        """
+        감지기를 바꿔도 되는지 확인
+        
+        stop() 뒤에도 감지 스레드가 아직 detect() 중일 수 있으므로,
+        스레드가 실제로 끝나기 전에는 RuntimeError를 낸다.
+        """
+        if self.is_running:
+            raise RuntimeError(f"감지 중에는 {what} 바꿀 수 없습니다")
+        if self.worker.is_alive():
+            raise RuntimeError(f"이전 감지 스레드가 아직 끝나지 않아 {what} 바꿀 수 없습니다. 잠시 후 다시 시도하세요")
+    
+    def set_threshold(self, threshold: float):
+        """모든 아이콘의 매칭 기준값 변경 (나가는 기준도 같이, 감지 중에도 바로 적용)"""
+        self.worker.set_threshold(threshold)
+        for tracker in self.presence.values():
+            self._set_tracker_threshold(tracker, threshold)
+        if self.session_log is not None:
+            self.session_log.event(RECORD_THRESHOLD, thresholds=self._thresholds())
+    
+    def _set_tracker_threshold(self, tracker: PresenceTracker, threshold: float):
+        """표시 상태 기계의 들어가는 / 나가는 기준 변경"""
+        tracker.set_thresholds(threshold, max(0.0, threshold - self.config["presence_exit_margin"]))
+    
+    def apply_config(self, changes: Dict[str, Any]):
+        """
+        다시 읽은 설정 적용 (config.HOT_RELOAD_KEYS, 감지 루프를 멈추지 않음)
+        
+        Args:
+            changes: 바뀐 항목 -> 새 값
+        """
+        if "detection_threshold" in changes:
+            self.config["detection_threshold"] = changes["detection_threshold"]
+            self.set_threshold(changes["detection_threshold"])
+        if "scan_interval_ms" in changes:
+            # 적응형 스캔 주기의 기준값이라 다음 poll()부터 반영됨
+            self.config["scan_interval_ms"] = changes["scan_interval_ms"]
+            self._update_scan_rate(capture_clock())
+    
+    # ========== 시작 / 정지 ==========
+    
+    def start(self):
+        """감지 시작 (타이머와 표시 상태 초기화)"""
+        if not self.regions and self.detector.detection_region is None:
+            raise RuntimeError("먼저 감지 영역을 설정하세요")
+        
+        self.is_running = True
+        for skill in self.skills.values():
+            skill.paused_until = 0.0
+        for tracker in self.presence.values():
+            tracker.reset()
+        self.worker.resume_all()
+        self.last_icon_time = capture_clock()
+        self.scan_mode_since = self.last_icon_time
+        self._update_scan_rate(self.last_icon_time)
+        self.worker.pause_until(0.0)
+        self.worker.drain()  # 이전 세션 결과 버리기
+        self._open_session_log()
+        try:
+            self.worker.start()
+        except RuntimeError:
+            # 이전 감지 스레드가 아직 안 끝남: 시작하지 않은 것으로 되돌림
+            self.is_running = False
+            self._close_session_log()
+            raise
+    
+    def stop(self):
+        """감지 정지 (돌고 있던 타이머도 멈춤)"""
+        self.is_running = False
+        self.worker.stop()
+        for skill in self.skills.values():
+            skill.timer_running = False
+        self._record_scan_mode(capture_clock())
+        self.scan_mode_since = 0.0
+        self._close_session_log()
+    
+    def any_timer_running(self) -> bool:
+        """쿨타임이 돌고 있는 스킬이 있는지"""
+        return any(skill.timer_running for skill in self.skills.values())
+    
+    # ========== 이벤트 ==========
+    
+    def poll(self, current_time: Optional[float] = None) -> List[TimerEvent]:
+        """
+        쌓인 감지 결과 처리 + 타이머 갱신
+        
+        Args:
+            current_time: 현재 시각 (capture_clock, None이면 지금)
+        
+        Returns:
+            이번에 생긴 이벤트 (구독자에게도 같은 순서로 보냄)
+        """
+        if current_time is None:
+            current_time = capture_clock()
+        events = []
+        if not self.is_running:
+            return events
+        self._update_scan_rate(current_time)
+        
+        # ========== 감지 결과 처리 ==========
+        for result in self.worker.drain():
+            if self.session_log is not None:
+                self.session_log.tick(result)
+            if result.error is not None:
+                events.append(TimerEvent(EVENT_ERROR, timestamp=result.timestamp, message=result.error))
+                continue
+            
+            scores = []
+            for name, icon_result in result.icons.items():
+                skill = self.skills[name]
+                
+                # 쉬기로 한 뒤에 캡처된 결과는 무시
+                if result.timestamp < skill.paused_until:
+                    continue
+                
+                tracker = self.presence[name]
+                
+                # 감지기가 기준값을 자동 조정했으면 표시 상태 기계도 맞춤
+                if icon_result.threshold is not None and icon_result.threshold != tracker.enter_threshold:
+                    self._set_tracker_threshold(tracker, icon_result.threshold)
+                    if self.session_log is not None:
+                        self.session_log.event(RECORD_THRESHOLD, result.timestamp,
+                                               thresholds={name: [icon_result.threshold, round(tracker.exit_threshold, 4)]})
+                
+                event = tracker.update(icon_result.value, result.timestamp, icon_result.reused)
+                if tracker.is_visible():
+                    self.last_icon_time = result.timestamp
+                
+                if event == EVENT_DISAPPEARED and self.session_log is not None:
+                    self.session_log.event(RECORD_DISAPPEAR, result.timestamp, skill=name)
+                
+                if event == EVENT_APPEARED:
+                    events.append(self._start_timer(skill, *tracker.appearance()))
+                elif event == EVENT_DISAPPEARED and skill.timer_running:
+                    # 버프가 끝났으면 쿨타임이 거의 끝날 때까지 다시 뜰 수 없음
+                    self._pause_skill(skill, skill.timer_start_time + skill.cooldown - self.config["scan_ramp_seconds"])
+                elif not tracker.is_visible():
+                    scores.append(f"{icon_result.value:.2f} / {tracker.enter_threshold:.2f}")
+            
+            # 모든 스킬이 쉬는 중이면 작업자도 쉬기
+            self.worker.pause_until(min(skill.paused_until for skill in self.skills.values()))
+            
+            if scores:
+                events.append(TimerEvent(EVENT_SCORES, timestamp=result.timestamp, message=" | ".join(scores)))
+        
+        # ========== 타이머 업데이트 ==========
+        for skill in self.skills.values():
+            if not skill.timer_running:
+                continue
+            remaining = skill.remaining(current_time)
+            
+            if remaining <= 0:
+                skill.timer_running = False
+                events.append(TimerEvent(EVENT_READY, skill.name, current_time))
+                if self.session_log is not None:
+                    self.session_log.event(RECORD_READY, current_time, skill=skill.name)
+            else:
+                events.append(TimerEvent(EVENT_TIMER, skill.name, current_time, remaining=remaining))
+        
+        for event in events:
+            for callback in list(self._subscribers):
+                callback(event)
+        return events
+    
+    def run(self, interval_ms: Optional[int] = None):
+        """
+        화면 없이 감지 루프 실행 (stop()을 부르거나 Ctrl+C까지)
+        
+        Args:
+            interval_ms: poll() 주기 (None이면 repaint_interval_ms)
+        """
+        scheduler = TickScheduler(interval_ms or self.config["repaint_interval_ms"], clock=capture_clock)
+        if not self.is_running:
+            self.start()
+        try:
+            while self.is_running:
+                scheduler.tick()
+                self.poll()
+                time.sleep(scheduler.delay())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+    
+    async def events(self, interval_ms: Optional[int] = None) -> AsyncIterator[TimerEvent]:
+        """
+        이벤트 비동기 스트림 (감지 중인 동안)
+        
+        Args:
+            interval_ms: poll() 주기 (None이면 repaint_interval_ms)
+        """
+        scheduler = TickScheduler(interval_ms or self.config["repaint_interval_ms"], clock=capture_clock)
+        while self.is_running:
+            scheduler.tick()
+            for event in self.poll():
+                yield event
+            await asyncio.sleep(scheduler.delay())
+    
+    # ========== 스캔 주기 ==========
+    
+    def _select_scan_rate(self, current_time: float) -> tuple:
+        """
+        현재 상태에 맞는 스캔 주기 결정
+        
+        Returns:
+            (주기 ms, 모드 이름)
+        """
+        base = self.config["scan_interval_ms"]
+        
+        # 스킬마다 필요한 주기 중 가장 빠른 것을 사용
+        rates = [self._select_skill_scan_rate(skill, current_time, base) for skill in self.skills.values()]
+        active = [rate for rate in rates if rate[1] != "cooldown"]
+        
+        # 모든 스킬이 쉬는 중이면 작업자가 쉬고 있음
+        if not active:
+            return self.scan_interval_ms, "cooldown"
+        
+        # 쿨타임 없이 대기 중인 스킬이 있는데 오랫동안 아이콘이 없으면 저전력
+        if (any(mode == "active" for _, mode in active)
+                and current_time - self.last_icon_time > self.config["idle_after_seconds"]):
+            idle = (self.config["idle_scan_interval_ms"], "idle")
+            active = [rate if rate[1] != "active" else idle for rate in active]
+        
+        return min(active)
+    
+    def _select_skill_scan_rate(self, skill: SkillTimer, current_time: float, base: int) -> tuple:
+        """스킬 하나의 상태에 맞는 스캔 주기 (주기 ms, 모드 이름)"""
+        # 쉬는 중에는 이 스킬은 매칭하지 않음
+        if current_time < skill.paused_until:
+            return self.scan_interval_ms, "cooldown"
+        
+        # 쿨타임 중: 천천히 (버프가 사라지는지 확인), 끝날 때가 가까워지면 점점 빠르게
+        if skill.timer_running:
+            remaining = skill.remaining(current_time)
+            timer_interval, ramp = self.config["timer_scan_interval_ms"], self.config["scan_ramp_seconds"]
+            if remaining > ramp:
+                return timer_interval, "timer"
+            ratio = max(0.0, remaining) / ramp
+            interval = base + (timer_interval - base) * ratio
+            return int(round(interval / 50) * 50) or base, "ramp"
+        
+        return base, "active"
+    
+    def _update_scan_rate(self, current_time: float):
+        """상태에 따라 감지 주기 조절"""
+        interval, mode = self._select_scan_rate(current_time)
+        self._set_scan_rate(interval, mode, current_time)
+    
+    def _set_scan_rate(self, interval: int, mode: str, current_time: float):
+        """감지 주기 변경 (바뀐 횟수 / 모드별 유지 시간은 stats에, 바뀐 주기는 세션 기록에도)"""
+        if interval == self.scan_interval_ms and mode == self.scan_mode:
+            return
+        if mode != self.scan_mode:
+            self._record_scan_mode(current_time)
+        self.scan_interval_ms = interval
+        self.scan_mode = mode
+        self.scan_rate_changes += 1
+        self.worker.set_interval(interval)
+        if self.session_log is not None:
+            self.session_log.event(RECORD_SCAN, interval_ms=interval, mode=mode)
+    
+    def _record_scan_mode(self, current_time: float):
+        """지금 모드를 유지한 시간 기록 (scan_mode:모드 이름)"""
+        if self.scan_mode_since:
+            self.stats.record(f"scan_mode:{self.scan_mode}", max(0.0, current_time - self.scan_mode_since))
+        self.scan_mode_since = current_time
+    
+    # ========== 타이머 ==========
+    
+    def _start_timer(self, skill: SkillTimer, appeared_at: float, error: Optional[float]) -> TimerEvent:
+        """
+        스킬 아이콘 감지됨 - 타이머 시작
+        
+        처리 시간과 상관없이 아이콘이 나타난 추정 시각부터 센다.
+        
+        Args:
+            skill: 발동한 스킬
+            appeared_at: 아이콘이 나타난 추정 시각 (capture_clock)
+            error: 추정 최대 오차 (초, 모르면 None)
+        """
+        skill.timer_running = True
+        skill.timer_start_time = appeared_at
+        now = capture_clock()
+        delay_ms = (now - appeared_at) * 1000
+        if self.session_log is not None:
+            # 나타남 -> 처음 보임 -> 확정 프레임 캡처 -> 지금(처리)
+            tracker = self.presence[skill.name]
+            self.session_log.event(RECORD_TRIGGER, now, skill=skill.name, appeared=round(appeared_at, 4),
+                                   error=error, first_hit=round(tracker.first_hit_at, 4),
+                                   confirmed=round(tracker.changed_at, 4))
+        if error is None:
+            print(f"[발동] {skill.name} - 감지 시작 때 이미 떠 있음 ({delay_ms:.0f}ms 전 캡처)")
+        else:
+            self.stats.record("trigger_error", error)
+            print(f"[발동] {skill.name} - {delay_ms:.0f}ms 전에 나타남 (오차 ±{error * 1000:.0f}ms)")
+        return TimerEvent(EVENT_TRIGGERED, skill.name, appeared_at, remaining=skill.cooldown, error=error)
+    
+    def _pause_skill(self, skill: SkillTimer, until: float):
+        """아이콘이 다시 뜰 수 없는 동안 해당 스킬 매칭 쉬기"""
+        if until <= capture_clock():
+            return
+        skill.paused_until = until
+        self.worker.pause_icon(skill.name, until)
+    
+    # ========== 세션 기록 ==========
+    
+    def _thresholds(self) -> Dict[str, List[float]]:
+        """스킬 이름 -> [들어가는 기준, 나가는 기준]"""
+        return {name: [round(t.enter_threshold, 4), round(t.exit_threshold, 4)] for name, t in self.presence.items()}
+    
+    def _open_session_log(self):
+        """session_log_dir가 있으면 이번 감지 세션 기록 시작"""
+        self._close_session_log()
+        if not self.config["session_log_dir"]:
+            return
+        self.session_log = SessionLog(self.config["session_log_dir"])
+        self.session_log.open({
+            "thresholds": self._thresholds(),
+            "cooldowns": {name: skill.cooldown for name, skill in self.skills.items()},
+            "confirm_frames": self.config["presence_confirm_frames"],
+            "window_frames": self.config["presence_window_frames"],
+            "interval_ms": self.scan_interval_ms,
+            "scan_mode": self.scan_mode,
+            "regions": [spec.name for spec in self.regions],
+        })
+    
+    def _close_session_log(self):
+        """세션 기록 마무리 (건너뛴 틱 / 매칭 생략 요약을 남김)"""
+        if self.session_log is None:
+            return
+        self.session_log.close({
+            "scheduler": self.worker.get_scheduler_stats(),
+            "frame_gate": self.worker.get_gate_stats(),
+            "thresholds": self.worker.get_threshold_stats(),
+        })
+        self.session_log = None
+    
+    # ========== 통계 ==========
+    
+    def get_tick_latency(self) -> dict:
+        """감지 한 틱 지연 시간 요약 (p50 / p99 ms)"""
+        return self.worker.get_tick_latency()
+    
+    def get_threshold_stats(self) -> Dict[str, dict]:
+        """아이콘별 기준값 제안 통계 (아이콘 / 배경 사이 빈 구간, 제안값, 지금 기준값)"""
+        return self.worker.get_threshold_stats()
+    
+    def get_latency_stats(self) -> dict:
+        """감지기 + 엔진 단계별 지연 시간 요약"""
+        return {**self.worker.get_latency_stats(), **self.stats.summary()}
+    
+    def dump_latency_stats(self, path: str, extra: Optional[dict] = None):
+        """지연 시간 요약을 JSON 파일로 저장 (extra는 함께 저장할 값, 여러 영역이면 영역별 프로세스에서 받은 통계)"""
+        data = {
+            "stages": self.worker.get_latency_stats(),
+            "engine": self.stats.summary(),
+            "frame_gate": self.worker.get_gate_stats(),
+            "roi": self.worker.get_roi_stats(),
+            "prefilter": self.worker.get_prefilter_stats(),
+            "detection_scheduler": self.worker.get_scheduler_stats(),
+            "thresholds": self.worker.get_threshold_stats(),
+            **(extra or {}),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def print_stats(self):
+        """이번 세션 감지 통계 출력 (여러 영역이면 영역별 프로세스에서 받은 통계를 합쳐서)"""
+        gate = self.worker.get_gate_stats()
+        print(f"매칭 생략: {gate['skipped']}/{gate['ticks']}틱 ({gate['skip_ratio'] * 100:.1f}%)")
+        for name, stats in self.worker.get_prefilter_stats().items():
+            if stats["ticks"]:
+                print(f"{name} 사전 검색: {stats['ticks']}틱 / 평균 후보 {stats['candidates_mean']:.1f}개"
+                      f" / 1단계 p50 {stats['prefilter']['p50_ms']:.1f}ms / 2단계 p50 {stats['confirm']['p50_ms']:.1f}ms")
+        trigger = self.stats.get("trigger_error")
+        if trigger["count"]:
+            print(f"발동 시각 오차: {trigger['count']}회 / 중간값 ±{trigger['p50_ms']:.0f}ms / 최대 ±{trigger['max_ms']:.0f}ms")
+        for name, tuning in self.worker.get_threshold_stats().items():
+            if tuning["suggestion"] is None:
+                continue
+            mode = "자동 조정 중" if tuning["adaptive"] else "제안"
+            print(f"{name} 기준값 {mode}: {tuning['threshold']:.2f} -> {tuning['suggestion']:.2f}"
+                  f" (배경 ~{tuning['background_high']:.2f} / 아이콘 {tuning['hit_low']:.2f}~)")
+        modes = [(stage.split(":", 1)[1], summary) for stage, summary in self.stats.summary().items()
+                 if stage.startswith("scan_mode:")]
+        if modes:
+            print("스캔 주기 모드: " + " / ".join(
+                f"{mode} {summary['count']}회 (중간값 {summary['p50_ms'] / 1000:.1f}초)" for mode, summary in modes
+            ) + f" / 주기 변경 {self.scan_rate_changes}회 (지금 {self.scan_interval_ms}ms)")
+        s = self.worker.get_scheduler_stats()
+        print(f"감지 주기: 지연 평균 {s['jitter_mean_ms']:.1f}ms / 최대 {s['jitter_max_ms']:.1f}ms"
+              f" / 건너뜀 {s['dropped']}틱")
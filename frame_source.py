@@ -0,0 +1,150 @@
+from abc import ABC, abstractmethod  # 프레임 소스 인터페이스
+from pathlib import Path  # 파일 경로 처리용
+from typing import Iterable, Iterator, Optional  # 타입 힌트용
+
+import cv2          # 이미지 처리 라이브러리
+import numpy as np  # 숫자/배열 처리 라이브러리
+import mss          # 초고속 화면 캡처 라이브러리
+
+# 녹화 폴더에서 읽을 이미지 확장자
+IMAGE_EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg")
+
+
+class FrameSource(ABC):
+    """
+    감지기가 프레임을 받아오는 곳 (화면 캡처, 녹화 파일 등)
+    
+    grab()은 BGRA / BGR / 그레이스케일 프레임 중 하나를 반환하고,
+    더 이상 프레임이 없으면 None을 반환한다.
+    """
+    
+    @abstractmethod
+    def grab(self, region: Optional[dict] = None) -> Optional[np.ndarray]:
+        """
+        프레임 하나 가져오기
+        
+        Args:
+            region: 캡처 영역 ({"left", "top", "width", "height"}, 녹화 소스는 무시)
+        
+        Returns:
+            프레임 (없으면 None)
+        """
+    
+    def close(self):
+        """사용한 자원 정리"""
+    
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """녹화 소스를 끝까지 순회"""
+        while True:
+            frame = self.grab()
+            if frame is None:
+                return
+            yield frame
+
+
+class MssFrameSource(FrameSource):
+    """mss로 실제 화면을 캡처하는 소스 (BGRA)"""
+    
+    def __init__(self):
+        """소스 초기화"""
+        # 캡처 도구는 처음 쓸 때, 쓰는 스레드에서 생성
+        self.sct = None
+    
+    def grab(self, region: Optional[dict] = None) -> Optional[np.ndarray]:
+        """프레임 하나 가져오기"""
+        if self.sct is None:
+            self.sct = mss.mss()
+        
+        # 영역이 없으면 주 모니터 전체
+        if region is None:
+            region = self.sct.monitors[1]
+        
+        # 복사 없이 mss 원본 버퍼(BGRA)를 그대로 보는 배열
+        screenshot = self.sct.grab(region)
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+    
+    def close(self):
+        """사용한 자원 정리"""
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+
+
+class ImageDirSource(FrameSource):
+    """폴더에 저장된 이미지들을 파일 이름 순서대로 읽는 소스"""
+    
+    def __init__(self, directory: str):
+        """소스 초기화"""
+        self.paths = sorted(
+            p for p in Path(directory).iterdir()
+            if p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        if not self.paths:
+            raise FileNotFoundError(f"프레임 이미지가 없습니다: {directory}")
+        self._index = 0
+    
+    def grab(self, region: Optional[dict] = None) -> Optional[np.ndarray]:
+        """프레임 하나 가져오기"""
+        if self._index >= len(self.paths):
+            return None
+        path = self.paths[self._index]
+        self._index += 1
+        
+        frame = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+        if frame is None:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+        return frame
+
+
+class VideoFileSource(FrameSource):
+    """동영상 파일을 프레임 단위로 읽는 소스 (BGR)"""
+    
+    def __init__(self, path: str):
+        """소스 초기화"""
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise FileNotFoundError(f"동영상을 열 수 없습니다: {path}")
+    
+    def grab(self, region: Optional[dict] = None) -> Optional[np.ndarray]:
+        """프레임 하나 가져오기"""
+        ok, frame = self.capture.read()
+        return frame if ok else None
+    
+    def close(self):
+        """사용한 자원 정리"""
+        self.capture.release()
+
+
+class ArraySource(FrameSource):
+    """메모리에 있는 프레임 묶음 (numpy 배열 스택이나 리스트)을 읽는 소스"""
+    
+    def __init__(self, frames: Iterable[np.ndarray]):
+        """소스 초기화"""
+        self.frames = list(frames)
+        self._index = 0
+    
+    def grab(self, region: Optional[dict] = None) -> Optional[np.ndarray]:
+        """프레임 하나 가져오기"""
+        if self._index >= len(self.frames):
+            return None
+        frame = self.frames[self._index]
+        self._index += 1
+        return frame
+
+
+def open_recording(path: str) -> FrameSource:
+    """
+    경로 종류에 맞는 녹화 소스 열기
+    
+    Args:
+        path: 이미지 폴더, .npy 프레임 스택, 또는 동영상 파일
+    
+    Returns:
+        해당 FrameSource
+    """
+    p = Path(path)
+    if p.is_dir():
+        return ImageDirSource(path)
+    if p.suffix.lower() == ".npy":
+        return ArraySource(np.load(path))
+    return VideoFileSource(path)
@@ -0,0 +1,116 @@
+import json  # 통계 파일 저장용
+import time  # 시간 측정용
+from contextlib import contextmanager  # measure() 용
+from typing import Dict, List  # 타입 힌트용
+
+# 단계별로 보관할 최근 측정값 개수
+DEFAULT_CAPACITY = 512
+
+
+class LatencyHistogram:
+    """
+    최근 측정값만 고정 크기 링 버퍼에 보관하는 지연 시간 기록
+    
+    기록은 배열 한 칸을 덮어쓰는 것뿐이라 거의 비용이 없고,
+    분위수는 읽을 때만 정렬해서 계산한다.
+    """
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        기록 초기화
+        
+        Args:
+            capacity: 보관할 최근 측정값 개수
+        """
+        self.samples = [0.0] * capacity
+        self.capacity = capacity
+        self.count = 0     # 지금까지 기록한 총 개수
+        self.max = 0.0     # 지금까지의 최대값 (초)
+    
+    def record(self, seconds: float):
+        """측정값 하나 기록 (초)"""
+        self.samples[self.count % self.capacity] = seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+    
+    def recent(self) -> List[float]:
+        """버퍼에 남아 있는 최근 측정값들"""
+        return self.samples[:min(self.count, self.capacity)]
+    
+    def percentile(self, p: float) -> float:
+        """최근 측정값의 p 분위수 (초, 0~100)"""
+        values = sorted(self.recent())
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+        return values[index]
+    
+    def summary(self) -> dict:
+        """개수 / p50 / p99 / 최대 (ms)"""
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Instrumentation:
+    """단계 이름별 LatencyHistogram 모음"""
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        계측기 초기화
+        
+        Args:
+            capacity: 단계별로 보관할 최근 측정값 개수
+        """
+        self.capacity = capacity
+        self.enabled = True
+        self.histograms: Dict[str, LatencyHistogram] = {}
+    
+    def record(self, stage: str, seconds: float):
+        """단계 하나의 소요 시간 기록 (초)"""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram(self.capacity)
+        histogram.record(seconds)
+    
+    @contextmanager
+    def measure(self, stage: str):
+        """with 블록 소요 시간을 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+    
+    def get(self, stage: str) -> dict:
+        """단계 하나의 요약 (기록이 없으면 빈 요약)"""
+        histogram = self.histograms.get(stage)
+        return histogram.summary() if histogram else LatencyHistogram(1).summary()
+    
+    def summary(self) -> Dict[str, dict]:
+        """모든 단계의 요약"""
+        return {stage: h.summary() for stage, h in list(self.histograms.items())}
+    
+    def reset(self):
+        """기록 전부 지우기"""
+        self.histograms = {}
+    
+    def dump(self, path: str, extra: dict = None):
+        """
+        요약을 JSON 파일로 저장
+        
+        Args:
+            path: 저장할 파일 경로
+            extra: 함께 저장할 다른 통계들 (이름 -> 요약)
+        """
+        data = {"stages": self.summary()}
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -1,35 +1,40 @@
 import time  # 시간 측정용
-from pathlib import Path  # 파일 경로 처리용
-from detector import OneShotDetector  # 아이콘 감지기
-from timer_overlay import TimerOverlay  # 타이머 UI
-from region_selector import RegionSelector, RegionIndicator  # 영역 선택기 + 표시기
-from config import load_config, save_config  # 설정 관리
+import multiprocessing  # exe 빌드에서 감지 프로세스 시작용
+from engine import TimerEngine, TimerEvent, EVENT_ERROR, EVENT_READY, EVENT_SCORES, EVENT_TIMER, EVENT_TRIGGERED  # 감지 + 타이머 엔진
+from scheduler import TickScheduler, capture_clock  # 마감 시각 기반 스케줄러
+from instrumentation import Instrumentation  # 단계별 지연 시간 기록
+from config import ConfigStore  # 설정 관리
+
+# Tk 화면(timer_overlay, region_selector)은 앱을 만들 때 불러온다.
+# 여러 영역 모드의 감지 프로세스는 이 파일을 다시 불러오므로, 거기서는 Tk를 띄우지 않는다.
+
 
 class OneShotTimerApp:
-    """일격필살 타이머 메인 앱"""
+    """일격필살 타이머 메인 앱 (엔진 이벤트를 Tk 오버레이에 표시)"""
     
     def __init__(self):
         """앱 초기화"""
-        # 설정 불러오기
-        self.config = load_config()
-        
-        # 아이콘 이미지 경로
-        icon_path = Path("assets/oneshot_icon.png")
+        from timer_overlay import TimerOverlay  # 타이머 UI
+        from region_selector import RegionIndicator  # 영역 표시기
         
-        # 아이콘 파일 존재 확인
-        if not icon_path.exists():
-            print("=" * 50)
-            print("⚠️ assets/oneshot_icon.png 파일이 필요합니다!")
-            print("   일격필살 버프 아이콘을 캡처해서 저장해주세요.")
-            print("=" * 50)
+        # 설정 불러오기 (저장은 백그라운드에서 모아서)
+        self.store = ConfigStore()
+        self.config = self.store.config
         
         # ========== 컴포넌트 초기화 ==========
-        self.detector = OneShotDetector(
-            str(icon_path),
-            threshold=self.config["detection_threshold"]
-        )
+        # 감지 + 타이머는 화면과 상관없는 엔진에서
+        self.engine = TimerEngine(self.config)
+        self.engine.subscribe(self._on_engine_event)
+        
+        # 화면 갱신(카운트다운)은 감지와 별도 주기로
+        self.repaint_scheduler = TickScheduler(self.config["repaint_interval_ms"], clock=capture_clock)
+        self._loop_handle = None
+        
+        # Tk 쪽 지연 시간 기록 (화면 갱신)
+        self.ui_stats = Instrumentation()
+        self._latency_shown_at = 0.0
         
-        self.overlay = TimerOverlay()
+        self.overlay = TimerOverlay(self.config["animation_interval_ms"])
         
         # 영역 표시기 (희미한 테두리)
         self.region_indicator = RegionIndicator(self.overlay.root)
@@ -39,19 +44,15 @@ class OneShotTimerApp:
         
         # ========== 상태 변수 ==========
         self.is_active = False
-        self.timer_running = False
-        self.timer_start_time = 0.0
-        self.cooldown = self.config["cooldown"]
-        self.last_detected = False
-        
-        # ========== 감지 쿨다운 (중복 감지 방지) ==========
-        self.detection_cooldown = 10.0
-        self.last_trigger_time = 0.0
-        
-        # ========== 감지 영역 설정 ==========
-        if self.config["detection_region"]:
+        self.overlay.set_skills(self.engine.names())
+        
+        # ========== 감지 영역 표시 ==========
+        # 여러 영역 모드는 영역마다 감지 프로세스가 따로 돌므로 감지 영역 하나는 쓰지 않음
+        self.multi_region = bool(self.engine.regions)
+        if self.multi_region:
+            self.overlay.hide_region_button()
+        elif self.config["detection_region"]:
             r = self.config["detection_region"]
-            self.detector.set_region(r["x"], r["y"], r["width"], r["height"])
             self.region_indicator.show(r["x"], r["y"], r["width"], r["height"])
         
         # ========== 오버레이 위치 복원 ==========
@@ -65,7 +66,9 @@ class OneShotTimerApp:
         self.overlay.on_quit = self.quit_app
         
         # 초기 상태 표시
-        if self.config["detection_region"]:
+        if self.multi_region:
+            self.overlay.set_status(f"여러 영역 모드 ({len(self.engine.regions)}개)")
+        elif self.config["detection_region"]:
             self.overlay.set_status("영역 설정됨")
         else:
             self.overlay.set_status("영역 버튼을 눌러 감지 영역을 설정하세요")
@@ -80,28 +83,44 @@ class OneShotTimerApp:
                 pass
             self.current_selector = None
         
-        # 영역이 설정 안 됐으면 경고
-        if not self.config["detection_region"]:
+        # 영역이 설정 안 됐으면 경고 (여러 영역 모드는 regions로 정해져 있음)
+        if not self.multi_region and not self.config["detection_region"]:
             self.overlay.set_status("먼저 영역을 설정하세요!")
             return
         
+        self._reload_config()
+        try:
+            self.engine.start()
+        except RuntimeError as e:
+            self.overlay.set_status(str(e))
+            return
         self.is_active = True
-        self.last_trigger_time = 0.0
         self.overlay.set_running(True)
         self.overlay.set_status("감지 중...")
+        self._cancel_loop()
+        self.repaint_scheduler.reset()
         self._detection_loop()
     
     def stop_detection(self):
         """정지 버튼 클릭 - 감지 중지"""
         self.is_active = False
-        self.timer_running = False
+        self.engine.stop()
+        self._cancel_loop()
+        for name in self.engine.names():
+            self.overlay.update_timer(0, name)
         self.overlay.set_running(False)
-        self.overlay.update_timer(0)
         self.overlay.set_status("정지됨")
+        self._print_stats()
         self._save_position()
     
     def open_region_selector(self):
         """영역 설정 버튼 클릭 - 영역 선택기 열기"""
+        from region_selector import RegionSelector  # 영역 선택기
+        
+        # 여러 영역 모드는 config.json의 regions로 영역을 정함
+        if self.multi_region:
+            return
+        
         # 이미 열려있으면 닫기
         if self.current_selector is not None:
             try:
@@ -110,9 +129,9 @@ class OneShotTimerApp:
                 pass
             self.current_selector = None
         
-        # 감지 중이면 먼저 정지
-        self.is_active = False
-        self.timer_running = False
+        # 감지 중이면 정지 버튼과 똑같이 정지 (반복 취소, 타이머 화면 / 버튼 상태 초기화)
+        if self.is_active:
+            self.stop_detection()
         
         # 영역 표시기 숨기기
         self.region_indicator.hide()
@@ -136,17 +155,21 @@ class OneShotTimerApp:
         # 선택기 추적 해제
         self.current_selector = None
         
+        # 감지기에 영역 적용 (이전 감지 스레드가 아직 안 끝났으면 거절됨)
+        try:
+            self.engine.set_region(
+                region["x"],
+                region["y"],
+                region["width"],
+                region["height"]
+            )
+        except RuntimeError as e:
+            self.overlay.set_status(str(e))
+            return
+        
         # 설정에 저장
         self.config["detection_region"] = region
-        save_config(self.config)
-        
-        # 감지기에 영역 적용
-        self.detector.set_region(
-            region["x"],
-            region["y"],
-            region["width"],
-            region["height"]
-        )
+        self.store.save()
         
         # 영역 표시기 업데이트
         self.region_indicator.show(
@@ -164,13 +187,21 @@ class OneShotTimerApp:
         try:
             x, y = self.overlay.get_position()
             self.config["overlay_position"] = {"x": x, "y": y}
-            save_config(self.config)
+            self.store.save()
         except:
             pass
         
         self.is_active = False
+        self.engine.stop()
         self.region_indicator.hide()
         
+        # 지연 시간 기록 저장
+        if self.config["latency_dump_path"]:
+            try:
+                self.dump_latency_stats(self.config["latency_dump_path"])
+            except OSError as e:
+                print(f"지연 시간 기록 저장 실패: {e}")
+        
         # 영역 선택기 열려있으면 닫기
         if self.current_selector is not None:
             try:
@@ -182,64 +213,100 @@ class OneShotTimerApp:
             self.region_indicator.window.destroy()
         except:
             pass
+        
+        # 예약된 설정 저장 마무리
+        self.store.flush()
     
     def _detection_loop(self):
-        """메인 감지 루프"""
+        """메인 루프 - 엔진 이벤트 처리 후 화면 갱신 예약"""
         if not self.is_active:
             return
         
-        current_time = time.time()
-        
-        # ========== 감지 쿨다운 체크 ==========
-        time_since_trigger = current_time - self.last_trigger_time
-        can_detect = time_since_trigger >= self.detection_cooldown
-        
-        if can_detect:
-            detected = self.detector.detect()
-            
-            match_val = self.detector.get_last_match_value()
-            threshold = self.detector.threshold
-            
-            if detected:
-                self._start_timer()
-                self.last_trigger_time = current_time
-            else:
-                if not self.timer_running:
-                    self.overlay.set_status(f"매칭: {match_val:.2f} / 기준: {threshold:.2f}")
-        else:
-            remaining_cooldown = self.detection_cooldown - time_since_trigger
-            if not self.timer_running:
-                self.overlay.set_status(f"재감지 대기: {remaining_cooldown:.1f}초")
-        
-        # ========== 타이머 업데이트 ==========
-        if self.timer_running:
-            elapsed = current_time - self.timer_start_time
-            remaining = self.cooldown - elapsed
-            
-            if remaining <= 0:
-                self.timer_running = False
-                self.overlay.update_timer(0)
-                self.overlay.set_status("준비 완료!")
-            else:
-                self.overlay.update_timer(remaining)
+        self.repaint_scheduler.tick()
+        ui_start = time.perf_counter()
+        current_time = capture_clock()
+        
+        # 설정 파일이 바뀌었으면 감지 루프를 멈추지 않고 적용
+        self._reload_config()
         
-        self.overlay.schedule(
-            self.config["scan_interval_ms"],
+        # 감지 결과 / 타이머 이벤트는 _on_engine_event로 들어옴
+        self.engine.poll(current_time)
+        
+        # ========== 지연 시간 표시 (1초마다) ==========
+        if self.config["show_latency"] and current_time - self._latency_shown_at >= 1.0:
+            self._latency_shown_at = current_time
+            tick = self.engine.get_tick_latency()
+            self.overlay.set_latency(tick["p50_ms"], tick["p99_ms"])
+        
+        # 이번 프레임의 타이머 / 상태 변경을 한 번에 (바뀐 라벨만)
+        self.overlay.flush()
+        self.ui_stats.record("ui_update", time.perf_counter() - ui_start)
+        
+        self._loop_handle = self.overlay.schedule(
+            self.repaint_scheduler.delay_ms(),
             self._detection_loop
         )
     
-    def _start_timer(self):
-        """일격필살 감지됨 - 타이머 시작"""
-        self.timer_running = True
-        self.timer_start_time = time.time()
-        self.overlay.set_status("일격필살 발동!")
+    def _reload_config(self):
+        """밖에서 고친 설정 파일의 기준값 / 스캔 주기 적용 (1초마다 확인)"""
+        changes = self.store.reload_if_changed()
+        if changes:
+            self.engine.apply_config(changes)
+    
+    def _on_engine_event(self, event: TimerEvent):
+        """엔진 이벤트를 오버레이에 표시"""
+        if event.kind == EVENT_TIMER:
+            # 카운트다운은 오버레이가 시작 시각부터 직접 애니메이션
+            pass
+        elif event.kind == EVENT_TRIGGERED:
+            self.overlay.start_countdown(event.skill, event.timestamp, event.remaining)
+            if event.error is None:
+                self.overlay.set_status(f"{event.skill} 발동!")
+            else:
+                self.overlay.set_status(f"{event.skill} 발동! (±{event.error * 1000:.0f}ms)")
+        elif event.kind == EVENT_READY:
+            self.overlay.update_timer(0, event.skill)
+            self.overlay.set_status(f"{event.skill} 준비 완료!")
+        elif event.kind == EVENT_SCORES:
+            if not self.engine.any_timer_running():
+                self.overlay.set_status(f"매칭: {event.message}")
+        elif event.kind == EVENT_ERROR:
+            self.overlay.set_status(f"감지 오류: {event.message}")
+    
+    def _cancel_loop(self):
+        """예약된 메인 루프 실행 취소"""
+        if self._loop_handle is not None:
+            self.overlay.cancel(self._loop_handle)
+            self._loop_handle = None
+    
+    def get_latency_stats(self) -> dict:
+        """감지기 + 화면 갱신 단계별 지연 시간 요약"""
+        return {**self.engine.get_latency_stats(), **self.ui_stats.summary()}
+    
+    def dump_latency_stats(self, path: str):
+        """지연 시간 요약을 JSON 파일로 저장"""
+        self.engine.dump_latency_stats(path, extra={
+            "ui": self.ui_stats.summary(),
+            "repaint_scheduler": self.repaint_scheduler.get_stats(),
+            "render": self.overlay.get_render_stats(),
+        })
+    
+    def _print_stats(self):
+        """이번 세션 감지 통계 출력"""
+        self.engine.print_stats()
+        s = self.repaint_scheduler.get_stats()
+        print(f"화면 주기: 지연 평균 {s['jitter_mean_ms']:.1f}ms / 최대 {s['jitter_max_ms']:.1f}ms"
+              f" / 건너뜀 {s['dropped']}틱")
+        render = self.overlay.get_render_stats()
+        print(f"라벨 갱신: {render['applied']}/{render['requests']}회 적용"
+              f" ({render['skip_ratio'] * 100:.1f}% 생략)")
     
     def _save_position(self):
         """오버레이 창 위치 저장"""
         try:
             x, y = self.overlay.get_position()
             self.config["overlay_position"] = {"x": x, "y": y}
-            save_config(self.config)
+            self.store.save()
         except:
             pass
     
@@ -248,8 +315,11 @@ class OneShotTimerApp:
         print("=" * 50)
         print("일격필살 타이머")
         print("=" * 50)
-        print(f"쿨타임: {self.cooldown:.0f}초")
-        print(f"감지 쿨다운: {self.detection_cooldown:.0f}초")
+        for skill in self.engine.skills.values():
+            print(f"{skill.name} 쿨타임: {skill.cooldown:.0f}초")
+        print(f"감지 확인: 최근 {self.config['presence_window_frames']}프레임 중"
+              f" {self.config['presence_confirm_frames']}프레임"
+              f" (사라짐 기준 -{self.config['presence_exit_margin']:.2f})")
         print("1. [영역] 버튼으로 감지 영역 설정")
         print("2. [시작] 버튼으로 감지 시작")
         print("=" * 50)
@@ -258,9 +328,13 @@ class OneShotTimerApp:
             self.overlay.run()
         except:
             pass
+        finally:
+            self.engine.stop()
+            self.store.flush()
 
 
 # ========== 프로그램 시작점 ==========
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # exe에서 감지 프로세스가 앱을 다시 띄우지 않도록
     app = OneShotTimerApp()
-    app.run()
\ No newline at end of file
+    app.run()
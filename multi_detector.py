@@ -0,0 +1,324 @@
+import time  # 단계별 시간 측정용
+from dataclasses import dataclass  # 아이콘 설정/결과 정의용
+from typing import Dict, List, Optional, Sequence, Tuple, Union  # 타입 힌트용
+
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+from buffer_pool import BufferPool  # 틱마다 재사용하는 버퍼
+from detector import OneShotDetector, FrameGate  # 아이콘 감지기
+from frame_source import FrameSource, MssFrameSource  # 프레임 소스
+from scheduler import capture_clock  # 캡처 시각용 단조 시계
+from instrumentation import Instrumentation  # 단계별 지연 시간 기록
+from preprocess import PREPROCESS_EDGE, PREPROCESS_GRAY, preprocess_frame  # 매칭 전 전처리
+
+
+@dataclass(frozen=True)
+class IconConfig:
+    """추적할 스킬 아이콘 하나의 설정"""
+    name: str                                 # 표시 이름 (예: "일격필살")
+    path: str                                 # 아이콘 이미지 경로
+    threshold: float = 0.8                    # 매칭 정확도 기준
+    cooldown: float = 30.0                    # 스킬 쿨타임 (초)
+    scales: Optional[Tuple[float, ...]] = None  # 검색할 크기 비율 (None이면 기본값)
+
+
+@dataclass
+class IconResult:
+    """한 틱에서 아이콘 하나의 감지 결과"""
+    detected: bool
+    value: float                                          # 매칭 값
+    scale: float = 1.0                                    # 찾은 스케일
+    location: Optional[Tuple[int, int, int, int]] = None  # 마지막으로 찾은 위치
+    threshold: Optional[float] = None                     # detected를 판단한 기준값 (자동 조정 중이면 바뀜)
+    reused: bool = False                                  # 화면 변화가 없어 직전 결과를 재사용함 (새로 매칭 안 함)
+
+
+def icons_from_config(config: dict) -> List[IconConfig]:
+    """
+    설정에서 추적할 아이콘 목록 만들기
+    
+    "icons" 항목이 비어 있으면 예전 설정(일격필살 아이콘 하나)을 사용한다.
+    """
+    icons = []
+    for item in config.get("icons") or []:
+        scales = item.get("scales")
+        icons.append(IconConfig(
+            name=item["name"],
+            path=item["path"],
+            threshold=item.get("threshold", config["detection_threshold"]),
+            cooldown=item.get("cooldown", config["cooldown"]),
+            scales=tuple(scales) if scales else None,
+        ))
+    if not icons:
+        icons.append(IconConfig(
+            name="일격필살",
+            path="assets/oneshot_icon.png",
+            threshold=config["detection_threshold"],
+            cooldown=config["cooldown"],
+        ))
+    return icons
+
+
+def configure_detector(detector: Union[OneShotDetector, "MultiIconDetector"], config: dict):
+    """설정(config.json)의 감지 모드를 감지기에 적용 (아이콘 하나짜리 OneShotDetector에도 같은 설정 메서드가 있음)"""
+    detector.set_preprocess(config["preprocess"])
+    detector.set_search_mode(config["scale_search"])
+    detector.set_prefilter(config["prefilter"], config["prefilter_factor"], config["prefilter_candidates"])
+    detector.set_roi_tracking(config["roi_tracking"], config["roi_padding"])
+    detector.set_frame_gate(config["frame_gate"], config["frame_gate_threshold"])
+    detector.set_adaptive_threshold(config["adaptive_threshold"])
+
+
+class MultiIconDetector:
+    """
+    여러 스킬 아이콘을 한 번의 캡처로 함께 감지하는 클래스
+    
+    틱마다 화면을 한 번만 캡처 + 전처리(기본: 그레이스케일)하고,
+    아이콘마다 따로 가진 OneShotDetector(템플릿 뱅크, 스케일 검색, 위치 추적)로
+    같은 프레임을 매칭한다.
+    """
+    
+    def __init__(self, icons: Sequence[IconConfig]):
+        """
+        감지기 초기화
+        
+        Args:
+            icons: 추적할 아이콘 설정 목록
+        """
+        # 프레임 소스 / 영역 / 프레임 게이트는 모든 아이콘이 공유
+        self.source: FrameSource = MssFrameSource()
+        self.detection_region = None
+        self.gate = FrameGate()
+        self.stats = Instrumentation()
+        self.buffers = BufferPool()  # 전처리 결과 (매칭 결과 버퍼는 아이콘별)
+        self.preprocess = PREPROCESS_GRAY
+        
+        # 아이콘별 감지기
+        self.icons: Dict[str, IconConfig] = {}
+        self.detectors: Dict[str, OneShotDetector] = {}
+        self._paused_until: Dict[str, float] = {}
+        self.last_results: Dict[str, IconResult] = {}
+        self.last_capture_time = 0.0  # 마지막 프레임 캡처 시각 (capture_clock)
+        self.last_timings: Dict[str, float] = {}  # 마지막 틱의 단계별 소요 시간 (초, 세션 기록용)
+        
+        for icon in icons:
+            self.add_icon(icon)
+    
+    # ========== 아이콘 관리 ==========
+    
+    def add_icon(self, icon: IconConfig):
+        """추적할 아이콘 추가 (같은 이름이면 교체)"""
+        detector = OneShotDetector(icon.path, threshold=icon.threshold, name=icon.name)
+        detector.debug = False
+        detector.stats = self.stats  # 계측은 한 곳에 모음
+        if self.preprocess != PREPROCESS_GRAY:
+            detector.set_preprocess(self.preprocess)
+        if icon.scales:
+            detector.set_scales(icon.scales)
+        
+        # 이미 쓰던 감지 모드가 있으면 맞추기
+        first = next(iter(self.detectors.values()), None)
+        if first is not None:
+            detector.set_search_mode(first.search_mode)
+            detector.set_roi_tracking(first.roi_tracking, first.roi_padding)
+            detector.set_prefilter(first.prefilter, first.prefilter_factor, first.prefilter_candidates)
+        
+        self.icons[icon.name] = icon
+        self.detectors[icon.name] = detector
+    
+    def remove_icon(self, name: str):
+        """추적 중인 아이콘 제거"""
+        self.icons.pop(name, None)
+        self.detectors.pop(name, None)
+        self._paused_until.pop(name, None)
+        self.last_results.pop(name, None)
+    
+    def names(self) -> List[str]:
+        """추적 중인 아이콘 이름 (추가한 순서)"""
+        return list(self.detectors)
+    
+    def pause_icon(self, name: str, timestamp: float):
+        """지정한 시각(capture_clock)까지 해당 아이콘은 매칭하지 않음"""
+        self._paused_until[name] = timestamp
+    
+    def resume_all(self):
+        """모든 아이콘 일시정지 해제"""
+        self._paused_until.clear()
+    
+    # ========== 설정 (모든 아이콘에 적용) ==========
+    
+    def set_region(self, x: int, y: int, width: int, height: int):
+        """감지할 화면 영역 설정"""
+        self.detection_region = {
+            "left": x,
+            "top": y,
+            "width": width,
+            "height": height
+        }
+        # 보정 위치는 예전 영역 기준이라 버림 (보정 스케일은 그대로)
+        for detector in self.detectors.values():
+            detector.set_calibration(detector.calibrated_scale, None)
+        self.gate.reset()
+    
+    def apply_calibration(self, calibration: Dict[str, dict]):
+        """
+        calibrate.py session 결과 적용
+        
+        Args:
+            calibration: 아이콘 이름 -> {"scale", "location", "threshold", ...}
+        """
+        for name, result in calibration.items():
+            detector = self.detectors.get(name)
+            if detector is None:
+                continue
+            detector.set_calibration(result.get("scale"), result.get("location"))
+            if result.get("threshold") is not None:
+                detector.set_threshold(result["threshold"])
+    
+    def set_threshold(self, threshold: float):
+        """모든 아이콘의 매칭 기준값 변경 (아이콘별 / 보정 기준값도 덮어씀)"""
+        for detector in self.detectors.values():
+            detector.set_threshold(threshold)
+    
+    def set_adaptive_threshold(self, enabled: bool):
+        """모든 아이콘의 기준값 자동 조정 켜기 / 끄기 (지금 기준값에서 시작)"""
+        for detector in self.detectors.values():
+            detector.set_adaptive_threshold(enabled)
+    
+    def get_threshold_stats(self) -> Dict[str, dict]:
+        """아이콘별 기준값 제안 통계"""
+        return {name: d.get_threshold_stats() for name, d in self.detectors.items()}
+    
+    def set_preprocess(self, mode: str):
+        """매칭 전 전처리 모드 변경 (프레임 변환은 모든 아이콘이 공유)"""
+        for detector in self.detectors.values():
+            detector.set_preprocess(mode)
+        self.preprocess = mode
+    
+    def set_search_mode(self, mode: str):
+        """스케일 검색 모드 변경"""
+        for detector in self.detectors.values():
+            detector.set_search_mode(mode)
+    
+    def set_roi_tracking(self, enabled: bool, padding: Optional[int] = None):
+        """위치 추적 모드 설정"""
+        for detector in self.detectors.values():
+            detector.set_roi_tracking(enabled, padding)
+    
+    def set_prefilter(self, enabled: bool, factor: Optional[float] = None, candidates: Optional[int] = None):
+        """축소 프레임 사전 검색 설정 (큰 영역용 2단계 매칭)"""
+        for detector in self.detectors.values():
+            detector.set_prefilter(enabled, factor, candidates)
+    
+    def set_frame_gate(self, enabled: bool, threshold: Optional[float] = None):
+        """화면 변화 감지(프레임 게이트) 설정"""
+        self.gate.configure(enabled, threshold)
+    
+    def reset_frame_gate(self):
+        """비교용 이전 화면과 건너뛰기 통계 초기화"""
+        self.gate.reset()
+    
+    def set_source(self, source: FrameSource):
+        """프레임 소스 변경 (화면 캡처 대신 녹화 파일 등)"""
+        self.source.close()
+        self.source = source
+        self.gate.reset()
+    
+    def close(self):
+        """프레임 소스 닫기 (화면 캡처 도구는 다음 캡처 때 다시 생성)"""
+        self.source.close()
+    
+    # ========== 감지 ==========
+    
+    def detect(self) -> Dict[str, IconResult]:
+        """
+        화면을 한 번 캡처해서 모든 아이콘 감지
+        
+        Returns:
+            아이콘 이름 -> 결과 (일시정지 중인 아이콘은 빠짐)
+        """
+        start = capture_clock()
+        frame = self.source.grab(self.detection_region)
+        captured = capture_clock()
+        self.stats.record("capture", captured - start)
+        self.last_timings = {"capture": captured - start}
+        # 화면을 복사한 순간은 grab 호출 안 어딘가 -> 중간으로 추정
+        self.last_capture_time = (start + captured) / 2
+        if frame is None:
+            raise EOFError("프레임 소스에 더 이상 프레임이 없습니다")
+        
+        return self.process_frame(frame)
+    
+    def process_frame(self, frame: np.ndarray) -> Dict[str, IconResult]:
+        """
+        캡처한 프레임 하나로 모든 아이콘 감지 (전처리는 한 번만)
+        
+        Args:
+            frame: BGRA / BGR / 그레이스케일 프레임
+        
+        Returns:
+            아이콘 이름 -> 결과 (일시정지 중인 아이콘은 빠짐)
+        """
+        start = time.perf_counter()
+        now = capture_clock()
+        active = [name for name in self.detectors if self._paused_until.get(name, 0.0) <= now]
+        
+        # 직전에 매칭한 화면과 거의 같으면 결과 재사용
+        if not self.gate.changed(frame):
+            results = {}
+            for name in active:
+                last = self.last_results.get(name)
+                if last is not None:
+                    threshold = self.detectors[name].threshold
+                    results[name] = IconResult(last.value >= threshold, last.value, last.scale, last.location,
+                                               threshold, reused=True)
+            self._finish_tick(start)
+            return results
+        
+        # 전처리는 한 번만 (재사용 버퍼에)
+        if frame.ndim == 3 or self.preprocess == PREPROCESS_EDGE:
+            convert_start = time.perf_counter()
+            frame = preprocess_frame(frame, self.preprocess, self.buffers)
+            convert = time.perf_counter() - convert_start
+            self.stats.record("convert", convert)
+            self.last_timings["convert"] = convert
+        
+        results = {}
+        for name in active:
+            detector = self.detectors[name]
+            detected = detector.match_frame(frame)
+            results[name] = IconResult(
+                detected,
+                detector.get_last_match_value(),
+                detector.last_result.scale,
+                detector.get_last_location(),
+                detector.threshold,
+            )
+        self.last_results.update(results)
+        
+        self._finish_tick(start)
+        return results
+    
+    def _finish_tick(self, start: float):
+        """한 틱 처리 시간 기록"""
+        tick = time.perf_counter() - start
+        self.stats.record("tick", tick)
+        self.last_timings["tick"] = tick
+    
+    # ========== 통계 ==========
+    
+    def get_gate_stats(self) -> dict:
+        """프레임 게이트 통계 (전체 틱 / 건너뛴 틱 / 건너뛴 비율)"""
+        return self.gate.get_stats()
+    
+    def get_roi_stats(self) -> Dict[str, dict]:
+        """아이콘별 위치 추적 통계"""
+        return {name: d.get_roi_stats() for name, d in self.detectors.items()}
+    
+    def get_prefilter_stats(self) -> Dict[str, dict]:
+        """아이콘별 사전 검색 통계"""
+        return {name: d.get_prefilter_stats() for name, d in self.detectors.items()}
+    
+    def get_latency_stats(self) -> dict:
+        """단계별 지연 시간 요약 (capture, convert, 아이콘:match@스케일, tick)"""
+        return self.stats.summary()
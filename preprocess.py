@@ -0,0 +1,65 @@
+from typing import Optional  # 타입 힌트용
+
+import cv2          # 이미지 처리 라이브러리
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+from buffer_pool import BufferPool  # 틱마다 재사용하는 버퍼
+
+# 매칭 전 전처리 모드
+PREPROCESS_GRAY = "gray"    # 그레이스케일 (OpenCV 정수 휘도 변환)
+PREPROCESS_BLUE = "blue"    # 파랑 채널만
+PREPROCESS_GREEN = "green"  # 초록 채널만
+PREPROCESS_RED = "red"      # 빨강 채널만
+PREPROCESS_EDGE = "edge"    # 그레이스케일 윤곽 (모폴로지 그라디언트)
+PREPROCESS_MODES = (PREPROCESS_GRAY, PREPROCESS_BLUE, PREPROCESS_GREEN, PREPROCESS_RED, PREPROCESS_EDGE)
+
+# 채널 모드 -> BGR(A) 채널 번호
+CHANNEL_INDEX = {PREPROCESS_BLUE: 0, PREPROCESS_GREEN: 1, PREPROCESS_RED: 2}
+
+# 윤곽 모드에서 쓰는 커널 (3x3)
+EDGE_KERNEL = np.ones((3, 3), dtype=np.uint8)
+
+
+def to_gray(frame: np.ndarray, buffers: Optional[BufferPool] = None) -> np.ndarray:
+    """
+    BGRA / BGR 프레임을 그레이스케일로 변환 (이미 그레이스케일이면 그대로)
+    
+    Args:
+        frame: 캡처한 프레임
+        buffers: 주면 결과를 재사용 버퍼에 씀 (다음 변환 때 덮어써짐)
+    """
+    if frame.ndim != 3:
+        return frame
+    code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    if buffers is None:
+        return cv2.cvtColor(frame, code)
+    return cv2.cvtColor(frame, code, dst=buffers.get("gray", frame.shape[:2]))
+
+
+def preprocess_frame(frame: np.ndarray, mode: str, buffers: Optional[BufferPool] = None) -> np.ndarray:
+    """
+    매칭에 쓸 단일 채널 이미지 만들기 (템플릿 뱅크도 같은 함수로 처리)
+    
+    그레이스케일 입력(녹화 파일 등)은 채널 모드여도 그대로 쓴다.
+    
+    Args:
+        frame: BGRA / BGR / 그레이스케일 프레임
+        mode: PREPROCESS_MODES 중 하나
+        buffers: 주면 결과를 재사용 버퍼에 씀
+    
+    Returns:
+        uint8 단일 채널 이미지
+    """
+    if mode in CHANNEL_INDEX:
+        if frame.ndim != 3:
+            return frame
+        if buffers is None:
+            return cv2.extractChannel(frame, CHANNEL_INDEX[mode])
+        return cv2.extractChannel(frame, CHANNEL_INDEX[mode], dst=buffers.get("channel", frame.shape[:2]))
+    
+    gray = to_gray(frame, buffers)
+    if mode == PREPROCESS_EDGE:
+        if buffers is None:
+            return cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, EDGE_KERNEL)
+        return cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, EDGE_KERNEL, dst=buffers.get("edge", gray.shape))
+    return gray
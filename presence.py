@@ -0,0 +1,152 @@
+from typing import List, Optional, Tuple  # 타입 힌트용
+
+# 아이콘 표시 상태
+ABSENT = "absent"              # 안 보임
+APPEARING = "appearing"        # 보이기 시작 (확인 중)
+PRESENT = "present"            # 보임
+DISAPPEARING = "disappearing"  # 사라지기 시작 (확인 중)
+
+# 상태가 바뀔 때 update()가 돌려주는 이벤트
+EVENT_APPEARED = "appeared"        # 안 보임 -> 보임 (스킬 발동)
+EVENT_DISAPPEARED = "disappeared"  # 보임 -> 안 보임 (버프 끝)
+
+
+class PresenceTracker:
+    """
+    매칭 값으로 아이콘이 보이는지 판단하는 상태 기계 (히스테리시스 + N-of-M 확인)
+    
+    들어가는 기준(enter)과 나가는 기준(exit)을 따로 두어 기준값 근처에서 값이
+    흔들려도 상태가 왔다 갔다 하지 않는다. 상태를 바꾸기 전에 최근 M프레임 중
+    N프레임 이상 확인해야 하므로 잡음 한 프레임으로는 발동하지 않고,
+    계속 떠 있는 아이콘은 사라졌다가 다시 나타나기 전까지 다시 발동하지 않는다.
+        
+        ABSENT --(enter 이상)--> APPEARING --(M 중 N 확인)--> PRESENT  [appeared]
+        PRESENT --(exit 미만)--> DISAPPEARING --(M 중 N 확인)--> ABSENT  [disappeared]
+    """
+    
+    def __init__(self, enter_threshold: float, exit_threshold: Optional[float] = None,
+                 confirm_frames: int = 2, window_frames: int = 3):
+        """
+        Args:
+            enter_threshold: 보인다고 볼 매칭 값 (아이콘 매칭 기준값)
+            exit_threshold: 보이던 아이콘이 사라졌다고 볼 매칭 값 (None이면 enter와 같음)
+            confirm_frames: 상태를 바꾸는 데 필요한 프레임 수 (N)
+            window_frames: 확인할 최근 프레임 수 (M)
+        """
+        self.set_thresholds(enter_threshold, exit_threshold)
+        self.set_confirmation(confirm_frames, window_frames)
+        self.reset()
+    
+    def set_thresholds(self, enter_threshold: float, exit_threshold: Optional[float] = None):
+        """들어가는 / 나가는 기준 변경 (exit는 enter보다 클 수 없음)"""
+        if exit_threshold is None:
+            exit_threshold = enter_threshold
+        if exit_threshold > enter_threshold:
+            raise ValueError(f"나가는 기준({exit_threshold})이 들어가는 기준({enter_threshold})보다 큽니다")
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+    
+    def set_confirmation(self, confirm_frames: int, window_frames: int):
+        """N-of-M 확인 프레임 수 변경"""
+        if not 1 <= confirm_frames <= window_frames:
+            raise ValueError(f"확인 프레임 수가 잘못되었습니다: {confirm_frames} / {window_frames}")
+        self.confirm_frames = confirm_frames
+        self.window_frames = window_frames
+    
+    def reset(self):
+        """안 보이는 상태로 초기화"""
+        self.state = ABSENT
+        self.changed_at = 0.0     # 지금 상태가 된 시각
+        self.first_hit_at: Optional[float] = None  # 마지막으로 보이기 시작한 프레임 시각
+        self.last_miss_at: Optional[float] = None  # 그 직전에 안 보였던 프레임 시각 (None이면 모름)
+        self._matched_at: Optional[float] = None   # 실제로 매칭한 마지막 프레임 시각 (재사용한 프레임 제외)
+        self._miss_at: Optional[float] = None      # 기준 미만이었던 마지막 프레임 시각 (재사용한 프레임 포함)
+        self._window: List[bool] = []  # 확인 중인 프레임들 (True = 지금 상태와 반대)
+    
+    def is_visible(self) -> bool:
+        """보이는 상태인지 (사라지는 중이어도 아직 확정 전이면 보이는 것)"""
+        return self.state in (PRESENT, DISAPPEARING)
+    
+    def appearance(self) -> Tuple[float, Optional[float]]:
+        """
+        아이콘이 실제로 나타난 시각 추정
+        
+        마지막으로 안 보였던 프레임과 처음 보인 프레임 사이 어딘가에서 나타났으므로
+        그 중간을 쓰고, 최대 오차는 두 프레임 간격의 절반이다.
+        
+        Returns:
+            (추정 시각, 최대 오차 초) - 안 보였던 프레임이 없으면 (처음 보인 시각, None)
+        """
+        if self.last_miss_at is None:
+            return self.first_hit_at, None
+        return (self.last_miss_at + self.first_hit_at) / 2, (self.first_hit_at - self.last_miss_at) / 2
+    
+    def update(self, value: float, timestamp: float, reused: bool = False) -> Optional[str]:
+        """
+        한 프레임의 매칭 값 반영
+        
+        Args:
+            value: 매칭 값
+            timestamp: 프레임 캡처 시각
+            reused: 화면 변화가 없어 직전 프레임의 매칭 값을 재사용했는지
+                (화면이 그대로라 기준 미만이면 이 시각에도 안 보인 것으로 보지만,
+                처음 보인 시각은 실제로 매칭한 프레임으로만 정함)
+        
+        Returns:
+            상태가 확정되어 바뀌면 EVENT_APPEARED / EVENT_DISAPPEARED, 아니면 None
+        """
+        if not reused or self._matched_at is None:
+            self._matched_at = timestamp
+        if value < self.enter_threshold:
+            self._miss_at = timestamp
+        
+        if self.state == ABSENT:
+            if value >= self.enter_threshold:
+                self.first_hit_at = self._matched_at
+                self._begin(APPEARING, timestamp)
+                return self._confirm(True, timestamp)
+            self.last_miss_at = self._miss_at
+            return None
+        
+        if self.state == PRESENT:
+            if value < self.exit_threshold:
+                self._begin(DISAPPEARING, timestamp)
+                return self._confirm(True, timestamp)
+            return None
+        
+        # 확인 중: 보이는지는 상태에 맞는 기준으로
+        if self.state == APPEARING:
+            flipped = value >= self.enter_threshold
+        else:
+            flipped = value < self.exit_threshold
+        return self._confirm(flipped, timestamp)
+    
+    def _begin(self, state: str, timestamp: float):
+        """확인 상태로 들어가기"""
+        self.state = state
+        self.changed_at = timestamp
+        self._window = []
+    
+    def _confirm(self, flipped: bool, timestamp: float) -> Optional[str]:
+        """확인 중인 프레임 추가 후 N-of-M이 채워지면 상태 확정"""
+        self._window.append(flipped)
+        if sum(self._window) >= self.confirm_frames:
+            appeared = self.state == APPEARING
+            self.state = PRESENT if appeared else ABSENT
+            self.changed_at = timestamp
+            self._window = []
+            if not appeared:
+                self.last_miss_at = self._miss_at
+            return EVENT_APPEARED if appeared else EVENT_DISAPPEARED
+        
+        # M프레임 안에 확인 못 하면 원래 상태로
+        if len(self._window) >= self.window_frames:
+            if self.state == APPEARING:
+                self.state = ABSENT
+                if not flipped:
+                    self.last_miss_at = self._miss_at
+            else:
+                self.state = PRESENT
+            self.changed_at = timestamp
+            self._window = []
+        return None
@@ -0,0 +1,313 @@
+import multiprocessing  # 영역별 감지 프로세스
+import queue  # 큐가 비었을 때 예외
+import time  # 틱당 CPU 시간 측정용
+from dataclasses import dataclass  # 영역 설정 정의용
+from typing import Dict, List, Sequence, Tuple  # 타입 힌트용
+
+from detection_worker import DetectionResult  # 감지 결과
+from multi_detector import IconConfig, MultiIconDetector, configure_detector, icons_from_config  # 여러 아이콘 감지기
+from scheduler import TickScheduler, capture_clock  # 마감 시각 기반 스케줄러
+
+# 영역별 통계(감지 주기, 틱 지연 시간)를 보내는 간격 (초)
+STATS_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class RegionSpec:
+    """프로세스 하나가 맡는 감지 영역"""
+    name: str                      # 영역 이름 (예: "1번 클라이언트")
+    region: Tuple[int, int, int, int]  # (x, y, width, height)
+    icons: Tuple[IconConfig, ...]  # 이 영역에서 찾을 아이콘들 (이름은 "영역/아이콘")
+
+
+def regions_from_config(config: dict) -> List[RegionSpec]:
+    """
+    설정의 "regions" 목록으로 영역 설정 만들기 (비어 있으면 빈 목록 = 단일 영역 모드)
+    
+    영역마다 "icons"를 따로 줄 수 있고, 없으면 전체 "icons" 설정을 쓴다.
+    아이콘 이름은 영역끼리 겹치지 않도록 "영역/아이콘"으로 바꾼다.
+    """
+    specs = []
+    for item in config.get("regions") or []:
+        icons = icons_from_config({**config, "icons": item.get("icons") or config.get("icons")})
+        specs.append(RegionSpec(
+            name=item["name"],
+            region=(item["x"], item["y"], item["width"], item["height"]),
+            icons=tuple(IconConfig(f"{item['name']}/{icon.name}", icon.path, icon.threshold,
+                                   icon.cooldown, icon.scales) for icon in icons),
+        ))
+    return specs
+
+
+def _post(results, message):
+    """결과 큐에 넣기 (가득 차면 가장 오래된 것 버림)"""
+    while True:
+        try:
+            results.put_nowait(message)
+            return
+        except queue.Full:
+            try:
+                results.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _region_stats(detector: MultiIconDetector, scheduler: TickScheduler) -> dict:
+    """감지 프로세스가 보내는 통계 (감지 주기, 틱 지연, 단계별 지연, 매칭 생략, 위치 추적, 사전 검색, 기준값 제안)"""
+    return {
+        "scheduler": scheduler.get_stats(),
+        "tick": detector.stats.get("tick"),
+        "stages": detector.get_latency_stats(),
+        "frame_gate": detector.get_gate_stats(),
+        "roi": detector.get_roi_stats(),
+        "prefilter": detector.get_prefilter_stats(),
+        "thresholds": detector.get_threshold_stats(),
+    }
+
+
+def _region_worker(spec: RegionSpec, config: dict, interval_ms: int, results, commands):
+    """
+    감지 프로세스 본체 (영역 하나, 캡처 도구는 이 프로세스에서 생성)
+    
+    명령 큐로 ("stop",), ("interval", ms), ("pause", 시각), ("pause_icon", 이름, 시각),
+    ("threshold", 기준값), ("resume",)을 받고, 결과 큐로 ("result", DetectionResult)와 ("stats", 영역, 통계)를 보낸다.
+    """
+    detector = MultiIconDetector(spec.icons)
+    configure_detector(detector, config)
+    detector.set_region(*spec.region)
+    
+    scheduler = TickScheduler(interval_ms, clock=capture_clock)
+    paused_until = 0.0
+    stats_sent_at = 0.0
+    try:
+        while True:
+            # 다음 마감 시각(쉬는 중이면 쉬는 시간 끝)까지 명령을 기다림
+            paused = paused_until - capture_clock()
+            try:
+                command = commands.get(timeout=paused if paused > 0 else scheduler.delay())
+            except queue.Empty:
+                command = None
+            
+            if command is not None:
+                kind = command[0]
+                if kind == "stop":
+                    # 끝나기 전에 마지막 통계를 보내서 세션 요약에 남김
+                    _post(results, ("stats", spec.name, _region_stats(detector, scheduler)))
+                    break
+                if kind == "interval":
+                    scheduler.set_interval(command[1])
+                elif kind == "pause":
+                    paused_until = command[1] if command[1] > capture_clock() else 0.0
+                elif kind == "pause_icon":
+                    detector.pause_icon(command[1], command[2])
+                elif kind == "threshold":
+                    detector.set_threshold(command[1])
+                elif kind == "resume":
+                    detector.resume_all()
+                    detector.reset_frame_gate()
+                continue
+            
+            # 쉬는 시간이 막 끝났으면 마감 시각 다시 맞추기
+            if paused_until:
+                if paused_until > capture_clock():
+                    continue
+                paused_until = 0.0
+                scheduler.resync()
+                continue
+            
+            scheduler.tick()
+            cpu_start = time.thread_time()
+            try:
+                icons = detector.detect()
+            except Exception as e:
+                _post(results, ("result", DetectionResult(capture_clock(), {}, error=str(e), region=spec.name)))
+                break
+            captured = detector.last_capture_time
+            _post(results, ("result", DetectionResult(captured, icons, region=spec.name,
+                                                      timings=detector.last_timings,
+                                                      cpu=time.thread_time() - cpu_start)))
+            
+            if captured - stats_sent_at >= STATS_INTERVAL:
+                stats_sent_at = captured
+                _post(results, ("stats", spec.name, _region_stats(detector, scheduler)))
+    finally:
+        detector.close()
+
+
+class DetectionPool:
+    """
+    감지 영역마다 프로세스를 하나씩 두는 작업자 (여러 모니터 / 여러 게임 창)
+    
+    각 프로세스가 자기 캡처 도구와 감지기를 갖고 따로 돌기 때문에 영역이 늘어도
+    GIL 하나에 묶이지 않는다. 결과는 프로세스 큐 하나로 모이고, Tk 쪽은
+    DetectionWorker와 똑같이 drain()으로 꺼내 쓴다.
+    """
+    
+    def __init__(self, regions: Sequence[RegionSpec], config: dict, interval_ms: int, max_results: int = 64):
+        """
+        작업자 초기화
+        
+        Args:
+            regions: 감지 영역 목록 (영역마다 프로세스 하나)
+            config: 감지 모드 설정 (config.json 내용)
+            interval_ms: 감지 주기 (ms)
+            max_results: 결과 큐에 쌓아둘 최대 개수
+        """
+        self.regions = list(regions)
+        self.config = dict(config)
+        self.interval_ms = interval_ms
+        self.max_results = max_results
+        
+        # 플랫폼과 상관없이 같은 방식 (Windows 기본값인 spawn)
+        self._context = multiprocessing.get_context("spawn")
+        self._results = None
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._commands: Dict[str, object] = {}
+        
+        # 아이콘 이름 -> 영역 이름
+        self._icon_regions = {icon.name: spec.name for spec in self.regions for icon in spec.icons}
+        
+        # 영역 이름 -> 마지막으로 받은 통계
+        self.region_stats: Dict[str, dict] = {}
+        self._paused_until = 0.0
+    
+    def names(self) -> List[str]:
+        """모든 영역의 아이콘 이름 (영역 순서대로)"""
+        return list(self._icon_regions)
+    
+    def thresholds(self) -> Dict[str, float]:
+        """아이콘 이름 -> 매칭 기준값"""
+        return {icon.name: icon.threshold for spec in self.regions for icon in spec.icons}
+    
+    def start(self):
+        """영역별 감지 프로세스 시작"""
+        if self.is_alive():
+            return
+        self.stop()
+        self._results = self._context.Queue(self.max_results)
+        for spec in self.regions:
+            commands = self._context.Queue()
+            process = self._context.Process(
+                target=_region_worker,
+                args=(spec, self.config, self.interval_ms, self._results, commands),
+                name=f"Detection-{spec.name}",
+                daemon=True,
+            )
+            process.start()
+            self._processes[spec.name] = process
+            self._commands[spec.name] = commands
+    
+    def stop(self, timeout: float = 1.0):
+        """모든 감지 프로세스 정지 (시간 안에 안 끝나면 강제 종료, 마지막 통계는 region_stats에)"""
+        self._broadcast(("stop",))
+        for process in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.drain()
+        self._processes = {}
+        self._commands = {}
+        self._paused_until = 0.0
+    
+    def is_alive(self) -> bool:
+        """돌고 있는 감지 프로세스가 있는지"""
+        return any(process.is_alive() for process in self._processes.values())
+    
+    def set_interval(self, interval_ms: int):
+        """감지 주기 변경 (ms)"""
+        self.interval_ms = interval_ms
+        self._broadcast(("interval", interval_ms))
+    
+    def pause_until(self, timestamp: float):
+        """지정한 시각(capture_clock)까지 모든 영역 감지 쉬기"""
+        # 같은 값을 매번 보내지 않도록 바뀔 때만 전달
+        if timestamp == self._paused_until:
+            return
+        self._paused_until = timestamp
+        self._broadcast(("pause", timestamp))
+    
+    def pause_icon(self, name: str, timestamp: float):
+        """지정한 시각(capture_clock)까지 해당 아이콘만 매칭하지 않음"""
+        commands = self._commands.get(self._icon_regions.get(name))
+        if commands is not None:
+            commands.put(("pause_icon", name, timestamp))
+    
+    def set_threshold(self, threshold: float):
+        """모든 영역, 모든 아이콘의 매칭 기준값 변경"""
+        self.regions = [
+            RegionSpec(spec.name, spec.region, tuple(
+                IconConfig(icon.name, icon.path, threshold, icon.cooldown, icon.scales) for icon in spec.icons
+            ))
+            for spec in self.regions
+        ]
+        self._broadcast(("threshold", threshold))
+    
+    def resume_all(self):
+        """모든 아이콘 일시정지 해제 + 비교용 이전 화면 초기화"""
+        self._broadcast(("resume",))
+    
+    def drain(self) -> List[DetectionResult]:
+        """쌓인 결과를 모두 꺼내기 (통계 메시지는 region_stats에 저장)"""
+        results = []
+        if self._results is None:
+            return results
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                return results
+            if message[0] == "stats":
+                self.region_stats[message[1]] = message[2]
+            else:
+                results.append(message[1])
+    
+    def get_scheduler_stats(self) -> dict:
+        """영역별 감지 주기 통계를 합친 것 (틱 / 건너뜀은 합, 지연은 평균 / 최대)"""
+        stats = [s["scheduler"] for s in self.region_stats.values()]
+        if not stats:
+            return TickScheduler(self.interval_ms).get_stats()
+        return {
+            "ticks": sum(s["ticks"] for s in stats),
+            "dropped": sum(s["dropped"] for s in stats),
+            "overruns": sum(s["overruns"] for s in stats),
+            "jitter_mean_ms": sum(s["jitter_mean_ms"] for s in stats) / len(stats),
+            "jitter_max_ms": max(s["jitter_max_ms"] for s in stats),
+        }
+    
+    def get_tick_latency(self) -> dict:
+        """가장 느린 영역의 감지 한 틱 지연 시간 요약"""
+        ticks = [s["tick"] for s in self.region_stats.values()]
+        if not ticks:
+            return {"count": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return max(ticks, key=lambda tick: tick["p99_ms"])
+    
+    def get_threshold_stats(self) -> Dict[str, dict]:
+        """모든 영역의 아이콘별 기준값 제안 통계 (마지막으로 받은 것)"""
+        return {name: stats for s in self.region_stats.values() for name, stats in s["thresholds"].items()}
+    
+    def get_gate_stats(self) -> dict:
+        """모든 영역의 프레임 게이트 통계를 합친 것"""
+        ticks = sum(s["frame_gate"]["ticks"] for s in self.region_stats.values())
+        skipped = sum(s["frame_gate"]["skipped"] for s in self.region_stats.values())
+        return {"ticks": ticks, "skipped": skipped, "skip_ratio": skipped / ticks if ticks else 0.0}
+    
+    def get_roi_stats(self) -> Dict[str, dict]:
+        """모든 영역의 아이콘별 위치 추적 통계"""
+        return {name: stats for s in self.region_stats.values() for name, stats in s["roi"].items()}
+    
+    def get_prefilter_stats(self) -> Dict[str, dict]:
+        """모든 영역의 아이콘별 사전 검색 통계"""
+        return {name: stats for s in self.region_stats.values() for name, stats in s["prefilter"].items()}
+    
+    def get_latency_stats(self) -> dict:
+        """영역별 단계별 지연 시간 요약 ("영역/단계" -> 요약)"""
+        return {
+            f"{region}/{stage}": summary
+            for region, s in self.region_stats.items()
+            for stage, summary in s["stages"].items()
+        }
+    
+    def _broadcast(self, command: tuple):
+        """모든 프로세스에 명령 보내기"""
+        for commands in self._commands.values():
+            commands.put(command)
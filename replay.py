@@ -0,0 +1,112 @@
+import argparse  # 명령줄 인자 처리용
+import time  # 시간 측정용
+
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+from detector import OneShotDetector, SEARCH_MODES  # 아이콘 감지기
+from preprocess import PREPROCESS_MODES  # 매칭 전 전처리
+from presence import PresenceTracker, EVENT_APPEARED, EVENT_DISAPPEARED  # 아이콘 표시 상태 기계
+from frame_source import open_recording  # 녹화 프레임 소스
+from config import load_config  # 설정 관리
+
+
+def parse_args():
+    """명령줄 인자 읽기"""
+    config = load_config()
+    parser = argparse.ArgumentParser(description="녹화된 프레임으로 감지기를 화면 없이 재생")
+    parser.add_argument("recording", help="이미지 폴더, .npy 프레임 스택, 또는 동영상 파일")
+    parser.add_argument("--icon", default="assets/oneshot_icon.png", help="아이콘 이미지 경로")
+    parser.add_argument("--threshold", type=float, default=config["detection_threshold"],
+                        help="매칭 정확도 기준")
+    parser.add_argument("--scale-search", choices=SEARCH_MODES, default=config["scale_search"],
+                        help="스케일 검색 모드")
+    parser.add_argument("--preprocess", choices=PREPROCESS_MODES, default=config["preprocess"],
+                        help="매칭 전 전처리")
+    parser.add_argument("--prefilter", action=argparse.BooleanOptionalAction, default=config["prefilter"],
+                        help="큰 영역은 축소 화면에서 후보를 먼저 찾기")
+    parser.add_argument("--prefilter-factor", type=float, default=config["prefilter_factor"],
+                        help="사전 검색 축소 비율")
+    parser.add_argument("--prefilter-candidates", type=int, default=config["prefilter_candidates"],
+                        help="원본 해상도로 확인할 후보 수")
+    parser.add_argument("--roi", action=argparse.BooleanOptionalAction, default=config["roi_tracking"],
+                        help="위치 추적 사용")
+    parser.add_argument("--gate", action=argparse.BooleanOptionalAction, default=config["frame_gate"],
+                        help="화면 변화 없으면 매칭 생략")
+    parser.add_argument("--confirm-frames", type=int, default=config["presence_confirm_frames"],
+                        help="나타남 / 사라짐 확정에 필요한 프레임 수")
+    parser.add_argument("--window-frames", type=int, default=config["presence_window_frames"],
+                        help="확인할 최근 프레임 수")
+    parser.add_argument("--exit-margin", type=float, default=config["presence_exit_margin"],
+                        help="사라짐 기준 (매칭 기준값 - 이 값)")
+    parser.add_argument("--quiet", action="store_true", help="프레임별 출력 생략")
+    return parser.parse_args()
+
+
+def main():
+    """녹화 재생 후 결과 요약 출력"""
+    args = parse_args()
+    
+    detector = OneShotDetector(args.icon, threshold=args.threshold)
+    detector.debug = False
+    detector.set_preprocess(args.preprocess)
+    detector.set_search_mode(args.scale_search)
+    detector.set_prefilter(args.prefilter, args.prefilter_factor, args.prefilter_candidates)
+    detector.set_roi_tracking(args.roi)
+    detector.set_frame_gate(args.gate)
+    
+    tracker = PresenceTracker(args.threshold, args.threshold - args.exit_margin,
+                              args.confirm_frames, args.window_frames)
+    
+    source = open_recording(args.recording)
+    latencies = []
+    hits = 0
+    triggers = 0
+    
+    started = time.perf_counter()
+    try:
+        for index, frame in enumerate(source):
+            tick_start = time.perf_counter()
+            detected = detector.process_frame(frame)
+            latency_ms = (time.perf_counter() - tick_start) * 1000
+            
+            latencies.append(latency_ms)
+            hits += detected
+            event = tracker.update(detector.get_last_match_value(), index, detector.last_reused)
+            triggers += event == EVENT_APPEARED
+            if not args.quiet:
+                result = detector.last_result
+                mark = "HIT" if detected else "   "
+                if event == EVENT_APPEARED:
+                    mark += " 발동"
+                elif event == EVENT_DISAPPEARED:
+                    mark += " 사라짐"
+                print(f"{index:>6} | {detector.get_last_match_value():.3f} | 스케일 {result.scale:.1f}"
+                      f" | {latency_ms:7.2f}ms | {mark}")
+    finally:
+        source.close()
+    total = time.perf_counter() - started
+    
+    # ========== 요약 ==========
+    frames = len(latencies)
+    if frames == 0:
+        print("프레임이 없습니다")
+        return
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    gate = detector.get_gate_stats()
+    print("=" * 50)
+    print(f"프레임: {frames} / 감지: {hits} / 발동: {triggers}회")
+    print(f"처리 속도: {frames / total:.1f} fps")
+    print(f"지연: p50 {p50:.2f}ms / p90 {p90:.2f}ms / p99 {p99:.2f}ms / 최대 {max(latencies):.2f}ms")
+    print(f"매칭 생략: {gate['skipped']}/{gate['ticks']}틱 ({gate['skip_ratio'] * 100:.1f}%)")
+    tuning = detector.get_threshold_stats()
+    if tuning["suggestion"] is not None:
+        print(f"기준값 제안: {args.threshold:.2f} -> {tuning['suggestion']:.2f}"
+              f" (배경 ~{tuning['background_high']:.2f} / 아이콘 {tuning['hit_low']:.2f}~)")
+    prefilter = detector.get_prefilter_stats()
+    if prefilter["ticks"]:
+        print(f"사전 검색: {prefilter['ticks']}틱 / 평균 후보 {prefilter['candidates_mean']:.1f}개"
+              f" / 1단계 p50 {prefilter['prefilter']['p50_ms']:.2f}ms / 2단계 p50 {prefilter['confirm']['p50_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time  # 단조 시계
+from typing import Callable  # 타입 힌트용
+
+
+def capture_clock() -> float:
+    """
+    캡처 시각용 단조 시계 (초)
+    
+    감지 결과 시각, 일시정지 시각, 타이머 시작 시각은 모두 이 시계를 쓴다.
+    시스템 시간 변경에 영향을 받지 않고, Windows에서도 해상도가 1ms보다 훨씬 좋으며
+    (time.monotonic은 약 15ms), 감지 프로세스끼리도 같은 기준이다.
+    """
+    return time.perf_counter()
+
+
+class TickScheduler:
+    """
+    단조 시계 기준의 절대 마감 시각에 맞춰 틱을 내는 스케줄러
+    
+    "작업 후 interval만큼 대기" 방식은 실제 주기가 interval + 작업 시간이 되어
+    부하가 걸리면 점점 밀린다. 이 스케줄러는 마감 시각을 interval 간격으로 고정해 두고
+    남은 시간만큼만 기다린다. 한 주기 이상 늦으면 밀린 틱을 몰아서 실행하지 않고
+    버린 뒤 다음 마감 시각으로 건너뛴다.
+    """
+    
+    def __init__(self, interval_ms: float, clock: Callable[[], float] = capture_clock):
+        """
+        스케줄러 초기화
+        
+        Args:
+            interval_ms: 틱 주기 (ms)
+            clock: 현재 시각 함수 (초 단위, 단조 증가, 기본은 capture_clock)
+        """
+        self.interval = max(1.0, interval_ms) / 1000
+        self.clock = clock
+        self.reset()
+    
+    def set_interval(self, interval_ms: float):
+        """틱 주기 변경 (다음 틱부터 적용)"""
+        self.interval = max(1.0, interval_ms) / 1000
+    
+    def reset(self):
+        """마감 시각과 통계 초기화 (첫 틱은 바로)"""
+        self.next_deadline = self.clock()
+        self.ticks = 0
+        self.dropped = 0       # 늦어서 건너뛴 틱 수
+        self.overruns = 0      # 한 주기 이상 늦은 횟수
+        self._jitter_sum = 0.0
+        self._jitter_max = 0.0
+    
+    def resync(self):
+        """통계는 유지하고 다음 틱을 지금으로 맞추기 (일부러 쉰 뒤 재개할 때)"""
+        self.next_deadline = self.clock()
+    
+    def delay(self) -> float:
+        """다음 마감 시각까지 남은 시간 (초, 0 이상)"""
+        return max(0.0, self.next_deadline - self.clock())
+    
+    def delay_ms(self) -> int:
+        """다음 마감 시각까지 남은 시간 (ms, root.after용)"""
+        return int(self.delay() * 1000)
+    
+    def tick(self) -> float:
+        """
+        틱 시작 시 호출 - 지연 기록 후 다음 마감 시각 계산
+        
+        Returns:
+            현재 시각 (clock 기준)
+        """
+        now = self.clock()
+        late = max(0.0, now - self.next_deadline)
+        
+        self.ticks += 1
+        self._jitter_sum += late
+        self._jitter_max = max(self._jitter_max, late)
+        
+        # 다음 마감 시각이 이미 지났으면 밀린 틱은 몰아서 실행하지 않고 버림
+        self.next_deadline += self.interval
+        if self.next_deadline <= now:
+            missed = int((now - self.next_deadline) // self.interval) + 1
+            self.next_deadline += self.interval * missed
+            if self.next_deadline <= now:  # 부동소수점 오차 보정
+                missed += 1
+                self.next_deadline += self.interval
+            self.overruns += 1
+            self.dropped += missed
+        
+        return now
+    
+    def get_stats(self) -> dict:
+        """지연/건너뜀 통계"""
+        mean = self._jitter_sum / self.ticks if self.ticks else 0.0
+        return {
+            "ticks": self.ticks,
+            "dropped": self.dropped,
+            "overruns": self.overruns,
+            "jitter_mean_ms": mean * 1000,
+            "jitter_max_ms": self._jitter_max * 1000,
+        }
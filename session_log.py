@@ -0,0 +1,185 @@
+import json  # 기록 한 줄 인코딩용
+import queue  # 감지 루프 -> 기록 스레드 전달용
+import threading  # 백그라운드 기록 스레드
+import time  # 파일 이름 / 벽시계 시각용
+from pathlib import Path  # 파일 경로 처리용
+from typing import Optional  # 타입 힌트용
+
+from scheduler import capture_clock  # 캡처 시각용 단조 시계
+
+# 기록 스레드가 버퍼를 파일로 내보내는 주기 (초)
+FLUSH_INTERVAL = 1.0
+
+# 기록 스레드가 밀렸을 때 쌓아둘 최대 기록 수 (넘치면 버리고 개수만 셈)
+DEFAULT_MAX_PENDING = 4096
+
+# 기록 종류 (각 줄의 "k" 값)
+RECORD_START = "start"          # 세션 시작 (설정, 기준값, 시계 기준점)
+RECORD_TICK = "tick"            # 감지 한 틱 (아이콘별 매칭 값 / 스케일 / 위치, 단계별 시간, CPU 시간)
+RECORD_TRIGGER = "trigger"      # 스킬 발동 (나타난 추정 시각, 오차, 처리 지연)
+RECORD_DISAPPEAR = "disappear"  # 버프 아이콘 사라짐
+RECORD_READY = "ready"          # 쿨타임 끝
+RECORD_THRESHOLD = "threshold"  # 감지 중 기준값 변경
+RECORD_SCAN = "scan"            # 적응형 스캔 주기 변경
+RECORD_ERROR = "error"          # 감지 오류
+RECORD_STOP = "stop"            # 세션 끝 (건너뛴 틱, 매칭 생략 등 요약)
+
+
+def _ms(seconds: float) -> float:
+    """초 -> ms (소수 셋째 자리까지)"""
+    return round(seconds * 1000, 3)
+
+
+def encode_tick(result) -> dict:
+    """DetectionResult 하나를 틱 기록으로 (아이콘마다 [매칭 값, 스케일, 위치], 오류면 오류 기록)"""
+    if result.error is not None:
+        return {"k": RECORD_ERROR, "ts": round(result.timestamp, 4), "message": result.error, "region": result.region}
+    record = {
+        "k": RECORD_TICK,
+        "ts": round(result.timestamp, 4),
+        "icons": {
+            name: [round(icon.value, 4), icon.scale, list(icon.location) if icon.location else None]
+            for name, icon in result.icons.items()
+        },
+        "ms": {stage: _ms(seconds) for stage, seconds in result.timings.items()},
+        "cpu": _ms(result.cpu),
+    }
+    if result.region:
+        record["region"] = result.region
+    if any(icon.reused for icon in result.icons.values()):
+        record["reused"] = True
+    return record
+
+
+class SessionLog:
+    """
+    감지 세션 기록 (JSON Lines, 한 줄에 기록 하나, 추가만 함)
+    
+    감지 루프는 기록할 객체를 큐에 넣기만 하고, 인코딩과 파일 쓰기는 기록 스레드가 한다.
+    파일은 FLUSH_INTERVAL마다 내보내므로 앱이 갑자기 꺼져도 그 직전까지는 남는다.
+    시각은 모두 capture_clock 기준이고, 시작 기록에 벽시계 시각을 함께 남긴다.
+    
+    기록은 analyze_sessions.py로 여러 세션을 모아 분석한다.
+    """
+    
+    def __init__(self, directory: str, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        기록 초기화 (파일은 기록 스레드에서 열림)
+        
+        Args:
+            directory: 기록 파일을 만들 폴더 (없으면 만듦)
+            max_pending: 기록 스레드가 밀렸을 때 쌓아둘 최대 기록 수
+        """
+        self.path = Path(directory) / time.strftime("session_%Y%m%d_%H%M%S.jsonl")
+        # 카운터는 스레드마다 따로 (한 카운터를 두 스레드가 고치지 않도록)
+        self.records = 0        # 큐에 넣은 기록 수 (기록을 넣는 스레드)
+        self.queue_dropped = 0  # 큐가 가득 차서 버린 기록 수 (기록을 넣는 스레드)
+        self.write_failed = 0   # 쓰지 못하고 버린 기록 수 (기록 스레드)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+    
+    def open(self, meta: dict):
+        """
+        기록 스레드 시작 + 시작 기록
+        
+        Args:
+            meta: 시작 기록에 함께 남길 값 (기준값, 확인 프레임 수 등)
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="SessionLog", daemon=True)
+        self._thread.start()
+        self.event(RECORD_START, wall=time.time(), **meta)
+    
+    def close(self, summary: Optional[dict] = None, timeout: float = 2.0):
+        """
+        끝 기록을 남기고 남은 기록을 모두 쓴 뒤 기록 스레드 정지 (최대 timeout초)
+        
+        쓰기 실패 수(write_failed)는 기록 스레드가 앞의 기록을 다 쓴 뒤 끝 기록에 채운다.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        if not thread.is_alive():
+            return
+        self.event(RECORD_STOP, queue_dropped=self.queue_dropped, **(summary or {}))
+        # 끝 표시는 버리면 안 되므로 자리가 날 때까지 기다림 (기록 스레드가 멈췄으면 포기)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            print("세션 기록 스레드가 응답하지 않아 남은 기록을 버립니다")
+            return
+        thread.join(timeout)
+    
+    # ========== 기록 ==========
+    
+    def tick(self, result):
+        """감지 결과 하나 기록 (인코딩은 기록 스레드에서)"""
+        self._put((RECORD_TICK, result))
+    
+    def event(self, kind: str, timestamp: Optional[float] = None, **fields):
+        """
+        이벤트 하나 기록
+        
+        Args:
+            kind: RECORD_* 중 하나
+            timestamp: 이벤트 시각 (capture_clock, None이면 지금)
+            fields: 함께 남길 값
+        """
+        record = {"k": kind, "ts": round(capture_clock() if timestamp is None else timestamp, 4)}
+        record.update(fields)
+        self._put((kind, record))
+    
+    def _put(self, item: tuple):
+        """큐에 넣기 (가득 차면 감지 루프를 막지 않고 버림)"""
+        try:
+            self._queue.put_nowait(item)
+            self.records += 1
+        except queue.Full:
+            self.queue_dropped += 1
+    
+    # ========== 기록 스레드 ==========
+    
+    def _run(self):
+        """기록 스레드 본체"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(self.path, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"세션 기록 파일을 열 수 없습니다: {e}")
+            self._discard()
+            return
+        
+        print(f"세션 기록: {self.path}")
+        flushed_at = time.monotonic()
+        with f:
+            while True:
+                try:
+                    item = self._queue.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = ()
+                if item is None:
+                    return
+                
+                try:
+                    if item:
+                        kind, payload = item
+                        record = encode_tick(payload) if kind == RECORD_TICK else payload
+                        if kind == RECORD_STOP:
+                            record["write_failed"] = self.write_failed
+                        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    
+                    if time.monotonic() - flushed_at >= FLUSH_INTERVAL:
+                        f.flush()
+                        flushed_at = time.monotonic()
+                except (OSError, TypeError, ValueError) as e:
+                    # 디스크가 가득 찼거나 인코딩할 수 없는 값: 기록 하나만 버리고 계속
+                    self.write_failed += 1
+                    if self.write_failed == 1:
+                        print(f"세션 기록 쓰기 실패: {e}")
+    
+    def _discard(self):
+        """파일을 못 열었을 때 끝 표시까지 큐 비우기 (close()가 막히지 않도록)"""
+        while self._queue.get() is not None:
+            self.write_failed += 1
@@ -0,0 +1,117 @@
+from dataclasses import dataclass  # 장면 설정 정의용
+from typing import List, Optional, Tuple  # 타입 힌트용
+
+import cv2          # 이미지 처리 라이브러리
+import numpy as np  # 숫자/배열 처리 라이브러리
+
+# 합성에 쓰는 아이콘 이미지들
+ICON_PATHS = ("assets/oneshot_icon.png", "assets/oneshot_icon2.png")
+
+
+@dataclass(frozen=True)
+class BuffBarScene:
+    """합성 버프창 하나의 설정"""
+    width: int = 400            # 영역 크기
+    height: int = 60
+    icon_size: int = 44         # 일격필살 아이콘 한 변 크기 (픽셀)
+    noise: float = 0.0          # 가우시안 노이즈 표준편차 (0~255)
+    brightness: float = 1.0     # 밝기 배율
+    distractors: int = 0        # 다른 버프 아이콘 개수
+    has_icon: bool = True       # 일격필살 아이콘 포함 여부
+    icon_index: int = 0         # 합성할 아이콘 (ICON_PATHS 순서)
+
+
+def load_icons() -> List[np.ndarray]:
+    """합성용 아이콘 이미지(BGR) 읽기"""
+    icons = []
+    for path in ICON_PATHS:
+        icon = cv2.imread(path, cv2.IMREAD_COLOR)
+        if icon is None:
+            raise FileNotFoundError(f"아이콘 이미지를 찾을 수 없습니다: {path}")
+        icons.append(icon)
+    return icons
+
+
+def make_distractor(size: int, rng: np.random.Generator) -> np.ndarray:
+    """일격필살이 아닌 가짜 버프 아이콘 (테두리 + 색 블록 무늬)"""
+    icon = np.empty((size, size, 3), dtype=np.uint8)
+    icon[:] = rng.integers(40, 200, size=3)
+    
+    # 안쪽에 무작위 색 블록 몇 개
+    for _ in range(rng.integers(2, 5)):
+        x0, y0 = rng.integers(0, size // 2, size=2)
+        x1, y1 = x0 + rng.integers(size // 4, size // 2, size=2)
+        cv2.rectangle(icon, (int(x0), int(y0)), (int(x1), int(y1)),
+                      [int(c) for c in rng.integers(0, 256, size=3)], -1)
+    
+    cv2.rectangle(icon, (0, 0), (size - 1, size - 1), (220, 220, 220), 1)
+    return icon
+
+
+def make_buff_bar(scene: BuffBarScene, icons: List[np.ndarray],
+                  seed: int = 0) -> Tuple[np.ndarray, Optional[Tuple[int, int, int, int]]]:
+    """
+    버프창처럼 아이콘이 한 줄로 늘어선 가짜 화면(BGRA) 만들기
+    
+    Args:
+        scene: 장면 설정
+        icons: load_icons() 결과
+        seed: 난수 시드
+    
+    Returns:
+        (BGRA 프레임, 일격필살 아이콘 위치 (x, y, w, h) 또는 None)
+    """
+    rng = np.random.default_rng(seed)
+    frame = np.full((scene.height, scene.width, 3), 24, dtype=np.uint8)
+    
+    # 아이콘이 들어갈 칸 (일격필살 + 방해 아이콘)
+    slots = scene.distractors + (1 if scene.has_icon else 0)
+    size = scene.icon_size
+    gap = 4
+    max_slots = max(1, (scene.width - gap) // (size + gap))
+    order = rng.permutation(max_slots)[:slots]
+    y = max(0, (scene.height - size) // 2)
+    
+    box = None
+    for i, slot in enumerate(order):
+        x = gap + int(slot) * (size + gap)
+        if x + size > scene.width or y + size > scene.height:
+            continue
+        if scene.has_icon and i == 0:
+            icon = cv2.resize(icons[scene.icon_index], (size, size), interpolation=cv2.INTER_AREA)
+            box = (x, y, size, size)
+        else:
+            icon = make_distractor(size, rng)
+        frame[y:y + size, x:x + size] = icon
+    
+    # 밝기 / 노이즈
+    out = frame.astype(np.float32) * scene.brightness
+    if scene.noise > 0:
+        out += rng.normal(0.0, scene.noise, size=out.shape)
+    frame = np.clip(out, 0, 255).astype(np.uint8)
+    
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA), box
+
+
+def make_synthetic_frame(template: np.ndarray, width: int, height: int,
+                         scale: float = 1.0, seed: int = 0) -> np.ndarray:
+    """
+    노이즈 배경 위에 아이콘을 붙인 가짜 버프창 프레임 생성
+    
+    Args:
+        template: 그레이스케일 아이콘
+        width, height: 프레임 크기
+        scale: 아이콘 크기 비율
+        seed: 난수 시드
+    
+    Returns:
+        그레이스케일 프레임
+    """
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=(height, width), dtype=np.uint8)
+    
+    icon = cv2.resize(template, None, fx=scale, fy=scale)
+    y = (height - icon.shape[0]) // 2
+    x = (width - icon.shape[1]) // 2
+    frame[y:y + icon.shape[0], x:x + icon.shape[1]] = icon
+    return frame
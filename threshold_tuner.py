@@ -0,0 +1,202 @@
+from dataclasses import dataclass  # 빈 구간 정의용
+from typing import List, Optional  # 타입 힌트용
+
+# 매칭 값(0~1)을 나누는 구간 수 (0.01 간격)
+SCORE_BINS = 100
+
+# 두 분포를 합쳐 이만큼 쌓이면 모든 구간을 절반으로 (오래된 값일수록 덜 반영)
+DEFAULT_MAX_SAMPLES = 20000
+
+# 기준값 제안을 다시 계산하는 간격 (틱)
+DEFAULT_UPDATE_EVERY = 50
+
+
+class ScoreHistogram:
+    """
+    매칭 값을 고정 구간으로 세는 히스토그램 (메모리 고정)
+    
+    값 하나 추가는 구간 하나를 세는 것뿐이고, 분위수는 구간을 한 번 훑어서 구한다.
+    """
+    
+    def __init__(self, bins: int = SCORE_BINS):
+        """
+        히스토그램 초기화
+        
+        Args:
+            bins: 0~1을 나눌 구간 수
+        """
+        self.bins = bins
+        self.counts: List[int] = [0] * bins
+        self.total = 0
+    
+    def add(self, value: float):
+        """매칭 값 하나 추가 (범위 밖의 값은 양 끝 구간으로)"""
+        index = min(self.bins - 1, max(0, int(value * self.bins)))
+        self.counts[index] += 1
+        self.total += 1
+    
+    def halve(self):
+        """모든 구간을 절반으로 (최근 값의 비중을 높임)"""
+        self.counts = [count >> 1 for count in self.counts]
+        self.total = sum(self.counts)
+    
+    def mass(self, start: int, stop: int) -> int:
+        """[start, stop) 구간에 든 값 개수"""
+        return sum(self.counts[start:stop])
+    
+    def quantile(self, q: float) -> float:
+        """q 분위수 (0~1, 해당 구간의 가운데 값, 비어 있으면 0)"""
+        target = q * self.total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                return (index + 0.5) / self.bins
+        return 0.0
+
+
+@dataclass
+class ScoreGap:
+    """아이콘 점수와 배경 점수 사이의 빈 구간"""
+    low: float          # 빈 구간 아래 끝 (배경 점수 위쪽 끝)
+    high: float         # 빈 구간 위 끝 (아이콘 점수 아래쪽 끝)
+    background: int     # 빈 구간 아래의 값 개수
+    hits: int           # 빈 구간 위의 값 개수
+    
+    @property
+    def middle(self) -> float:
+        """빈 구간 가운데 (제안 기준값)"""
+        return round((self.low + self.high) / 2, 2)
+
+
+def find_score_gap(histogram: ScoreHistogram, min_hits: int, min_background: int,
+                   min_width: float = 0.1, min_hit_score: float = 0.5,
+                   sparse_ratio: float = 0.0002) -> Optional[ScoreGap]:
+    """
+    매칭 값 분포에서 배경과 아이콘을 가르는 가장 넓은 빈 구간 찾기
+    
+    지금 쓰는 기준값과 상관없이 분포 모양만 본다. 값이 거의 없는 구간
+    (전체의 sparse_ratio 이하, 아이콘이 서서히 나타나는 몇 프레임 정도는 무시)이
+    이어진 곳 중 아래에 배경이 min_background개, 위에 아이콘이 min_hits개 이상인
+    가장 넓은 곳을 고른다.
+    
+    Args:
+        histogram: 매칭 값 분포 (아이콘 / 배경 구분 없이)
+        min_hits: 빈 구간 위에 있어야 할 값 개수
+        min_background: 빈 구간 아래에 있어야 할 값 개수
+        min_width: 이보다 좁으면 두 분포가 겹친 것으로 봄
+        min_hit_score: 빈 구간 위 끝이 이보다 낮으면 아이콘이 아닌 배경끼리 갈린 것으로 봄
+        sparse_ratio: 이 비율 이하로 든 칸은 비어 있는 것으로 봄
+    
+    Returns:
+        가장 넓은 빈 구간 (없으면 None)
+    """
+    bins = histogram.bins
+    counts = histogram.counts
+    sparse = histogram.total * sparse_ratio
+    
+    best: Optional[ScoreGap] = None
+    below = 0  # 지금 보는 칸보다 아래에 든 값 개수
+    start = None
+    for index in range(bins + 1):
+        if index < bins and counts[index] <= sparse:
+            if start is None:
+                start = index
+            continue
+        if start is not None:
+            gap = ScoreGap(start / bins, index / bins, below, histogram.total - below - histogram.mass(start, index))
+            if (gap.background >= min_background and gap.hits >= min_hits
+                    and gap.high - gap.low >= min_width and gap.high >= min_hit_score
+                    and (best is None or gap.high - gap.low > best.high - best.low)):
+                best = gap
+            below += histogram.mass(start, index)
+            start = None
+        if index < bins:
+            below += counts[index]
+    return best
+
+
+class ThresholdTuner:
+    """
+    감지 중에 모은 매칭 값 분포로 기준값 제안
+    
+    모든 틱의 매칭 값을 히스토그램 하나에 모으고, 배경 점수와 아이콘 점수 사이의
+    가장 넓은 빈 구간(find_score_gap)의 가운데를 제안한다. 아이콘 / 배경은
+    지금 기준값이 아니라 분포 모양으로 가르므로, 기준값이 너무 높아서 아이콘이
+    기준에 못 미치더라도 제안값은 아래로 내려올 수 있다. 두 분포가 겹치면 제안하지 않는다.
+    
+    틱마다 하는 일은 구간 하나를 세는 것뿐이고, 제안은 update_every틱마다 구간을 훑어
+    다시 계산하므로 틱당 비용은 상수다.
+    """
+    
+    def __init__(self, min_hits: int = 20, min_background: int = 200,
+                 update_every: int = DEFAULT_UPDATE_EVERY, max_samples: int = DEFAULT_MAX_SAMPLES):
+        """
+        Args:
+            min_hits: 제안하기 전에 빈 구간 위(아이콘)에 필요한 틱 수
+            min_background: 제안하기 전에 빈 구간 아래(배경)에 필요한 틱 수
+            update_every: 제안을 다시 계산하는 간격 (틱)
+            max_samples: 이만큼 쌓이면 모든 구간을 절반으로 줄임
+        """
+        self.min_hits = min_hits
+        self.min_background = min_background
+        self.update_every = update_every
+        self.max_samples = max_samples
+        self.min_gap = 0.1  # 배경과 아이콘 사이가 이보다 좁으면 겹친 것으로 봄
+        
+        # 자동 조정할 때의 범위와 한 번에 움직이는 최대 폭
+        self.floor = 0.5
+        self.ceiling = 0.95
+        self.max_step = 0.02
+        
+        self.reset()
+    
+    def reset(self):
+        """모은 분포와 제안 지우기"""
+        self.scores = ScoreHistogram()
+        self.gap: Optional[ScoreGap] = None
+        self.suggestion: Optional[float] = None
+        self._since_update = 0
+    
+    def record(self, value: float) -> bool:
+        """
+        한 틱의 매칭 값 추가
+        
+        Args:
+            value: 매칭 값
+        
+        Returns:
+            이번에 제안을 다시 계산했는지
+        """
+        self.scores.add(value)
+        if self.scores.total > self.max_samples:
+            self.scores.halve()
+        
+        self._since_update += 1
+        if self._since_update < self.update_every:
+            return False
+        self._since_update = 0
+        self.gap = find_score_gap(self.scores, self.min_hits, self.min_background,
+                                  self.min_gap, self.floor)
+        self.suggestion = self.gap.middle if self.gap else None
+        return True
+    
+    def adjust(self, current: float) -> float:
+        """현재 기준값을 제안값 쪽으로 최대 max_step만큼 옮긴 값 (floor~ceiling 안에서)"""
+        if self.suggestion is None:
+            return current
+        target = min(self.ceiling, max(self.floor, self.suggestion))
+        step = max(-self.max_step, min(self.max_step, target - current))
+        return round(current + step, 4)
+    
+    def get_stats(self) -> dict:
+        """모은 틱 수, 아이콘 / 배경 틱 수와 그 사이 빈 구간, 제안값"""
+        gap = self.gap
+        return {
+            "samples": self.scores.total,
+            "hits": gap.hits if gap else 0,
+            "background": gap.background if gap else 0,
+            "hit_low": gap.high if gap else None,
+            "background_high": gap.low if gap else None,
+            "suggestion": self.suggestion,
+        }
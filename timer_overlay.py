@@ -1,11 +1,33 @@
 import tkinter as tk  # Python 기본 GUI 라이브러리
-from typing import Callable, Optional  # 타입 힌트용
+from typing import Callable, Dict, List, Optional, Tuple  # 타입 힌트용
+
+from scheduler import capture_clock  # 타이머 시작 시각과 같은 시계
+
+# 카운트다운 캔버스 크기 / 줄 높이 (첫 번째 스킬은 크게)
+CANVAS_WIDTH = 200
+MAIN_ROW_HEIGHT = 48
+SKILL_ROW_HEIGHT = 24
+BAR_HEIGHT = 4
+
+# 카운트다운 색
+COLOR_READY = "#00ff88"    # 준비 / 대기
+COLOR_RUNNING = "#ffd93d"  # 쿨타임 중
+COLOR_SOON = "#ff6b6b"     # 5초 이하
+COLOR_TRACK = "#2e2e4a"    # 진행 막대 바탕
 
 class TimerOverlay:
     """화면에 표시되는 타이머 오버레이 창"""
     
-    def __init__(self):
-        """타이머 오버레이 초기화"""
+    def __init__(self, animation_interval_ms: int = 16, clock: Callable[[], float] = capture_clock):
+        """
+        타이머 오버레이 초기화
+        
+        Args:
+            animation_interval_ms: 카운트다운 애니메이션 주기 (감지 / 화면 갱신 주기와 별개)
+            clock: 카운트다운 기준 시계 (엔진의 타이머 시작 시각과 같은 시계)
+        """
+        self.animation_interval_ms = animation_interval_ms
+        self.clock = clock
         
         # ========== 메인 윈도우 설정 ==========
         self.root = tk.Tk()
@@ -25,16 +47,15 @@ class TimerOverlay:
         )
         self.frame.pack()
         
-        # ========== 타이머 숫자 라벨 ==========
-        self.timer_label = tk.Label(
+        # ========== 카운트다운 캔버스 (스킬마다 글자 + 진행 막대) ==========
+        self.canvas = tk.Canvas(
             self.frame,
-            text="대기중",
-            font=("맑은 고딕", 24, "bold"),
-            fg="#00ff88",
+            width=CANVAS_WIDTH,
+            height=MAIN_ROW_HEIGHT,
             bg="#1a1a2e",
-            width=8
+            highlightthickness=0
         )
-        self.timer_label.pack()
+        self.canvas.pack()
         
         # ========== 상태 텍스트 라벨 ==========
         self.status_label = tk.Label(
@@ -100,8 +121,8 @@ class TimerOverlay:
         
         self.frame.bind("<Button-1>", self._on_drag_start)
         self.frame.bind("<B1-Motion>", self._on_drag_motion)
-        self.timer_label.bind("<Button-1>", self._on_drag_start)
-        self.timer_label.bind("<B1-Motion>", self._on_drag_motion)
+        self.canvas.bind("<Button-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag_motion)
         
         # ========== 콜백 함수 저장용 ==========
         self.on_start: Optional[Callable] = None
@@ -110,8 +131,31 @@ class TimerOverlay:
         self.on_quit: Optional[Callable] = None
         
         # ========== 타이머 상태 ==========
-        self.remaining_time = 0.0
         self.is_running = False
+        
+        # ========== 스킬별 카운트다운 ==========
+        self.skill_names: List[str] = []
+        # 스킬 이름 -> (글자, 막대) 캔버스 항목 / 진행 막대 왼쪽 x, 전체 폭, 위 y
+        self._countdown_items: Dict[str, Tuple[int, int]] = {}
+        self._bar_geometry: Dict[str, Tuple[int, int, int]] = {}
+        self._bar_rendered: Dict[str, Tuple[int, str]] = {}  # 화면에 보이는 (막대 폭, 색)
+        # 스킬 이름 -> (시작 시각, 쿨타임), 애니메이션 중인 것만
+        self._countdowns: Dict[str, Tuple[float, float]] = {}
+        self._animation_handle: Optional[str] = None
+        
+        # ========== 상태줄 ==========
+        self.status_text = ""
+        self.latency_text = ""  # 지연 시간 표시 (p50/p99)
+        
+        # ========== 화면 갱신 묶음 ==========
+        # 라벨 / 캔버스 글자 -> 지금 화면에 보이는 (글자, 색) / 이번 프레임에 바꿀 (글자, 색)
+        self._rendered: Dict[object, Tuple[str, Optional[str]]] = {}
+        self._pending: Dict[object, Tuple[str, Optional[str]]] = {}
+        self._flush_handle: Optional[str] = None
+        self.render_requests = 0  # 라벨 변경 요청 수
+        self.render_applied = 0   # 실제로 화면을 바꾼 수 (Label.config / 캔버스 항목 변경)
+        
+        self.set_skills(["대기"])
     
     # ========== 드래그 관련 함수 ==========
     
@@ -170,22 +214,202 @@ class TimerOverlay:
             self.stop_btn.config(state=tk.DISABLED, bg="#8B0000")  # 어두운 빨강
             self.region_btn.config(state=tk.NORMAL, bg="#2196F3")
     
+    def hide_region_button(self):
+        """영역 버튼 숨기기 (여러 영역 모드는 config.json의 regions로 영역을 정함)"""
+        self.region_btn.pack_forget()
+    
     # ========== 외부에서 호출하는 함수들 ==========
     
-    def update_timer(self, seconds: float):
-        """타이머 표시 업데이트"""
-        self.remaining_time = seconds
+    def set_skills(self, names: List[str]):
+        """
+        추적할 스킬 목록 설정 - 스킬마다 카운트다운 하나씩
+        
+        첫 번째 스킬은 큰 글자를 쓰고, 나머지는 그 아래 작은 줄로 표시한다.
+        캔버스 항목(글자, 진행 막대)은 여기서 한 번만 만들고 이후에는 내용만 바꾼다.
+        
+        Args:
+            names: 스킬 이름 목록
+        """
+        # 기존 항목 제거
+        for text_item, _ in self._countdown_items.values():
+            self._rendered.pop(text_item, None)
+            self._pending.pop(text_item, None)
+        self.canvas.delete("all")
+        self._countdown_items = {}
+        self._bar_geometry = {}
+        self._bar_rendered = {}
+        self._countdowns = {}
+        self.skill_names = list(names)
+        
+        self.canvas.config(height=MAIN_ROW_HEIGHT + SKILL_ROW_HEIGHT * max(0, len(names) - 1))
+        
+        top = 0
+        for index, name in enumerate(self.skill_names):
+            main = index == 0
+            row_height = MAIN_ROW_HEIGHT if main else SKILL_ROW_HEIGHT
+            text = "대기중" if main else f"{name}: 대기중"
+            text_item = self.canvas.create_text(
+                CANVAS_WIDTH // 2,
+                top + (row_height - BAR_HEIGHT) // 2,
+                text=text,
+                font=("맑은 고딕", 24 if main else 12, "bold"),
+                fill=COLOR_READY
+            )
+            self._rendered[text_item] = (text, COLOR_READY)
+            left = 10 if main else 30
+            width = CANVAS_WIDTH - 2 * left
+            bar_top = top + row_height - BAR_HEIGHT - 2
+            self.canvas.create_rectangle(left, bar_top, left + width, bar_top + BAR_HEIGHT,
+                                         fill=COLOR_TRACK, width=0)
+            bar_item = self.canvas.create_rectangle(left, bar_top, left, bar_top + BAR_HEIGHT,
+                                                    fill=COLOR_READY, width=0)
+            self._countdown_items[name] = (text_item, bar_item)
+            self._bar_geometry[name] = (left, width, bar_top)
+            self._bar_rendered[name] = (0, COLOR_READY)
+            top += row_height
+    
+    def update_timer(self, seconds: float, name: Optional[str] = None):
+        """
+        타이머 표시 업데이트 (해당 스킬 애니메이션은 멈춤)
+        
+        Args:
+            seconds: 남은 시간 (초)
+            name: 스킬 이름 (None이면 첫 번째 스킬)
+        """
+        name = self._skill_name(name)
+        self._countdowns.pop(name, None)
+        self._draw_countdown(name, seconds, None)
+    
+    def start_countdown(self, name: Optional[str], started_at: float, cooldown: float):
+        """
+        카운트다운 애니메이션 시작
+        
+        감지나 화면 갱신 주기와 상관없이 animation_interval_ms마다
+        시작 시각과 쿨타임으로 남은 시간을 계산해서 그린다.
+        
+        Args:
+            name: 스킬 이름 (None이면 첫 번째 스킬)
+            started_at: 쿨타임 시작 시각 (clock 기준)
+            cooldown: 쿨타임 (초)
+        """
+        name = self._skill_name(name)
+        self._countdowns[name] = (started_at, cooldown)
+        self._draw_countdown(name, cooldown - (self.clock() - started_at), cooldown)
+        if self._animation_handle is None:
+            self._animation_handle = self.root.after(self.animation_interval_ms, self._animate)
+    
+    def _animate(self):
+        """애니메이션 한 프레임 (도는 카운트다운이 없으면 멈춤)"""
+        self._animation_handle = None
+        now = self.clock()
+        for name, (started_at, cooldown) in list(self._countdowns.items()):
+            remaining = cooldown - (now - started_at)
+            if remaining <= 0:
+                del self._countdowns[name]
+            self._draw_countdown(name, remaining, cooldown)
+        self.flush()
+        if self._countdowns:
+            self._animation_handle = self.root.after(self.animation_interval_ms, self._animate)
+    
+    def _skill_name(self, name: Optional[str]) -> str:
+        """표시할 스킬 이름 (모르는 이름이면 첫 번째 스킬)"""
+        if name in self._countdown_items:
+            return name
+        return self.skill_names[0]
+    
+    def _draw_countdown(self, name: str, seconds: float, cooldown: Optional[float]):
+        """스킬 하나의 글자 + 진행 막대 갱신 (바뀐 것만)"""
+        text_item, bar_item = self._countdown_items[name]
+        prefix = "" if name == self.skill_names[0] else f"{name}: "
         
         if seconds <= 0:
-            self.timer_label.config(text="준비!", fg="#00ff88")
-        elif seconds <= 5:
-            self.timer_label.config(text=f"{seconds:.1f}초", fg="#ff6b6b")
+            text, color = f"{prefix}준비!", COLOR_READY
         else:
-            self.timer_label.config(text=f"{seconds:.1f}초", fg="#ffd93d")
+            color = COLOR_SOON if seconds <= 5 else COLOR_RUNNING
+            text = f"{prefix}{seconds:.1f}초"
+        self._set_label(text_item, text, color)
+        
+        # 진행 막대는 픽셀 폭이 바뀔 때만
+        left, width, top = self._bar_geometry[name]
+        ratio = min(1.0, max(0.0, seconds / cooldown)) if cooldown else 0.0
+        bar = (int(width * ratio), color)
+        self.render_requests += 1
+        if self._bar_rendered.get(name) == bar:
+            return
+        if self._bar_rendered[name][1] != color:
+            self.canvas.itemconfigure(bar_item, fill=color)
+        self.canvas.coords(bar_item, left, top, left + bar[0], top + BAR_HEIGHT)
+        self._bar_rendered[name] = bar
+        self.render_applied += 1
     
     def set_status(self, text: str):
         """상태 텍스트 업데이트"""
-        self.status_label.config(text=text)
+        self.status_text = text
+        if self.latency_text:
+            text = f"{text}  [{self.latency_text}]"
+        self._set_label(self.status_label, text)
+    
+    def set_latency(self, p50_ms: Optional[float], p99_ms: Optional[float] = None):
+        """
+        상태줄 끝에 붙는 지연 시간 표시 (p50/p99)
+        
+        Args:
+            p50_ms: 중앙값 (ms, None이면 표시 끔)
+            p99_ms: 99분위 (ms)
+        """
+        if p50_ms is None:
+            self.latency_text = ""
+        else:
+            self.latency_text = f"{p50_ms:.0f}/{p99_ms:.0f}ms"
+        self.set_status(self.status_text)
+    
+    # ========== 화면 갱신 묶음 ==========
+    
+    def _set_label(self, label, text: str, fg: Optional[str] = None):
+        """
+        라벨 / 캔버스 글자 항목 변경 예약 (같은 프레임 안에서는 마지막 값만 남음)
+        
+        바로 config하지 않고 모아 두었다가 flush()에서 한 번에 적용한다.
+        flush()를 따로 부르지 않아도 지금 처리 중인 Tk 이벤트가 끝나면 적용된다.
+        """
+        self.render_requests += 1
+        self._pending[label] = (text, fg)
+        if self._flush_handle is None:
+            self._flush_handle = self.root.after_idle(self.flush)
+    
+    def flush(self):
+        """예약된 라벨 변경 적용 (화면에 이미 보이는 것과 같으면 건너뜀)"""
+        if self._flush_handle is not None:
+            try:
+                self.root.after_cancel(self._flush_handle)
+            except tk.TclError:
+                pass
+            self._flush_handle = None
+        
+        pending, self._pending = self._pending, {}
+        for label, rendered in pending.items():
+            if self._rendered.get(label) == rendered:
+                continue
+            text, fg = rendered
+            if isinstance(label, int):
+                # 캔버스 글자 항목은 지우고 다시 만들지 않고 내용만 바꿈
+                self.canvas.itemconfigure(label, text=text, fill=fg)
+            elif fg is None:
+                label.config(text=text)
+            else:
+                label.config(text=text, fg=fg)
+            self._rendered[label] = rendered
+            self.render_applied += 1
+    
+    def get_render_stats(self) -> dict:
+        """라벨 갱신 통계 (요청 / 적용 / 건너뜀 / 건너뛴 비율)"""
+        skipped = self.render_requests - self.render_applied
+        return {
+            "requests": self.render_requests,
+            "applied": self.render_applied,
+            "skipped": skipped,
+            "skip_ratio": skipped / self.render_requests if self.render_requests else 0.0,
+        }
     
     def set_position(self, x: int, y: int):
         """오버레이 창 위치 설정"""
@@ -199,6 +423,13 @@ class TimerOverlay:
         """오버레이 창 실행"""
         self.root.mainloop()
     
-    def schedule(self, ms: int, callback: Callable):
-        """일정 시간 후 함수 실행 예약"""
-        self.root.after(ms, callback)
\ No newline at end of file
+    def schedule(self, ms: int, callback: Callable) -> str:
+        """일정 시간 후 함수 실행 예약 (취소용 ID 반환)"""
+        return self.root.after(ms, callback)
+    
+    def cancel(self, handle: str):
+        """schedule로 예약한 실행 취소"""
+        try:
+            self.root.after_cancel(handle)
+        except tk.TclError:
+            pass
\ No newline at end of file